@@ -0,0 +1,2 @@
+# benchmarks/__init__.py
+# ベンチマークスクリプト用パッケージ（python -m benchmarks.<name> で実行）
@@ -0,0 +1,82 @@
+# benchmarks/bench_docx_pipeline.py
+# DOCXTranslator のシングルパス / 従来（2 回解析）パイプラインの比較
+# 表の多い合成文書（既定: 約 500 ページ相当）を生成し、翻訳は通信なしの恒等バックエンドで行う
+#
+# 実行例:
+#   python -m benchmarks.bench_docx_pipeline --pages 500
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from docx import Document
+
+from core.translate_text_google import Translator
+import modules.docx_translator.docx_translator as docx_translator
+
+# 1 ページあたりの表の行数（5 列・1 行 1 行の文で約 1 ページ）
+ROWS_PER_PAGE = 20
+COLS = 5
+
+
+def build_table_document(path, pages):
+    """1 ページにつき見出し段落 1 つと 20 行 x 5 列の表 1 つを持つ文書を作成する（5 行ごとに横結合あり）"""
+    doc = Document()
+    for page in range(pages):
+        doc.add_paragraph(f"Section {page}: quarterly figures by region")
+        table = doc.add_table(rows=ROWS_PER_PAGE, cols=COLS)
+        for r_idx, row in enumerate(table.rows):
+            # row.cells は遅いので、ここでも tc 要素から直接書き込む
+            for c_idx, tc in enumerate(row._tr.tc_lst):
+                tc.p_lst[0].add_r().text = f"Region {r_idx} item {c_idx} on page {page}"
+            if r_idx % 5 == 0:
+                table.cell(r_idx, 0).merge(table.cell(r_idx, 1))
+        doc.add_page_break()
+    doc.sections[0].header.paragraphs[0].text = "Confidential"
+    doc.sections[0].footer.paragraphs[0].text = "Internal use only"
+    doc.save(path)
+
+
+def run(path, single_pass):
+    docx_translator.DOCX_SINGLE_PASS = single_pass
+    translator = Translator(backend=lambda text, src, dest: text, memory=False)
+    translator.executor.limiter = None  # 通信しないのでレート制限は不要
+    worker = docx_translator.DOCXTranslator(translator)
+    start = time.perf_counter()
+    out_path = worker.process(path, "en->ja")
+    elapsed = time.perf_counter() - start
+    os.remove(out_path)
+    return {
+        "mode": "single_pass" if single_pass else "two_pass",
+        "seconds": round(elapsed, 3),
+        "segments": translator.stats.get("segments", 0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DOCX パイプラインのシングルパス比較")
+    parser.add_argument("--pages", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "tables.docx")
+        start = time.perf_counter()
+        build_table_document(path, args.pages)
+        build_seconds = time.perf_counter() - start
+
+        results = [run(path, single_pass=False), run(path, single_pass=True)]
+
+    print(json.dumps({
+        "benchmark": "docx_pipeline",
+        "pages": args.pages,
+        "tables": args.pages,
+        "cells_per_table": ROWS_PER_PAGE * COLS,
+        "build_seconds": round(build_seconds, 3),
+        "results": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# benchmarks/bench_pptx_images.py
+# read_pptx のメモリ使用量比較: テキストのみ（既定） / 遅延画像ハンドル / 全画像デコード（従来の挙動）
+#
+# 実行例:
+#   python -m benchmarks.bench_pptx_images --slides 40 --images 4 --size 1600
+
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from io import BytesIO
+
+from pptx import Presentation
+from pptx.util import Inches
+from PIL import Image
+
+from modules.pptx_translator.pptx_reader import read_pptx
+
+
+def build_image_deck(path, slides, images_per_slide, size):
+    """画像を多く含む合成デッキを作成する（画像ごとに内容を変えて同一パートにまとめられないようにする）"""
+    prs = Presentation()
+    layout = prs.slide_layouts[5]
+    for s in range(slides):
+        slide = prs.slides.add_slide(layout)
+        slide.shapes.title.text = f"Slide {s}"
+        for i in range(images_per_slide):
+            img = Image.effect_noise((size, size * 3 // 4), 64 + (s * images_per_slide + i) % 64).convert("RGB")
+            bio = BytesIO()
+            img.save(bio, format="PNG")
+            bio.seek(0)
+            slide.shapes.add_picture(bio, Inches(1 + i), Inches(2), width=Inches(2))
+    prs.save(path)
+
+
+def peak_rss_mb():
+    """このプロセスのピーク RSS（MB）。PIL のデコード領域は tracemalloc では見えないため RSS で測る"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux は KB 単位、macOS はバイト単位
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def _run_mode(path, mode, queue):
+    """子プロセスで 1 つのモードを実行し、所要時間とピーク RSS を返す"""
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    if mode == "text_only":
+        result = read_pptx(path)
+    elif mode == "lazy_images":
+        result = read_pptx(path, include_images=True)
+    else:
+        # 従来の挙動: すべての画像をデコードして保持する
+        slides = read_pptx(path, include_images=True)
+        result = [[img.open() for img in s["images"]] for s in slides]
+    elapsed = time.perf_counter() - start
+    queue.put({
+        "mode": mode,
+        "seconds": round(elapsed, 3),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "rss_growth_mb": round(peak_rss_mb() - baseline, 1),
+    })
+    del result
+
+
+def measure(path, mode):
+    """各モードを独立したプロセスで実行して、ピークメモリが互いに影響しないようにする"""
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_run_mode, args=(path, mode, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="read_pptx の画像処理モード別メモリ比較")
+    parser.add_argument("--slides", type=int, default=40)
+    parser.add_argument("--images", type=int, default=4, help="スライドあたりの画像数")
+    parser.add_argument("--size", type=int, default=1600, help="画像の幅（px）")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "images.pptx")
+        # デッキ生成も別プロセスで行う（Linux では exec 後もピーク RSS が引き継がれるため）
+        ctx = multiprocessing.get_context("spawn")
+        builder = ctx.Process(target=build_image_deck, args=(path, args.slides, args.images, args.size))
+        builder.start()
+        builder.join()
+
+        results = [measure(path, mode) for mode in ("text_only", "lazy_images", "decoded_images")]
+
+    print(json.dumps({
+        "benchmark": "pptx_images",
+        "slides": args.slides,
+        "images_per_slide": args.images,
+        "image_width": args.size,
+        "results": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+# benchmarks/bench_suite.py
+# 3 形式（xlsx / pptx / docx）のエンドツーエンドベンチマーク
+# 合成文書を生成し、各翻訳モジュールを遅延を模擬した偽バックエンドで実行して、
+# 所要時間・ピーク RSS・セグメント/秒・ステージ別の所要時間を JSON で出力する。
+# 各ケースは独立したプロセスで実行する（ピーク RSS が互いに影響しないように）。
+# あわせて main（Web アプリ）と CLI の起動時のインポート時間を -X importtime で計測し、
+# --max-import-ms を超えた場合は終了コード 1 で終了する（起動時間の悪化を検出するため）。
+#
+# 実行例:
+#   python -m benchmarks.bench_suite --formats xlsx pptx docx --latency 0.2 --workers 1 4 8
+#   python -m benchmarks.bench_suite --formats pptx --slides 200 --depth 3 --output pptx.json
+#   python -m benchmarks.bench_suite --formats --import-runs 10 --max-import-ms 300
+
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# 形式ごとの比較対象（設定値の組み合わせ）。値は {モジュール: {属性: 値}} で、子プロセス内で上書きする
+VARIANTS = {
+    "xlsx": {
+        "shared_strings": {"modules.excel_translator.excel_translator": {"EXCEL_SHARED_STRINGS_FAST_PATH": True}},
+        "openpyxl": {"modules.excel_translator.excel_translator": {"EXCEL_SHARED_STRINGS_FAST_PATH": False}},
+    },
+    "pptx": {
+        "single_pass_zip": {"modules.pptx_translator.pptx_translator": {"PPTX_SINGLE_PASS": True, "PPTX_WRITER": "zip"}},
+        "single_pass_python_pptx": {
+            "modules.pptx_translator.pptx_translator": {"PPTX_SINGLE_PASS": True, "PPTX_WRITER": "python-pptx"},
+        },
+        "two_pass_zip": {"modules.pptx_translator.pptx_translator": {"PPTX_SINGLE_PASS": False, "PPTX_WRITER": "zip"}},
+    },
+    "docx": {
+        "single_pass": {"modules.docx_translator.docx_translator": {"DOCX_SINGLE_PASS": True}},
+        "two_pass": {"modules.docx_translator.docx_translator": {"DOCX_SINGLE_PASS": False}},
+    },
+}
+
+EXTENSIONS = {"xlsx": ".xlsx", "pptx": ".pptx", "docx": ".docx"}
+
+# 起動時に読み込まれるべきでない（最初の翻訳時に遅延して読み込む）重いライブラリ
+HEAVY_MODULES = ("openpyxl", "pptx", "docx", "PIL", "lxml", "deep_translator", "ctranslate2")
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def peak_rss_mb():
+    """このプロセスのピーク RSS（MB）"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux は KB 単位、macOS はバイト単位
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def _silence_stdout():
+    """翻訳モジュールの print / ログが JSON 出力に混ざらないよう、子プロセスの標準出力を捨てる"""
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    os.close(devnull)
+
+
+def _build(fmt, path, args, queue):
+    """子プロセスで合成文書を作成する（Linux では exec 後もピーク RSS が引き継がれるため親では作らない）"""
+    from benchmarks import generators
+
+    start = time.perf_counter()
+    if fmt == "xlsx":
+        sentences = generators.build_workbook(
+            path, sheets=args.sheets, rows=args.rows, cols=args.cols, unique=args.unique,
+            shared_strings=not args.inline_strings,
+        )
+    elif fmt == "pptx":
+        sentences = generators.build_deck(
+            path, slides=args.slides, shapes=args.shapes, depth=args.depth, unique=args.unique,
+        )
+    else:
+        sentences = generators.build_document(
+            path, paragraphs=args.paragraphs, tables=args.tables, rows=args.table_rows,
+            cols=args.table_cols, unique=args.unique,
+        )
+    queue.put({
+        "sentences": sentences,
+        "bytes": os.path.getsize(path),
+        "build_seconds": round(time.perf_counter() - start, 3),
+    })
+
+
+def _run_case(fmt, variant, path, workers, backend_options, out_dir, queue):
+    """子プロセスで 1 ケースを実行する"""
+    _silence_stdout()
+    import importlib
+
+    import config.settings
+    config.settings.OUTPUT_DIR = out_dir
+
+    from core.translate_text_google import Translator
+    from core import metrics
+    from benchmarks.latency_backend import LatencyBackend
+
+    for module_name, overrides in VARIANTS[fmt][variant].items():
+        module = importlib.import_module(module_name)
+        for attr, value in overrides.items():
+            setattr(module, attr, value)
+    # 出力先は各モジュールにも import 済みなので合わせて差し替える
+    for module_name in ("core.translate_text_google", "modules.excel_translator.excel_translator"):
+        importlib.import_module(module_name).OUTPUT_DIR = out_dir
+
+    translator = Translator(backend=LatencyBackend(**backend_options), memory=False, max_workers=workers)
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    error = None
+    with metrics.job_report() as report:
+        try:
+            out_path = translator.translate_file(path, "en->ja", incremental=False)
+            os.remove(out_path)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+    elapsed = time.perf_counter() - start
+
+    segments = translator.stats.get("segments", 0)
+    summary = report.to_dict()
+    queue.put({
+        "format": fmt,
+        "variant": variant,
+        "workers": workers,
+        "seconds": round(elapsed, 3),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "rss_growth_mb": round(peak_rss_mb() - baseline, 1),
+        "segments": segments,
+        "unique_segments": translator.stats.get("unique", 0),
+        "segments_per_second": round(segments / elapsed, 1) if elapsed else None,
+        "backend_requests": summary["backend"]["requests"],
+        "stages": summary["stages"],
+        "error": error,
+    })
+
+
+def _in_subprocess(target, *args):
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=target, args=args + (queue,))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def _parse_importtime(stderr):
+    """-X importtime の出力を [(深さ, モジュール名, 自身の μs, 累積 μs), ...] にする"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue   # 見出し行
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((depth, name.strip(), int(self_us), int(cumulative_us)))
+    return entries
+
+
+def measure_import(module, runs, cwd):
+    """
+    新しいインタプリタで module をインポートする処理を runs 回繰り返し、所要時間の中央値・最小値と、
+    直接インポートしているモジュールのうち時間のかかる上位 5 件、読み込まれた重いライブラリを返す。
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [_REPO_ROOT, os.environ.get("PYTHONPATH")])))
+    totals = []
+    children = []
+    loaded = set()
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True, text=True, env=env, cwd=cwd,
+        )
+        if proc.returncode != 0:
+            return {"module": module, "error": proc.stderr.strip().splitlines()[-1]}
+        entries = _parse_importtime(proc.stderr)
+        pending = []
+        for depth, name, _, cumulative_us in entries:
+            loaded.add(name.split(".")[0])
+            if depth == 1:
+                pending.append((name, cumulative_us))
+            elif depth == 0:
+                if name == module:
+                    totals.append(cumulative_us)
+                    children = pending
+                pending = []
+
+    top = sorted(children, key=lambda item: item[1], reverse=True)[:5]
+    return {
+        "module": module,
+        "runs": runs,
+        "median_ms": round(statistics.median(totals) / 1000, 1),
+        "min_ms": round(min(totals) / 1000, 1),
+        "top_imports": [{"module": name, "ms": round(us / 1000, 1)} for name, us in top],
+        "heavy_modules_loaded": [name for name in HEAVY_MODULES if name in loaded],
+    }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="xlsx / pptx / docx 翻訳のエンドツーエンドベンチマーク")
+    parser.add_argument("--formats", nargs="*", default=["xlsx", "pptx", "docx"], choices=sorted(VARIANTS),
+                        help="計測する形式（値なしで指定するとインポート時間だけを計測する）")
+    parser.add_argument("--variants", nargs="+", default=None,
+                        help="実行する比較対象（既定: すべて）。例: shared_strings single_pass_zip")
+    parser.add_argument("--workers", nargs="+", type=int, default=[4], help="同時リクエスト数（複数指定で比較）")
+    parser.add_argument("--unique", type=int, default=None, help="異なり文の数（既定: すべて異なる文）")
+
+    group = parser.add_argument_group("backend")
+    group.add_argument("--latency", type=float, default=0.2, help="1 リクエストあたりの遅延（秒）")
+    group.add_argument("--per-char", type=float, default=0.0, help="1 文字あたりの追加遅延（秒）")
+    group.add_argument("--jitter", type=float, default=0.1, help="遅延のばらつき（0.1 で ±10%%）")
+    group.add_argument("--batch-backend", action="store_true",
+                       help="リスト単位のバッチ API を持つバックエンドとして扱う（既定はマーカー連結）")
+
+    group = parser.add_argument_group("xlsx")
+    group.add_argument("--sheets", type=int, default=3)
+    group.add_argument("--rows", type=int, default=2000)
+    group.add_argument("--cols", type=int, default=5)
+    group.add_argument("--inline-strings", action="store_true", help="共有文字列ではなくインライン文字列で保存する")
+
+    group = parser.add_argument_group("pptx")
+    group.add_argument("--slides", type=int, default=100)
+    group.add_argument("--shapes", type=int, default=6, help="スライドあたりのテキストボックス数")
+    group.add_argument("--depth", type=int, default=2, help="グループの入れ子の深さ")
+
+    group = parser.add_argument_group("docx")
+    group.add_argument("--paragraphs", type=int, default=2000)
+    group.add_argument("--tables", type=int, default=50)
+    group.add_argument("--table-rows", type=int, default=10)
+    group.add_argument("--table-cols", type=int, default=4)
+
+    group = parser.add_argument_group("import time")
+    group.add_argument("--import-modules", nargs="*", default=["main", "core.translate"],
+                       help="インポート時間を計測するモジュール（値なしで指定すると計測しない）")
+    group.add_argument("--import-runs", type=int, default=5, help="計測の繰り返し回数（中央値を使う）")
+    group.add_argument("--max-import-ms", type=float, default=None,
+                       help="インポート時間（中央値）の上限。超えた場合は終了コード 1")
+
+    parser.add_argument("--output", default=None, help="結果の JSON を保存するファイル（既定: 標準出力）")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    backend_options = {
+        "latency": args.latency, "per_char": args.per_char, "jitter": args.jitter, "batch": args.batch_backend,
+    }
+
+    documents = {}
+    results = []
+    imports = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for module in args.import_modules:
+            result = measure_import(module, args.import_runs, tmp)
+            imports.append(result)
+            print(f"[bench] import {module}: {result.get('median_ms')}ms "
+                  f"heavy={result.get('heavy_modules_loaded')} {result.get('error', '')}", file=sys.stderr)
+
+        for fmt in args.formats:
+            path = os.path.join(tmp, f"synthetic{EXTENSIONS[fmt]}")
+            documents[fmt] = _in_subprocess(_build, fmt, path, args)
+            print(f"[bench] {fmt}: {documents[fmt]['sentences']} sentences generated", file=sys.stderr)
+
+            for variant in VARIANTS[fmt]:
+                if args.variants and variant not in args.variants:
+                    continue
+                for workers in args.workers:
+                    result = _in_subprocess(_run_case, fmt, variant, path, workers, backend_options, tmp)
+                    results.append(result)
+                    print(f"[bench] {fmt}/{variant} workers={workers}: {result['seconds']}s "
+                          f"{result['segments_per_second']} seg/s", file=sys.stderr)
+
+    report = {
+        "benchmark": "suite",
+        "backend": backend_options,
+        "documents": documents,
+        "results": results,
+        "import_time": imports,
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.max_import_ms is not None:
+        over = [r for r in imports if "error" in r or r["median_ms"] > args.max_import_ms]
+        for r in over:
+            print(f"[bench] import {r['module']} exceeded {args.max_import_ms}ms: "
+                  f"{r.get('median_ms', r.get('error'))}", file=sys.stderr)
+        if over:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
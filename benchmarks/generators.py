@@ -0,0 +1,193 @@
+# benchmarks/generators.py
+# ベンチマーク用の合成文書ジェネレータ（xlsx / pptx / docx）
+# 文は語彙の組み合わせで決定的に作り、unique で異なり文の数を指定する（重複排除の効き具合を調整できる）。
+# 各関数は生成した文の数を返す（PPTX はシェイプ単位、DOCX は段落単位で 1 セグメントになる）。
+
+import zipfile
+from xml.sax.saxutils import escape
+
+from docx import Document
+from pptx import Presentation
+from pptx.util import Inches, Pt
+
+_WORDS = (
+    "quarterly", "revenue", "forecast", "region", "customer", "shipment", "inventory", "margin",
+    "supplier", "contract", "schedule", "review", "approval", "budget", "target", "report",
+)
+
+
+def sentence(i, unique=None):
+    """i 番目の合成文（unique を指定すると unique 種類の文を繰り返す）"""
+    n = i % unique if unique else i
+    words = [_WORDS[(n >> (2 * k)) % len(_WORDS)] for k in range(6)]
+    return f"The {words[0]} {words[1]} for {words[2]} {words[3]} needs {words[4]} {words[5]} ({n})."
+
+
+# ---------------------------------------------
+# Excel
+# ---------------------------------------------
+_SSML_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_XML_DECL = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+
+def _column_letter(index):
+    letters = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def build_workbook(path, sheets=3, rows=1000, cols=5, unique=None, shared_strings=True):
+    """
+    sheets x rows x cols のブックを SpreadsheetML から直接作成する（openpyxl より大幅に速い）。
+    最終列は数値セル（翻訳対象外）。shared_strings=False の場合はセル内のインライン文字列で保存する
+    （openpyxl で保存したブックと同じ形式で、共有文字列の高速経路は使われない）。
+    """
+    strings = {}
+    sheet_xml = []
+    counter = 0
+    for s in range(sheets):
+        out = [_XML_DECL, f'<worksheet xmlns="{_SSML_NS}"><sheetData>']
+        for r in range(1, rows + 1):
+            out.append(f'<row r="{r}">')
+            for c in range(cols):
+                ref = f"{_column_letter(c)}{r}"
+                if c == cols - 1:
+                    out.append(f'<c r="{ref}"><v>{r * 10 + s}</v></c>')
+                    continue
+                text = escape(sentence(counter, unique))
+                counter += 1
+                if shared_strings:
+                    idx = strings.setdefault(text, len(strings))
+                    out.append(f'<c r="{ref}" t="s"><v>{idx}</v></c>')
+                else:
+                    out.append(f'<c r="{ref}" t="inlineStr"><is><t>{text}</t></is></c>')
+            out.append("</row>")
+        out.append("</sheetData></worksheet>")
+        sheet_xml.append("".join(out))
+
+    overrides = "".join(
+        f'<Override PartName="/xl/worksheets/sheet{s + 1}.xml" '
+        f'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        for s in range(sheets)
+    )
+    if shared_strings:
+        overrides += ('<Override PartName="/xl/sharedStrings.xml" '
+                      'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>')
+    content_types = (
+        f'{_XML_DECL}<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        f'{overrides}</Types>'
+    )
+    root_rels = (
+        f'{_XML_DECL}<Relationships xmlns="{_PKG_REL_NS}">'
+        f'<Relationship Id="rId1" Type="{_REL_NS}/officeDocument" Target="xl/workbook.xml"/></Relationships>'
+    )
+    workbook = (
+        f'{_XML_DECL}<workbook xmlns="{_SSML_NS}" xmlns:r="{_REL_NS}"><sheets>'
+        + "".join(f'<sheet name="Sheet {s + 1}" sheetId="{s + 1}" r:id="rId{s + 1}"/>' for s in range(sheets))
+        + "</sheets></workbook>"
+    )
+    wb_rels = [f'<Relationship Id="rId{s + 1}" Type="{_REL_NS}/worksheet" Target="worksheets/sheet{s + 1}.xml"/>'
+               for s in range(sheets)]
+    wb_rels.append(f'<Relationship Id="rId{sheets + 1}" Type="{_REL_NS}/styles" Target="styles.xml"/>')
+    if shared_strings:
+        wb_rels.append(f'<Relationship Id="rId{sheets + 2}" Type="{_REL_NS}/sharedStrings" Target="sharedStrings.xml"/>')
+    styles = (
+        f'{_XML_DECL}<styleSheet xmlns="{_SSML_NS}">'
+        '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="1"><fill><patternFill patternType="none"/></fill></fills>'
+        '<borders count="1"><border/></borders>'
+        '<cellStyleXfs count="1"><xf/></cellStyleXfs><cellXfs count="1"><xf/></cellXfs>'
+        '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+        '</styleSheet>'
+    )
+
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", content_types)
+        zf.writestr("_rels/.rels", root_rels)
+        zf.writestr("xl/workbook.xml", workbook)
+        zf.writestr("xl/_rels/workbook.xml.rels",
+                    f'{_XML_DECL}<Relationships xmlns="{_PKG_REL_NS}">{"".join(wb_rels)}</Relationships>')
+        zf.writestr("xl/styles.xml", styles)
+        for s, xml in enumerate(sheet_xml):
+            zf.writestr(f"xl/worksheets/sheet{s + 1}.xml", xml)
+        if shared_strings:
+            items = "".join(f"<si><t>{text}</t></si>" for text in strings)
+            zf.writestr(
+                "xl/sharedStrings.xml",
+                f'{_XML_DECL}<sst xmlns="{_SSML_NS}" count="{len(strings)}" uniqueCount="{len(strings)}">{items}</sst>',
+            )
+    return counter
+
+
+# ---------------------------------------------
+# PowerPoint
+# ---------------------------------------------
+def build_deck(path, slides=50, shapes=6, depth=2, unique=None):
+    """
+    slides 枚のデッキを作成する。各スライドはタイトル・shapes 個のテキストボックス（2 段落目は太字 run を含む）・
+    depth 段に入れ子になったグループ（各段にテキストボックス 1 つ）を持つ。
+    """
+    prs = Presentation()
+    layout = prs.slide_layouts[5]
+    counter = 0
+    for s in range(slides):
+        slide = prs.slides.add_slide(layout)
+        slide.shapes.title.text = f"Slide {s}: {sentence(counter, unique)}"
+        counter += 1
+        for k in range(shapes):
+            box = slide.shapes.add_textbox(Inches(0.5 + k % 3 * 3), Inches(1.5 + k // 3 * 2), Inches(3), Inches(1))
+            tf = box.text_frame
+            tf.text = sentence(counter, unique)
+            para = tf.add_paragraph()
+            bold = para.add_run()
+            bold.text = "Note: "
+            bold.font.bold = True
+            para.add_run().text = sentence(counter + 1, unique)
+            counter += 2
+
+        container = slide.shapes
+        for level in range(depth):
+            group = container.add_group_shape()
+            box = group.shapes.add_textbox(Inches(1 + level), Inches(5), Inches(2), Inches(0.5))
+            box.text_frame.text = sentence(counter, unique)
+            box.text_frame.paragraphs[0].runs[0].font.size = Pt(12)
+            counter += 1
+            container = group.shapes
+    prs.save(path)
+    return counter
+
+
+# ---------------------------------------------
+# Word
+# ---------------------------------------------
+def build_document(path, paragraphs=500, tables=20, rows=10, cols=4, unique=None):
+    """paragraphs 個の本文段落（太字 run を含む）と tables 個の rows x cols の表を交互に配置した文書を作成する"""
+    doc = Document()
+    counter = 0
+    per_table = max(1, paragraphs // max(1, tables))
+    for i in range(paragraphs):
+        para = doc.add_paragraph(sentence(counter, unique) + " ")
+        para.add_run("Important.").bold = True
+        counter += 1
+        if tables and i % per_table == per_table - 1 and i // per_table < tables:
+            table = doc.add_table(rows=rows, cols=cols)
+            for row in table.rows:
+                # row.cells は遅いので tc 要素から直接書き込む
+                for tc in row._tr.tc_lst:
+                    tc.p_lst[0].add_r().text = sentence(counter, unique)
+                    counter += 1
+    doc.sections[0].header.paragraphs[0].text = "Confidential"
+    doc.sections[0].footer.paragraphs[0].text = "Internal use only"
+    doc.save(path)
+    return counter + 2
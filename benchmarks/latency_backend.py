@@ -0,0 +1,41 @@
+# benchmarks/latency_backend.py
+# 応答遅延を模擬する偽バックエンド（通信なし）
+# 1 回の呼び出しごとに「固定遅延 + 文字数に比例する遅延 (+ ジッター)」だけ待ってから StubBackend と同じ結果を返す。
+
+import random
+import time
+
+from core.backends import StubBackend
+
+
+class LatencyBackend(StubBackend):
+    """
+    latency: 1 回の呼び出しあたりの固定遅延（秒）。リモート API の往復時間に相当する。
+    per_char: 1 文字あたりの追加遅延（秒）
+    jitter: 遅延に掛ける乱数の幅（0.2 なら ±20%）。seed を固定しているので実行ごとの差は小さい。
+    batch: False の場合はマーカー行で連結した 1 文字列として受け取る（Google 翻訳と同じ経路を通す）
+    """
+
+    name = "latency"
+
+    def __init__(self, latency=0.2, per_char=0.0, jitter=0.0, batch=False, seed=0):
+        super().__init__()
+        self.latency = latency
+        self.per_char = per_char
+        self.jitter = jitter
+        self.supports_batch = batch
+        self._random = random.Random(seed)
+
+    def _sleep(self, chars):
+        delay = self.latency + self.per_char * chars
+        if self.jitter:
+            delay *= 1 + self._random.uniform(-self.jitter, self.jitter)
+        time.sleep(max(0.0, delay))
+
+    def translate(self, text, src, dest):
+        self._sleep(len(text))
+        return StubBackend.translate_batch(self, [text], src, dest)[0]
+
+    def translate_batch(self, texts, src, dest):
+        self._sleep(sum(len(text) for text in texts))
+        return super().translate_batch(texts, src, dest)
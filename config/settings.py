@@ -18,8 +18,8 @@ SUPPORTED_TYPES = {
 # ---------------------------------------------
 # 出力ディレクトリ
 # ---------------------------------------------
+# フォルダはインポート時ではなく、使用時（Translator の作成時・アプリケーションの起動時）に作成する
 OUTPUT_DIR = os.path.join(os.getcwd(), 'data', 'output')
-os.makedirs(OUTPUT_DIR, exist_ok=True)
 
 # ---------------------------------------------
 # Tesseract OCR の設定は不要のため削除
@@ -36,3 +36,134 @@ GOOGLETRANS_SERVICE_URL = ['translate.googleapis.com']
 # OCR 言語設定は不要のため削除
 # ---------------------------------------------
 # OCR_LANG = 'eng+jpn' は削除しました。
+
+# ---------------------------------------------
+# 翻訳バックエンド設定
+# ---------------------------------------------
+# "google": Google 翻訳（オンライン） / "local": ローカルモデル（オフライン） / "stub": テスト用
+TRANSLATION_BACKEND = "google"
+
+# ローカルモデル（CTranslate2）の設定。ctranslate2 と sentencepiece のインストールが必要
+# LOCAL_MODEL_DIR の下に "en-ja" のような言語ペアごとのディレクトリを置く
+LOCAL_MODEL_DIR = os.path.join(os.getcwd(), 'data', 'models')
+LOCAL_BATCH_SIZE = 32     # 1 回の推論で処理する文の最大数
+LOCAL_BEAM_SIZE = 2       # ビームサーチの幅（1 で greedy）
+LOCAL_THREADS = 0         # 推論に使う CPU スレッド数（0 で自動）
+# 1 文として推論する最大文字数。MarianMT の入力は約 512 トークンで切り捨てられるため、
+# これを超える行は文の境界で分割してから推論する
+LOCAL_MAX_SENTENCE_CHARS = 400
+
+# ---------------------------------------------
+# バッチ翻訳設定
+# ---------------------------------------------
+# 複数セグメントを 1 リクエストにまとめる際の上限
+# Google のエンドポイントは約 5,000 文字を超えると拒否されるため余裕を持たせる
+BATCH_MAX_CHARS = 4500
+BATCH_MAX_SEGMENTS = 50
+
+# True: 書式の異なる run をインラインタグ（<g1>…</g1>）で囲んで 1 セグメントとして翻訳し、
+# 翻訳後に各 run の書式（太字・斜体・リンクなど）を復元する（PPTX / DOCX のシングルパス処理）
+RUN_AWARE_SEGMENTATION = True
+
+# ---------------------------------------------
+# 事前フィルタ設定
+# ---------------------------------------------
+# True: コード・ID・URL・メールアドレス・数値・日付・数式などの翻訳不要なセグメントと、
+# すでに翻訳先の言語で書かれたセグメント（文字種で判定）はバックエンドに送らずそのまま出力する
+PREFILTER_ENABLED = True
+PREFILTER_TARGET_SCRIPT_RATIO = 0.9   # 文字のうち翻訳先の文字種がこの割合以上なら翻訳済みとみなす
+
+# ---------------------------------------------
+# 翻訳メモリ（キャッシュ）設定
+# ---------------------------------------------
+# (text, src, dest) をキーに翻訳結果を SQLite に保存し、次回以降はネットワークを使わずに再利用する
+TRANSLATION_MEMORY_ENABLED = True
+TRANSLATION_MEMORY_PATH = os.path.join(os.getcwd(), 'data', 'translation_memory.sqlite3')
+TRANSLATION_MEMORY_MAX_ENTRIES = 500000   # 件数上限（超えた分は最終利用が古い順に削除）
+TRANSLATION_MEMORY_MAX_AGE_DAYS = 180     # 最終利用からこの日数を過ぎたエントリは削除
+TRANSLATION_MEMORY_LRU_SIZE = 10000       # プロセス内 LRU の件数
+
+# ---------------------------------------------
+# 差分翻訳設定
+# ---------------------------------------------
+# True: ファイルごとに位置別の原文ハッシュと翻訳結果をマニフェストに保存し、
+# 次回は新規・変更されたセグメントだけを翻訳する（同じファイル名の改訂版を繰り返し翻訳する場合に有効）
+INCREMENTAL_TRANSLATION = False
+MANIFEST_DIR = os.path.join(os.getcwd(), 'data', 'manifests')
+
+# ---------------------------------------------
+# 並列実行・レート制限・再試行設定
+# ---------------------------------------------
+TRANSLATION_MAX_WORKERS = 4          # 同時に送信する翻訳リクエスト数
+TRANSLATION_RATE_LIMIT = 5.0         # バックエンドごとの平均リクエスト数/秒（0 で無制限）
+TRANSLATION_RATE_BURST = 5           # 瞬間的に連続送信できるリクエスト数
+TRANSLATION_RETRIES = 3              # 一時的なエラー（429 / 5xx / 接続エラー）の最大再試行回数
+TRANSLATION_RETRY_BASE_DELAY = 0.5   # 指数バックオフの初期待機秒数
+TRANSLATION_RETRY_MAX_DELAY = 8.0    # 指数バックオフの待機秒数の上限
+TRANSLATION_STRICT = False           # True: 翻訳に失敗したセグメントがあればエラーにする
+
+# ---------------------------------------------
+# バックグラウンドジョブ設定
+# ---------------------------------------------
+JOB_MAX_WORKERS = 2              # 同時に処理する翻訳ジョブ数
+JOB_RETENTION_SECONDS = 3600     # 完了したジョブの状態を保持する秒数
+# ジョブごとの計測レポート（ステージ別の所要時間など）を JSON で保存するディレクトリ（None で保存しない）
+# 保存しない場合も /jobs/<job_id>/report で取得できる
+JOB_REPORT_DIR = None
+
+# ---------------------------------------------
+# アップロード・ダウンロード・一時ファイル設定
+# ---------------------------------------------
+# アップロードはジョブごとの一意なフォルダに保存し、出力は OUTPUT_DIR/<ジョブ ID>/ に作成する
+UPLOAD_DIR = os.path.join(os.getcwd(), 'uploads')
+MAX_UPLOAD_BYTES = 100 * 1024 * 1024    # アップロードできるファイルサイズの上限
+UPLOAD_CHUNK_SIZE = 1024 * 1024         # アップロードを保存する際のチャンクサイズ
+OUTPUT_TTL_SECONDS = 24 * 3600          # 出力ファイルを保持する秒数（None で無期限）
+OUTPUT_QUOTA_BYTES = 5 * 1024 ** 3      # OUTPUT_DIR の合計サイズの上限（超えた分は古い順に削除。None で無制限）
+UPLOAD_TTL_SECONDS = 6 * 3600           # 処理されずに残ったアップロードを削除するまでの秒数
+SWEEP_INTERVAL_SECONDS = 300            # 古いファイルを掃除する間隔
+
+# ---------------------------------------------
+# TXT / CSV ストリーミング翻訳設定
+# ---------------------------------------------
+# ファイル全体を読み込まず、行単位のチャンクに分けて並行して翻訳し、順序どおりに書き出す
+TEXT_STREAM_CHUNK_LINES = 500      # 1 チャンクの最大行数（CSV は行数）
+TEXT_STREAM_CHUNK_CHARS = 20000    # 1 チャンクの最大文字数
+TEXT_STREAM_MAX_INFLIGHT = 4       # 同時に翻訳するチャンク数（先読みの上限）
+
+# ---------------------------------------------
+# パイプライン実行設定（Excel / PowerPoint / Word）
+# ---------------------------------------------
+# True: 文書の解析・翻訳・書き戻しを重ねて実行する（見つけたセグメントからチャンク単位で翻訳に送る）
+# False: すべて読み取ってから 1 回の translate_batch でまとめて翻訳する（チャンクをまたいだ重複排除が効く）
+PIPELINE_ENABLED = True
+PIPELINE_CHUNK_SEGMENTS = 2000     # 1 チャンクの最大セグメント数
+PIPELINE_CHUNK_CHARS = 100000      # 1 チャンクの最大文字数
+PIPELINE_MAX_INFLIGHT = 4          # 同時に翻訳するチャンク数（先読みの上限）
+
+# ---------------------------------------------
+# Excel 書き込み設定
+# ---------------------------------------------
+# True: .xlsx は xl/sharedStrings.xml を zip 内で直接書き換える（COM 不要・図形を保持）
+# インライン文字列を含むブックは EXCEL_INLINE_STRINGS_ZIP が False の場合、従来の COM / openpyxl の経路で処理する
+EXCEL_SHARED_STRINGS_FAST_PATH = True
+# True: インライン文字列（t="inlineStr"）を含む .xlsx もシートごとに zip 内で書き換え、1 つの出力にまとめる
+# ワークシートの抽出・書き換えはシート単位でプロセスプールに分散する
+EXCEL_INLINE_STRINGS_ZIP = True
+EXCEL_SHEET_WORKERS = 0                            # シート処理のプロセス数（0: CPU コア数、1: プロセスを使わない）
+EXCEL_SHEET_PARALLEL_MIN_BYTES = 8 * 1024 * 1024   # シート XML の合計がこれ未満なら同じプロセスで処理する
+
+# ---------------------------------------------
+# PowerPoint 書き込み設定
+# ---------------------------------------------
+# "zip": 翻訳対象のスライド XML だけを書き換え、動画・画像などのパートはそのままコピーする
+# "python-pptx": python-pptx でプレゼンテーション全体を読み込み直して保存する（従来方式）
+PPTX_WRITER = "zip"
+# True: プレゼンテーションを 1 回だけ解析し、抽出時のシェイプ参照を使って直接書き戻す
+PPTX_SINGLE_PASS = True
+
+# ---------------------------------------------
+# Word 書き込み設定
+# ---------------------------------------------
+# True: 文書を 1 回だけ解析し、抽出時の段落ハンドルに直接書き戻して 1 回だけ保存する
+DOCX_SINGLE_PASS = True
@@ -0,0 +1,64 @@
+# core/backends/__init__.py
+# 翻訳バックエンドのレジストリ
+# Translator は名前（設定の TRANSLATION_BACKEND など）またはインスタンスでバックエンドを受け取る。
+#
+#   google: Google 翻訳（deep_translator、オンライン）
+#   local:  CTranslate2 によるローカルモデル（オフライン、CPU でバッチ推論）
+#   stub:   各行に "[dest] " を付けて返すだけの決定的なバックエンド（テスト用）
+
+from .base import TranslationBackend, CallableBackend
+from .google import GoogleBackend
+from .local import LocalModelBackend
+from .stub import StubBackend
+
+_REGISTRY = {}
+
+
+def register_backend(name, factory):
+    """バックエンドを登録する。factory(**options) がバックエンドのインスタンスを返すこと"""
+    _REGISTRY[name] = factory
+
+
+def available_backends():
+    """登録済みのバックエンド名の一覧"""
+    return sorted(_REGISTRY)
+
+
+def _local_factory(**options):
+    from config.settings import (
+        LOCAL_MODEL_DIR, LOCAL_BATCH_SIZE, LOCAL_BEAM_SIZE, LOCAL_THREADS, LOCAL_MAX_SENTENCE_CHARS,
+    )
+    params = {
+        "model_dir": LOCAL_MODEL_DIR,
+        "batch_size": LOCAL_BATCH_SIZE,
+        "beam_size": LOCAL_BEAM_SIZE,
+        "threads": LOCAL_THREADS,
+        "max_sentence_chars": LOCAL_MAX_SENTENCE_CHARS,
+    }
+    params.update(options)
+    return LocalModelBackend(**params)
+
+
+register_backend("google", GoogleBackend)
+register_backend("local", _local_factory)
+register_backend("stub", StubBackend)
+
+
+def get_backend(backend=None, **options):
+    """
+    バックエンドを解決する。
+    backend: 登録名・TranslationBackend のインスタンス・(text, src, dest) を受け取る関数のいずれか。
+             None の場合は設定の TRANSLATION_BACKEND を使う。
+    """
+    if backend is None:
+        from config.settings import TRANSLATION_BACKEND
+        backend = TRANSLATION_BACKEND
+    if isinstance(backend, TranslationBackend):
+        return backend
+    if isinstance(backend, str):
+        if backend not in _REGISTRY:
+            raise ValueError(f"未登録の翻訳バックエンドです: {backend}（利用可能: {', '.join(available_backends())}）")
+        return _REGISTRY[backend](**options)
+    if callable(backend):
+        return CallableBackend(backend)
+    raise TypeError(f"翻訳バックエンドとして使用できません: {backend!r}")
@@ -0,0 +1,41 @@
+# core/backends/base.py
+# 翻訳バックエンドの共通インターフェース
+
+class TranslationBackend:
+    """
+    翻訳バックエンドの基底クラス。
+
+    name: レジストリに登録する名前（レートリミッタもこの名前ごとに共有される）
+    supports_batch: True の場合、Translator はセグメントのリストをそのまま translate_batch に渡す。
+                    False の場合はマーカー行で連結した 1 つの文字列として translate に渡す。
+    rate_limited: False の場合、Translator は送信レートを制限しない（ローカル推論など）
+    max_chars / max_segments: 1 回の呼び出しにまとめる上限（None なら設定値を使う）
+    """
+
+    name = "base"
+    supports_batch = False
+    rate_limited = True
+    max_chars = None
+    max_segments = None
+
+    def translate(self, text, src, dest):
+        """1 つのテキストを翻訳して返す"""
+        raise NotImplementedError
+
+    def translate_batch(self, texts, src, dest):
+        """テキストのリストを翻訳し、同じ順序・同じ長さのリストで返す"""
+        return [self.translate(text, src, dest) for text in texts]
+
+    def __call__(self, text, src, dest):
+        return self.translate(text, src, dest)
+
+
+class CallableBackend(TranslationBackend):
+    """(text, src, dest) -> 翻訳文 の関数をバックエンドとして扱うためのラッパー"""
+
+    def __init__(self, fn, name=None):
+        self.fn = fn
+        self.name = name or getattr(fn, "__name__", type(fn).__name__)
+
+    def translate(self, text, src, dest):
+        return self.fn(text, src, dest)
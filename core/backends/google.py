@@ -0,0 +1,17 @@
+# core/backends/google.py
+# deep_translator の GoogleTranslator を使うオンラインバックエンド
+
+from .base import TranslationBackend
+
+
+class GoogleBackend(TranslationBackend):
+    """
+    Google 翻訳（deep_translator 経由）。
+    1 リクエストに 1 つの文字列しか送れないため、バッチはマーカー行で連結して送る。
+    """
+
+    name = "google"
+
+    def translate(self, text, src, dest):
+        from deep_translator import GoogleTranslator
+        return GoogleTranslator(source=src, target=dest).translate(text)
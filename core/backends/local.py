@@ -0,0 +1,112 @@
+# core/backends/local.py
+# CPU 上のローカルモデルで翻訳するオフラインバックエンド（外部ネットワーク不要）
+# CTranslate2 形式に変換した MarianMT（opus-mt）モデル、または argos-translate のパッケージを使う。
+# ctranslate2 / sentencepiece は任意の依存関係のため、実際に翻訳するときに初めて import する。
+
+import os
+import threading
+
+from core.batching import split_long_segment
+from .base import TranslationBackend
+
+
+class LocalModelBackend(TranslationBackend):
+    """
+    CTranslate2 によるバッチ推論バックエンド。
+
+    model_dir: 言語ペアごとのモデルを置くディレクトリ。"{src}-{dest}"（例: en-ja）のサブディレクトリに
+               以下のどちらかの構成で配置する。
+                 - opus-mt 変換済み: model.bin と source.spm / target.spm
+                 - argos-translate パッケージ（.argosmodel を展開したもの）: model/ と sentencepiece.model
+    batch_size: 1 回の推論で処理する文の最大数
+    beam_size: ビームサーチの幅（1 で greedy。小さいほど高速）
+    threads: 推論に使う CPU スレッド数（0 で自動）
+    max_sentence_chars: 1 文として推論する最大文字数
+
+    改行を含むセグメントは行ごとに推論し、元の改行位置で連結し直す。
+    モデルの入力長（約 512 トークン）を超えた部分は切り捨てられるため、max_sentence_chars を超える行は
+    文の境界で分割して別の文として推論し、元の区切りで連結し直す。
+    翻訳元言語の自動判別（auto）には対応しないため、方向は "en->ja" のように明示すること。
+    """
+
+    name = "local"
+    supports_batch = True
+    rate_limited = False
+
+    def __init__(self, model_dir, batch_size=32, beam_size=2, threads=0, max_sentence_chars=400):
+        self.model_dir = model_dir
+        self.batch_size = batch_size
+        self.beam_size = beam_size
+        self.threads = threads
+        self.max_sentence_chars = max_sentence_chars
+        self.max_segments = batch_size
+        self._models = {}
+        self._lock = threading.Lock()
+
+    def _find_model(self, src, dest):
+        """言語ペアのモデルディレクトリと (ソース用, ターゲット用) の sentencepiece モデルを返す"""
+        if src == "auto":
+            raise ValueError("ローカルモデルでは翻訳元言語の自動判別は使用できません（例: en->ja と指定してください）")
+        pair_dir = os.path.join(self.model_dir, f"{src}-{dest}")
+        if not os.path.isdir(pair_dir):
+            raise ValueError(f"ローカル翻訳モデルが見つかりません: {pair_dir}")
+
+        if os.path.exists(os.path.join(pair_dir, "source.spm")):
+            return pair_dir, os.path.join(pair_dir, "source.spm"), os.path.join(pair_dir, "target.spm")
+        spm = os.path.join(pair_dir, "sentencepiece.model")
+        return os.path.join(pair_dir, "model"), spm, spm
+
+    def _load(self, src, dest):
+        """言語ペアのモデルを読み込む（プロセス内で 1 回だけ）"""
+        key = (src, dest)
+        with self._lock:
+            if key not in self._models:
+                ct2_dir, src_spm, tgt_spm = self._find_model(src, dest)
+
+                import ctranslate2
+                import sentencepiece
+
+                translator = ctranslate2.Translator(
+                    ct2_dir, device="cpu", inter_threads=1, intra_threads=self.threads,
+                )
+                self._models[key] = (
+                    translator,
+                    sentencepiece.SentencePieceProcessor(model_file=src_spm),
+                    sentencepiece.SentencePieceProcessor(model_file=tgt_spm),
+                )
+            return self._models[key]
+
+    def translate(self, text, src, dest):
+        return self.translate_batch([text], src, dest)[0]
+
+    def translate_batch(self, texts, src, dest):
+        translator, src_sp, tgt_sp = self._load(src, dest)
+
+        # セグメントを行に分解し、長い行は文の境界でさらに分割して、空でない文をまとめて推論する
+        # lines: セグメントごとの [(行, [(文, 区切り), ...]), ...]（空行の文のリストは None）
+        lines = []
+        sentences = []
+        for text in texts:
+            text_lines = []
+            for line in text.split("\n"):
+                pieces = split_long_segment(line.strip(), self.max_sentence_chars) if line.strip() else None
+                text_lines.append((line, pieces))
+                sentences.extend(body for body, _ in pieces or () if body.strip())
+            lines.append(text_lines)
+        if not sentences:
+            return list(texts)
+
+        tokens = [src_sp.encode(s, out_type=str) + ["</s>"] for s in sentences]
+        results = translator.translate_batch(
+            tokens, max_batch_size=self.batch_size, beam_size=self.beam_size,
+        )
+        outputs = iter(tgt_sp.decode(r.hypotheses[0]) for r in results)
+
+        translated = []
+        for text_lines in lines:
+            translated.append("\n".join(
+                "".join((next(outputs) if body.strip() else body) + sep for body, sep in pieces)
+                if pieces is not None else line
+                for line, pieces in text_lines
+            ))
+        return translated
@@ -0,0 +1,38 @@
+# core/backends/stub.py
+# テスト・ベンチマーク用の決定的なバックエンド（ネットワーク・モデル不要）
+
+import time
+
+from core.batching import is_marker_line
+from .base import TranslationBackend
+
+
+class StubBackend(TranslationBackend):
+    """
+    各行の先頭に "[dest] " を付けて返すだけのバックエンド。
+    同じ入力には常に同じ結果を返し、インラインタグ・改行・バッチのマーカー行はそのまま保持する。
+
+    delay: 1 回の呼び出しごとに待機する秒数（リモート API の応答待ちを模擬する）
+    """
+
+    name = "stub"
+    supports_batch = True
+    rate_limited = False
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+
+    def translate(self, text, src, dest):
+        return self.translate_batch([text], src, dest)[0]
+
+    def translate_batch(self, texts, src, dest):
+        if self.delay:
+            time.sleep(self.delay)
+        prefix = f"[{dest}] "
+        return [
+            "\n".join(
+                prefix + line if line.strip() and not is_marker_line(line) else line
+                for line in text.split("\n")
+            )
+            for text in texts
+        ]
@@ -0,0 +1,138 @@
+# core/batching.py
+# 複数のテキストセグメントを 1 回のリクエストにまとめるためのユーティリティ
+# セグメントは番号付きマーカー行で連結し、翻訳結果をマーカーで分割して元の順序に戻す
+# 1 リクエストの上限を超える長いセグメントは文の境界で分割し、翻訳後に元の区切りで結合し直す
+
+import re
+
+# 翻訳エンジンがほぼ確実にそのまま残す記号と数字だけでマーカーを構成する
+_MARKER_TEMPLATE = "§§{}§§"
+_MARKER_PATTERN = re.compile(r"\s*§\s*§\s*(\d+)\s*§\s*§\s*")
+
+# 文の境界: 欧文の句読点の後の空白・和文の句点の直後・改行
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+|(?<=[。！？])\s*|\n+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class BatchSplitError(ValueError):
+    """翻訳結果をマーカーで元のセグメント数に分割できなかった場合の例外"""
+
+
+def pack_segments(texts, max_chars, max_segments):
+    """
+    テキストのリストを、1 リクエストあたりの文字数・セグメント数の上限に収まるよう
+    インデックスのグループに分割する。
+
+    Args:
+        texts (list): 翻訳対象テキストのリスト。
+        max_chars (int): 1 リクエストあたりの最大文字数（マーカーを含む）。
+        max_segments (int): 1 リクエストあたりの最大セグメント数。
+
+    Returns:
+        list: インデックスのリストのリスト（例: [[0, 1, 2], [3], ...]）。
+              上限を超える長いセグメントは単独のグループになる。
+    """
+    chunks = []
+    current = []
+    current_chars = 0
+
+    for i, text in enumerate(texts):
+        cost = len(text) + len(_MARKER_TEMPLATE.format(i)) + 2
+        if current and (current_chars + cost > max_chars or len(current) >= max_segments):
+            chunks.append(current)
+            current = []
+            current_chars = 0
+        current.append(i)
+        current_chars += cost
+
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def segment_budget(max_chars, max_segments):
+    """1 セグメントの最大文字数（単独でリクエストに入れたときに max_chars をマーカー込みで超えない長さ）"""
+    return max(1, max_chars - len(_MARKER_TEMPLATE.format(max_segments)) - 2)
+
+
+def _split_keep(text, pattern):
+    """pattern で区切り、[(本文, 区切り文字列), ...] を返す（連結すると元のテキストに戻る）"""
+    units = []
+    pos = 0
+    for m in pattern.finditer(text):
+        if m.end() == m.start() and m.start() in (0, len(text)):
+            continue
+        units.append((text[pos:m.start()], m.group()))
+        pos = m.end()
+    units.append((text[pos:], ""))
+    return [(body, sep) for body, sep in units if body or sep]
+
+
+def split_long_segment(text, max_chars):
+    """
+    max_chars を超えるテキストを、上限に収まるピースに分割する。
+
+    文の境界（句読点・改行）で区切ったうえで、上限に収まる範囲で隣接する文を詰め直す。
+    1 文だけで上限を超える場合は空白で、空白もなければ max_chars 文字ごとに区切る。
+
+    Returns:
+        [(本文, 区切り), ...] — 本文だけを翻訳し、翻訳結果 + 区切り を順に連結すれば
+        元のテキストと同じ区切り（空白・改行）の翻訳文になる。
+        "".join(本文 + 区切り) は元のテキストと完全に一致する。
+    """
+    if len(text) <= max_chars:
+        return [(text, "")]
+
+    units = []
+    for body, sep in _split_keep(text, _SENTENCE_BREAK):
+        if len(body) <= max_chars:
+            units.append((body, sep))
+            continue
+        words = _split_keep(body, _WHITESPACE)
+        words[-1] = (words[-1][0], words[-1][1] + sep)
+        for word, word_sep in words:
+            # 空白のない長い文字列（URL・和文など）は機械的に区切る
+            cuts = [word[start:start + max_chars] for start in range(0, len(word), max_chars)] or [""]
+            units.extend((cut, "") for cut in cuts[:-1])
+            units.append((cuts[-1], word_sep))
+
+    pieces = []
+    for body, sep in units:
+        if pieces and len(pieces[-1][0]) + len(pieces[-1][1]) + len(body) <= max_chars:
+            prev_body, prev_sep = pieces[-1]
+            pieces[-1] = (prev_body + prev_sep + body, sep)
+        else:
+            pieces.append((body, sep))
+    return pieces
+
+
+def join_segments(texts):
+    """セグメントを番号付きマーカー行で連結して 1 つの文字列にする"""
+    lines = []
+    for i, text in enumerate(texts):
+        lines.append(_MARKER_TEMPLATE.format(i))
+        lines.append(text)
+    return "\n".join(lines)
+
+
+def is_marker_line(line):
+    """join_segments が挿入したマーカー行かどうか（翻訳を模擬するバックエンドがマーカーを保持するため）"""
+    return _MARKER_PATTERN.fullmatch(line) is not None
+
+
+def split_segments(joined, count):
+    """
+    join_segments で連結して翻訳した文字列を、元のセグメント数に分割する。
+    マーカーの欠落・重複・順序の乱れがあれば BatchSplitError を送出する。
+    """
+    parts = _MARKER_PATTERN.split(joined or "")
+    # split の結果: [先頭の余り, 番号0, 本文0, 番号1, 本文1, ...]
+    head, rest = parts[0], parts[1:]
+    if head.strip():
+        raise BatchSplitError("マーカーより前に余分なテキストがあります")
+
+    numbers = [int(n) for n in rest[0::2]]
+    if numbers != list(range(count)):
+        raise BatchSplitError(f"マーカー数が一致しません: 期待値 {count}, 実際 {len(numbers)}")
+
+    return [body.strip() for body in rest[1::2]]
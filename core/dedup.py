@@ -0,0 +1,61 @@
+# core/dedup.py
+# 文書内の重複セグメントをまとめるユーティリティ
+# 正規化後に同一となるセグメントは 1 回だけ翻訳し、結果をすべての出現位置に展開する
+
+import re
+import unicodedata
+
+_INLINE_SPACE = re.compile(r"[ \t　 ]+")
+
+
+def normalize_segment(text):
+    """
+    重複判定用の正規化キーを返す。
+    Unicode NFC 正規化、前後の空白除去、行内の連続する空白の 1 文字化を行う。
+    改行は段落構造を表すためそのまま残す。
+    """
+    text = unicodedata.normalize("NFC", text)
+    lines = [_INLINE_SPACE.sub(" ", line).strip() for line in text.strip().split("\n")]
+    return "\n".join(lines)
+
+
+class DedupResult:
+    """
+    dedupe_segments の結果。
+
+    unique: 翻訳に送る代表テキストのリスト（最初の出現をそのまま使う）
+    index_map: 元のセグメント i が unique の何番目に対応するか
+    """
+
+    def __init__(self, unique, index_map):
+        self.unique = unique
+        self.index_map = index_map
+
+    @property
+    def total(self):
+        return len(self.index_map)
+
+    @property
+    def saved(self):
+        """重複排除によって削減できた翻訳セグメント数"""
+        return self.total - len(self.unique)
+
+    def expand(self, translated_unique):
+        """unique に対する翻訳結果を元のセグメント順に展開する"""
+        return [translated_unique[u] for u in self.index_map]
+
+
+def dedupe_segments(texts):
+    """正規化キーが同じセグメントを 1 つにまとめた DedupResult を返す"""
+    seen = {}
+    unique = []
+    index_map = []
+    for text in texts:
+        key = normalize_segment(text)
+        u = seen.get(key)
+        if u is None:
+            u = len(unique)
+            seen[key] = u
+            unique.append(text)
+        index_map.append(u)
+    return DedupResult(unique, index_map)
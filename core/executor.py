@@ -0,0 +1,170 @@
+# core/executor.py
+# 翻訳リクエストの並列実行エンジン
+# スレッドプールでリクエストを並列に送り、バックエンドごとのトークンバケットで送信レートを制限する。
+# 一時的なエラー（429 / 5xx / 接続エラーなど）は指数バックオフ + ジッターで再試行する。
+
+import contextvars
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from core import metrics
+
+# deep_translator / requests が送出する一時的なエラーのクラス名
+# （バックエンドに依存しないよう、クラスを import せず名前で判定する）
+TRANSIENT_ERROR_NAMES = {
+    "TooManyRequests",
+    "RequestError",
+    "ServerException",
+    "ConnectionError",
+    "ConnectTimeout",
+    "ReadTimeout",
+    "Timeout",
+    "ChunkedEncodingError",
+}
+
+
+class TransientTranslationError(Exception):
+    """再試行すれば成功する可能性があるエラー（独自バックエンドから明示的に送出する用途）"""
+
+
+class TranslationError(Exception):
+    """
+    再試行しても翻訳できなかったセグメントがある場合の例外。
+
+    failures: [(セグメントのテキスト, 例外), ...]
+    results: 失敗したセグメントを原文のままにした、translate_batch と同じ形の結果
+    """
+
+    def __init__(self, failures, results=None):
+        self.failures = failures
+        self.results = results
+        first = failures[0][1] if failures else None
+        super().__init__(f"{len(failures)} 件のセグメントを翻訳できませんでした（最初のエラー: {first!r}）")
+
+
+def is_transient(exc):
+    """例外が再試行に値する一時的なエラーかどうかを判定する"""
+    if isinstance(exc, (TransientTranslationError, ConnectionError, TimeoutError)):
+        return True
+    return any(cls.__name__ in TRANSIENT_ERROR_NAMES for cls in type(exc).__mro__)
+
+
+class TokenBucket:
+    """
+    トークンバケット方式のレートリミッタ。
+    rate: 1 秒あたりに補充されるトークン数（= 平均リクエスト数/秒）。0 以下で無制限。
+    burst: バケットの容量（瞬間的に連続送信できるリクエスト数）。
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(burst))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """トークンを 1 つ取得できるまで待機する"""
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(name, rate, burst):
+    """バックエンド名ごとに共有されるトークンバケットを返す（同じバックエンドを使う全 Translator で共有）"""
+    with _limiters_lock:
+        limiter = _limiters.get(name)
+        if limiter is None:
+            limiter = TokenBucket(rate, burst)
+            _limiters[name] = limiter
+        return limiter
+
+
+class TranslationExecutor:
+    """
+    翻訳リクエストを並列に実行し、入力と同じ順序で結果を返す実行エンジン。
+
+    max_workers: 同時に送信するリクエスト数
+    limiter: TokenBucket（None なら制限なし）
+    retries: 一時的なエラーに対する最大再試行回数
+    base_delay / max_delay: 指数バックオフの初期待機秒数と上限
+    name: メトリクスのラベルに使う名前（バックエンド名）
+    """
+
+    def __init__(self, max_workers=4, limiter=None, retries=3, base_delay=0.5, max_delay=8.0, name="backend"):
+        self.name = name
+        self.max_workers = max(1, int(max_workers))
+        self.limiter = limiter
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def _get_pool(self):
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="translate"
+                )
+            return self._pool
+
+    def call(self, fn, *args):
+        """
+        レート制限を守りながら fn(*args) を呼び出す。
+        一時的なエラーは指数バックオフ（フルジッター）で再試行し、
+        再試行を使い切った場合や恒久的なエラーの場合は例外をそのまま送出する。
+        各試行の所要時間と成否、再試行回数はメトリクスに記録される。
+        """
+        attempt = 0
+        while True:
+            if self.limiter is not None:
+                self.limiter.acquire()
+            started = time.perf_counter()
+            try:
+                result = fn(*args)
+            except Exception as exc:
+                metrics.record_backend_call(self.name, time.perf_counter() - started, ok=False)
+                if attempt >= self.retries or not is_transient(exc):
+                    raise
+                metrics.record_retry(self.name)
+                delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+                time.sleep(random.uniform(0, delay))
+                attempt += 1
+            else:
+                metrics.record_backend_call(self.name, time.perf_counter() - started, ok=True)
+                return result
+
+    def map(self, fn, items):
+        """
+        items の各要素に fn を並列に適用し、入力順の結果リストを返す。
+        fn 内の例外は呼び出し元に送出される（fn 側で失敗を結果として表現すること）。
+        呼び出し元のコンテキスト（ジョブごとの計測対象など）はワーカースレッドにも引き継がれる。
+        """
+        items = list(items)
+        if len(items) <= 1 or self.max_workers == 1:
+            return [fn(item) for item in items]
+        pool = self._get_pool()
+        futures = [pool.submit(contextvars.copy_context().run, fn, item) for item in items]
+        return [future.result() for future in futures]
+
+    def shutdown(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
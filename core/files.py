@@ -0,0 +1,215 @@
+# core/files.py
+# アップロード・出力ファイルのライフサイクル管理
+#   - ジョブごとの一意な作業フォルダ（同名ファイルの同時アップロードでも衝突しない）
+#   - アップロードをチャンク単位で保存し、サイズ上限を超えたら中断する（メモリ使用量は一定）
+#   - 出力先フォルダをジョブ単位で切り替える（Translator._make_output_path が参照する）
+#   - 複数言語への翻訳では出力ファイル名に言語コードを付け、まとめて zip にできる
+#   - 保持期間（TTL）とディスク使用量の上限に従って古いファイルを削除するバックグラウンドの掃除スレッド
+
+import contextvars
+import os
+import shutil
+import threading
+import time
+import uuid
+import zipfile
+from contextlib import contextmanager
+
+
+class UploadTooLarge(ValueError):
+    """アップロードされたファイルがサイズ上限を超えた場合の例外"""
+
+    def __init__(self, max_bytes):
+        super().__init__(f"ファイルサイズが上限（{max_bytes // (1024 * 1024)} MB）を超えています")
+        self.max_bytes = max_bytes
+
+
+def client_filename(name, default="upload"):
+    """
+    クライアントから送られたファイル名を保存用の名前にする。
+    ディレクトリ部分（Windows の区切りを含む）と制御文字を取り除く。日本語などの文字はそのまま残す。
+    """
+    name = os.path.basename((name or "").replace("\\", "/"))
+    name = "".join(ch for ch in name if ch.isprintable()).strip().lstrip(".")
+    return name or default
+
+
+def create_workspace(root):
+    """root の下にジョブ用の一意なフォルダを作成してパスを返す"""
+    path = os.path.join(root, uuid.uuid4().hex)
+    os.makedirs(path)
+    return path
+
+
+def save_stream(stream, path, max_bytes, chunk_size=1024 * 1024):
+    """
+    stream（アップロードされたファイルなど）をチャンク単位で path に書き込み、書き込んだバイト数を返す。
+    max_bytes を超えた時点で書きかけのファイルを削除して UploadTooLarge を送出する。
+    """
+    written = 0
+    try:
+        with open(path, "wb") as f:
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    break
+                written += len(chunk)
+                if max_bytes and written > max_bytes:
+                    raise UploadTooLarge(max_bytes)
+                f.write(chunk)
+    except BaseException:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+    return written
+
+
+# ---------------------------------------------
+# ジョブ単位の出力フォルダ
+# ---------------------------------------------
+_output_dir = contextvars.ContextVar("translation_output_dir", default=None)
+_output_label = contextvars.ContextVar("translation_output_label", default=None)
+
+
+@contextmanager
+def output_workspace(path):
+    """with output_workspace(path): の範囲内で作成される翻訳済みファイルを path に出力する"""
+    os.makedirs(path, exist_ok=True)
+    token = _output_dir.set(path)
+    try:
+        yield path
+    finally:
+        _output_dir.reset(token)
+
+
+def current_output_dir(default):
+    """現在のジョブの出力フォルダ（output_workspace の外では default）"""
+    return _output_dir.get() or default
+
+
+@contextmanager
+def output_label(label):
+    """with output_label("ja"): の範囲内で作成される出力ファイル名に "_ja" を付ける（None なら付けない）"""
+    token = _output_label.set(label)
+    try:
+        yield
+    finally:
+        _output_label.reset(token)
+
+
+def output_suffix():
+    """出力ファイル名に付ける言語ラベル（"_ja" など。ラベルがなければ空文字）"""
+    label = _output_label.get()
+    return f"_{label}" if label else ""
+
+
+def archive_outputs(paths, zip_path):
+    """
+    出力ファイルを 1 つの zip にまとめて zip_path を返す。
+    Office 文書はすでに圧縮されているため、再圧縮せずに格納する。
+    """
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_STORED) as zf:
+        for path in paths:
+            zf.write(path, os.path.basename(path))
+    return zip_path
+
+
+# ---------------------------------------------
+# 古いファイルの掃除
+# ---------------------------------------------
+def _entries(root):
+    """root 直下の各エントリの (パス, 最終更新時刻, 合計サイズ)。フォルダは中身の最新時刻と合計サイズ"""
+    entries = []
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        try:
+            if os.path.isdir(path) and not os.path.islink(path):
+                mtime = os.path.getmtime(path)
+                size = 0
+                for dirpath, _, filenames in os.walk(path):
+                    for filename in filenames:
+                        st = os.stat(os.path.join(dirpath, filename))
+                        mtime = max(mtime, st.st_mtime)
+                        size += st.st_size
+            else:
+                st = os.lstat(path)
+                mtime, size = st.st_mtime, st.st_size
+        except OSError:
+            continue   # 掃除中に削除されたエントリ
+        entries.append((path, mtime, size))
+    return entries
+
+
+def _remove(path):
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def sweep(root, ttl_seconds=None, quota_bytes=None, now=None):
+    """
+    root 直下のファイル・フォルダのうち、最終更新から ttl_seconds を過ぎたものを削除し、
+    残りの合計サイズが quota_bytes を超える場合は古い順に削除する。
+    削除したエントリ数と解放したバイト数を返す。
+    """
+    if not os.path.isdir(root):
+        return 0, 0
+    now = time.time() if now is None else now
+    entries = sorted(_entries(root), key=lambda entry: entry[1])
+
+    removed = []
+    if ttl_seconds:
+        removed = [entry for entry in entries if now - entry[1] > ttl_seconds]
+        entries = entries[len(removed):]
+    if quota_bytes:
+        total = sum(size for _, _, size in entries)
+        while entries and total > quota_bytes:
+            entry = entries.pop(0)
+            removed.append(entry)
+            total -= entry[2]
+
+    for path, _, _ in removed:
+        _remove(path)
+    return len(removed), sum(size for _, _, size in removed)
+
+
+class Sweeper:
+    """
+    一定間隔で sweep() を実行するデーモンスレッド。
+
+    targets: [(フォルダ, TTL 秒, 容量上限バイト), ...]（TTL・上限は None で無効）
+    interval: 掃除の間隔（秒）
+    """
+
+    def __init__(self, targets, interval=300):
+        self.targets = list(targets)
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="file-sweeper", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def run_once(self):
+        for root, ttl_seconds, quota_bytes in self.targets:
+            try:
+                count, freed = sweep(root, ttl_seconds, quota_bytes)
+            except OSError as e:
+                print(f"[警告] {root} の古いファイルを削除できませんでした: {e}")
+                continue
+            if count:
+                print(f"[クリーンアップ] {root} から {count} 件（{freed} バイト）の古いファイルを削除しました")
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            self.run_once()
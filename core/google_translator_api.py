@@ -1,19 +1,22 @@
 # core/google_translator_api.py
 # Deep-translator を使用して Google 翻訳を行うモジュール
+# 旧 API との互換用。実体は core.backends の "google" バックエンド。
+
+from core.backends import get_backend
 
-from deep_translator import GoogleTranslator as GT
 
 class GoogleTranslator:
     def __init__(self, source_lang="auto", target_lang="en"):
         self.source_lang = source_lang
         self.target_lang = target_lang
+        self._backend = get_backend("google")
 
     def translate(self, text):
         """テキストを翻訳"""
         if not text or not text.strip():
             return text
         try:
-            return GT(source=self.source_lang, target=self.target_lang).translate(text)
+            return self._backend.translate(text, self.source_lang, self.target_lang)
         except Exception as e:
             print(f"Translation error: {e}")
             return text
@@ -0,0 +1,133 @@
+# core/jobs.py
+# バックグラウンド翻訳ジョブの管理
+# HTTP リクエストは投入だけを行って即座に応答し、翻訳処理はワーカープールで実行する
+
+import json
+import os
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from core import metrics
+
+# ジョブの状態
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+ERROR = "error"
+
+
+class Job:
+    """1 件の翻訳ジョブの状態を保持する"""
+
+    def __init__(self, job_id, filename, direction):
+        self.id = job_id
+        self.filename = filename
+        self.direction = direction
+        self.status = QUEUED
+        self.output_path = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.report = None   # metrics.JobReport（実行開始後に設定される）
+
+    @property
+    def finished(self):
+        return self.status in (DONE, ERROR)
+
+    def to_dict(self):
+        """ステータス API 用の辞書表現"""
+        return {
+            "id": self.id,
+            "filename": self.filename,
+            "direction": self.direction,
+            "status": self.status,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobManager:
+    """
+    インプロセスのジョブキュー。
+
+    max_workers: 同時に実行するジョブ数（各ジョブ内の翻訳リクエストはさらに Translator 側で並列化される）
+    retention_seconds: 完了したジョブを保持する秒数（これを過ぎたジョブは一覧から削除される）
+    report_dir: 指定した場合、ジョブごとの計測レポートを <report_dir>/<job_id>.json に保存する
+    """
+
+    def __init__(self, max_workers=2, retention_seconds=3600, report_dir=None):
+        self.retention_seconds = retention_seconds
+        self.report_dir = report_dir
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+
+    def submit(self, fn, filename, direction, on_finish=None):
+        """
+        fn() をバックグラウンドで実行するジョブを登録し、Job を返す。
+        fn の戻り値は出力ファイルパスとして扱う。
+        on_finish(job) はジョブ終了時（成功・失敗とも）に呼び出される。
+        """
+        self._purge_expired()
+        job = Job(uuid.uuid4().hex, filename, direction)
+        with self._lock:
+            self._jobs[job.id] = job
+        self._pool.submit(self._run, job, fn, on_finish)
+        return job
+
+    def _run(self, job, fn, on_finish):
+        job.status = RUNNING
+        job.started_at = time.time()
+        try:
+            with metrics.job_report() as job.report:
+                job.output_path = fn()
+            job.status = DONE
+        except Exception as e:
+            traceback.print_exc()
+            job.error = str(e)
+            job.status = ERROR
+        finally:
+            job.finished_at = time.time()
+            metrics.record_job(job.status)
+            self._save_report(job)
+            if on_finish is not None:
+                try:
+                    on_finish(job)
+                except Exception as e:
+                    print(f"[警告] ジョブ {job.id} の後処理に失敗しました: {e}")
+
+    def _save_report(self, job):
+        """計測レポートを JSON ファイルに保存する（report_dir が指定されている場合のみ）"""
+        if not self.report_dir or job.report is None:
+            return
+        try:
+            os.makedirs(self.report_dir, exist_ok=True)
+            with open(os.path.join(self.report_dir, f"{job.id}.json"), "w", encoding="utf-8") as f:
+                json.dump(dict(job.to_dict(), report=job.report.to_dict()), f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            print(f"[警告] ジョブ {job.id} のレポートを保存できませんでした: {e}")
+
+    def get(self, job_id):
+        """ジョブ ID から Job を返す（存在しなければ None）"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _purge_expired(self):
+        """保持期間を過ぎた完了済みジョブを削除する"""
+        cutoff = time.time() - self.retention_seconds
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self._jobs.items()
+                if job.finished and job.finished_at < cutoff
+            ]
+            for job_id in expired:
+                del self._jobs[job_id]
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait)
@@ -0,0 +1,104 @@
+# core/manifest.py
+# 差分翻訳用のサイドカーマニフェスト
+# 文書内の位置（シート!セル、スライド/シェイプパス、段落パスなど）ごとに原文のハッシュと翻訳結果を保存する。
+# 次回の翻訳では、ハッシュが一致する位置は前回の翻訳を再利用し、新規・変更された位置だけを翻訳に送る。
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+MANIFEST_VERSION = 1
+
+
+def _hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+def location_key(*parts):
+    """位置情報の要素を連結してマニフェストのキーにする（例: ("Sheet1", "B3") -> "Sheet1/B3"）"""
+    return "/".join(str(part) for part in parts)
+
+
+def content_key(prefix, text):
+    """
+    文書内の位置を持たないセグメント（xlsx の共有文字列など）のキー。
+    原文のハッシュをキーにするため、表の途中に文字列が追加されて順序がずれても前回分を再利用できる。
+    """
+    return location_key(prefix, _hash(text))
+
+
+def manifest_path_for(input_path, direction, manifest_dir):
+    """
+    入力ファイルと翻訳方向からマニフェストのパスを決める。
+    ファイル名が同じでもフォルダが違えば別の文書として扱うよう、絶対パスのハッシュを名前に含める。
+    """
+    pair = "-".join(part.strip() or "auto" for part in direction.split("->"))
+    digest = hashlib.sha256(os.path.abspath(input_path).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(manifest_dir, f"{os.path.basename(input_path)}.{digest}.{pair}.json")
+
+
+class SegmentManifest:
+    """
+    1 文書分のセグメント指紋。
+
+    path: マニフェストファイルのパス（存在しなければ空の状態から始める）
+    context: 翻訳結果に影響する条件（翻訳方向・バックエンドなど）。前回と異なる場合は前回分を使わない。
+
+    lookup() は前回のマニフェストを参照し、record() は今回の結果を記録する。
+    save() で今回記録した位置だけを書き出すため、文書から削除された位置は自然に消える。
+    """
+
+    def __init__(self, path, context=None):
+        self.path = path
+        self.context = context or {}
+        self.previous = {}
+        self.current = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[警告] マニフェストを読み込めませんでした（全文を翻訳します）: {self.path}: {e}")
+            return
+        if data.get("version") != MANIFEST_VERSION or data.get("context") != self.context:
+            return
+        self.previous = data.get("segments", {})
+
+    def lookup(self, key, text):
+        """前回と同じ位置に同じ原文があれば、その翻訳を返す（なければ None）"""
+        entry = self.previous.get(key)
+        if entry and entry[0] == _hash(text):
+            return entry[1]
+        return None
+
+    def record(self, key, text, translation):
+        """今回の翻訳結果を記録する"""
+        with self._lock:
+            self.current[key] = [_hash(text), translation]
+
+    def save(self):
+        """
+        今回記録した内容をマニフェストファイルに書き出す。
+        同じマニフェストを複数のプロセスが同時に保存しても壊れないよう、
+        保存ごとに別名の一時ファイルに書き込んでから置き換える。
+        """
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            data = {"version": MANIFEST_VERSION, "context": self.context, "segments": self.current}
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(self.path) + ".", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(tmp_path, self.path)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
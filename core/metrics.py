@@ -0,0 +1,272 @@
+# core/metrics.py
+# 翻訳パイプラインの計測
+# 読み取り・翻訳・書き込みの各ステージとバックエンド呼び出しの所要時間、セグメント数・文字数、
+# 翻訳メモリのヒット数、再試行回数などを記録する。
+#   - プロセス全体の累積値: Prometheus のテキスト形式で出力（/metrics）
+#   - ジョブ単位の値: job_report() の範囲内で記録された分を JSON で出力（/jobs/<id>/report）
+# 外部ライブラリには依存しない。
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+# 所要時間ヒストグラムの既定バケット（秒）
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """単調増加するカウンタ（ラベルの値の組ごとに集計）"""
+
+    kind = "counter"
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}" for key, value in items]
+
+
+class Histogram:
+    """所要時間などの分布を記録するヒストグラム（Prometheus の累積バケット形式）"""
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}   # labels -> [バケットごとの件数, 合計, 件数]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for k, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[0][k] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def render(self):
+        with self._lock:
+            items = sorted((key, (list(counts), total, count)) for key, (counts, total, count) in self._values.items())
+        lines = []
+        for key, (counts, total, count) in items:
+            for bound, bucket_count in zip(self.buckets, counts):
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, ('le', bound))} {bucket_count}")
+            lines.append(f"{self.name}_bucket{_format_labels(self.labels, key, ('le', '+Inf'))} {count}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """メトリクスの一覧を保持し、Prometheus のテキスト形式に変換する"""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "translation_stage_seconds", "Time spent per pipeline stage (read / translate / write).",
+    labels=("format", "stage"),
+))
+BACKEND_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "translation_backend_request_seconds", "Latency of a single backend call attempt.",
+    labels=("backend",),
+))
+BACKEND_REQUESTS = REGISTRY.register(Counter(
+    "translation_backend_requests_total", "Backend call attempts by outcome.",
+    labels=("backend", "outcome"),
+))
+BACKEND_RETRIES = REGISTRY.register(Counter(
+    "translation_backend_retries_total", "Backend calls retried after a transient error.",
+    labels=("backend",),
+))
+BACKEND_CHARACTERS = REGISTRY.register(Counter(
+    "translation_backend_characters_total", "Characters sent to the backend.",
+    labels=("backend",),
+))
+SEGMENTS = REGISTRY.register(Counter(
+    "translation_segments_total",
+    "Segments seen by translate_batch, by kind "
+    "(segments / unique / dedup_saved / memory_hits / manifest_reused / untranslatable / already_target / "
+    "oversized / failed).",
+    labels=("kind",),
+))
+JOBS = REGISTRY.register(Counter(
+    "translation_jobs_total", "Finished translation jobs by status.",
+    labels=("status",),
+))
+
+
+class JobReport:
+    """1 ジョブ分の計測結果（ステージ別の所要時間・セグメント数・バックエンド呼び出しなど）"""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.finished_at = None
+        self.stages = {}          # "format.stage" -> 秒
+        self.segments = {}        # kind -> 件数
+        self.backend = {"requests": 0, "errors": 0, "retries": 0, "characters": 0, "seconds": 0.0}
+        self._lock = threading.Lock()
+
+    def add_stage(self, name, seconds):
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def add_segments(self, counts):
+        with self._lock:
+            for kind, value in counts.items():
+                self.segments[kind] = self.segments.get(kind, 0) + value
+
+    def add_backend(self, **values):
+        with self._lock:
+            for key, value in values.items():
+                self.backend[key] += value
+
+    def to_dict(self):
+        with self._lock:
+            finished = self.finished_at or time.time()
+            backend = dict(self.backend)
+            seconds = backend["seconds"]
+            return {
+                "wall_seconds": round(finished - self.started_at, 3),
+                "stages": {name: round(value, 3) for name, value in self.stages.items()},
+                "segments": dict(self.segments),
+                "backend": dict(
+                    backend,
+                    seconds=round(seconds, 3),
+                    characters_per_second=round(backend["characters"] / seconds, 1) if seconds else None,
+                ),
+            }
+
+
+# 実行中のジョブの JobReport（TranslationExecutor がワーカースレッドにもコンテキストを引き継ぐ）
+_current_report = contextvars.ContextVar("translation_job_report", default=None)
+
+
+def current_report():
+    return _current_report.get()
+
+
+@contextmanager
+def job_report():
+    """
+    with job_report() as report: の範囲内で記録されたメトリクスを report にも集計する。
+    ジョブごとのスレッド（またはプロセス）で使う。
+    """
+    report = JobReport()
+    token = _current_report.set(report)
+    try:
+        yield report
+    finally:
+        _current_report.reset(token)
+        report.finished_at = time.time()
+        summary = report.to_dict()
+        print(
+            f"[計測] ジョブ完了 {summary['wall_seconds']:.3f} 秒 ステージ: {summary['stages']} "
+            f"セグメント: {summary['segments']} バックエンド: {summary['backend']}"
+        )
+
+
+@contextmanager
+def stage(fmt, name):
+    """ステージ（read / translate / write など）の所要時間を記録する"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.observe(elapsed, format=fmt, stage=name)
+        report = current_report()
+        if report is not None:
+            report.add_stage(f"{fmt}.{name}", elapsed)
+
+
+def record_segments(**counts):
+    """translate_batch のセグメント数（segments / unique / memory_hits など）を記録する"""
+    for kind, value in counts.items():
+        SEGMENTS.inc(value, kind=kind)
+    report = current_report()
+    if report is not None:
+        report.add_segments(counts)
+
+
+def record_backend_call(backend, seconds, ok):
+    """バックエンド呼び出し 1 回分（再試行を含む各試行）の所要時間と成否を記録する"""
+    BACKEND_REQUEST_SECONDS.observe(seconds, backend=backend)
+    BACKEND_REQUESTS.inc(backend=backend, outcome="ok" if ok else "error")
+    report = current_report()
+    if report is not None:
+        report.add_backend(requests=1, errors=0 if ok else 1, seconds=seconds)
+
+
+def record_retry(backend):
+    BACKEND_RETRIES.inc(backend=backend)
+    report = current_report()
+    if report is not None:
+        report.add_backend(retries=1)
+
+
+def record_characters(backend, count):
+    BACKEND_CHARACTERS.inc(count, backend=backend)
+    report = current_report()
+    if report is not None:
+        report.add_backend(characters=count)
+
+
+def record_job(status):
+    JOBS.inc(status=status)
+
+
+def render_prometheus():
+    """/metrics 用の Prometheus テキスト形式"""
+    return REGISTRY.render()
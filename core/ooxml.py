@@ -0,0 +1,99 @@
+# core/ooxml.py
+# Office Open XML (xlsx / pptx / docx) の zip パッケージを直接扱うための共通ユーティリティ
+# 変更したパートだけを書き換え、それ以外のパートは内容を変えずにそのままコピーする
+
+import posixpath
+import re
+import shutil
+import zipfile
+
+from lxml import etree
+
+REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+OFFICE_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+XML_SPACE = "{http://www.w3.org/XML/1998/namespace}space"
+
+# 巨大な XML パートも読み込めるようにする（sharedStrings や slide が数十 MB になることがある）
+_PARSER = etree.XMLParser(huge_tree=True, remove_blank_text=False)
+# XML 1.0 に書けない制御文字（タブ・改行を除く）
+_CTRL_CHARS = re.compile(r"([\x00-\x08\x0B-\x1F])")
+
+
+def parse_part(zf, name):
+    """zip 内の XML パートを lxml の要素として読み込む"""
+    with zf.open(name) as f:
+        return etree.parse(f, _PARSER).getroot()
+
+
+def parse_part_bytes(data):
+    """書き換え済みのパート（バイト列）を lxml の要素として読み込む"""
+    return etree.fromstring(data, _PARSER)
+
+
+def serialize_part(root):
+    """XML 要素をパートとして書き戻すためのバイト列に変換する"""
+    return etree.tostring(root, xml_declaration=True, encoding="UTF-8", standalone=True)
+
+
+def rels_path_for(part_name):
+    """パート名に対応する .rels のパス（例: xl/workbook.xml -> xl/_rels/workbook.xml.rels）"""
+    directory, base = posixpath.split(part_name)
+    return posixpath.join(directory, "_rels", base + ".rels")
+
+
+def read_relationships(zf, part_name, rel_type=None):
+    """
+    パートのリレーションシップを {rId: 絶対パート名} で返す。
+    外部リンク（TargetMode="External"）は含めない。
+    rel_type を指定した場合は Type の末尾が一致するもの（例: "sharedStrings"）だけを返す。
+    """
+    rels_name = rels_path_for(part_name)
+    if rels_name not in zf.namelist():
+        return {}
+    root = parse_part(zf, rels_name)
+    base_dir = posixpath.dirname(part_name)
+    rels = {}
+    for rel in root.iter(f"{{{REL_NS}}}Relationship"):
+        if rel.get("TargetMode") == "External":
+            continue
+        if rel_type and not rel.get("Type", "").endswith("/" + rel_type):
+            continue
+        target = rel.get("Target", "")
+        if target.startswith("/"):
+            resolved = target.lstrip("/")
+        else:
+            resolved = posixpath.normpath(posixpath.join(base_dir, target))
+        rels[rel.get("Id")] = resolved
+    return rels
+
+
+def set_text_preserving_space(t_elm, text):
+    """<t> 要素のテキストを設定し、前後の空白や改行がある場合は xml:space="preserve" を付ける"""
+    t_elm.text = text
+    if text and (text != text.strip() or "\n" in text):
+        t_elm.set(XML_SPACE, "preserve")
+
+
+def escape_ctrl_chars(text):
+    """制御文字を _xHHHH_ 形式にエスケープする（python-pptx の run.text と同じ。XML に書けない文字を含む翻訳結果用）"""
+    return _CTRL_CHARS.sub(lambda m: "_x%04X_" % ord(m.group(1)), text)
+
+
+def copy_zip_with_replacements(src_path, dest_path, replacements):
+    """
+    src_path の zip パッケージを dest_path にコピーする。
+    replacements: {パート名: 新しいバイト列}。ここに含まれるパートだけを差し替え、
+    それ以外（画像・動画などのメディアを含む）はストリームで内容をそのままコピーする。
+    メンバーの順序・圧縮方式・タイムスタンプは元のパッケージを維持する。
+    """
+    with zipfile.ZipFile(src_path) as src, \
+            zipfile.ZipFile(dest_path, "w", compression=zipfile.ZIP_DEFLATED) as dest:
+        for info in src.infolist():
+            out_info = zipfile.ZipInfo(info.filename, date_time=info.date_time)
+            out_info.compress_type = info.compress_type
+            out_info.external_attr = info.external_attr
+            if info.filename in replacements:
+                dest.writestr(out_info, replacements[info.filename])
+                continue
+            with src.open(info) as fin, dest.open(out_info, "w", force_zip64=info.file_size > 0x7FFFFFFF) as fout:
+                shutil.copyfileobj(fin, fout, 1024 * 1024)
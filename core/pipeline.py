@@ -0,0 +1,119 @@
+# core/pipeline.py
+# 読み取り・翻訳・書き込みを重ねて実行するストリーミングパイプライン
+# リーダー（ジェネレータ）が見つけたセグメントを件数・文字数の上限付きチャンクにまとめて順に翻訳へ送り、
+# 翻訳ワーカーがチャンクを並行して翻訳している間もリーダーは解析を続ける。
+# 書き込み側は翻訳済みのチャンクを読み取り順に受け取って適用する。
+# 翻訳中・書き込み待ちのチャンク数に上限がある（上限付きキュー）ため、メモリ使用量は入力サイズに依存しない。
+#
+# リーダーと書き込みは呼び出し元のスレッドで交互に実行し、別スレッドで動くのは翻訳だけにする。
+# python-docx / python-pptx / lxml の文書ツリーはスレッドセーフではなく、
+# 同じツリーの解析と書き換えを別スレッドで同時に行えないため。
+
+import contextvars
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+
+from config.settings import (
+    PIPELINE_ENABLED, PIPELINE_CHUNK_SEGMENTS, PIPELINE_CHUNK_CHARS, PIPELINE_MAX_INFLIGHT,
+)
+
+
+def iter_chunks(items, size_fn, max_items, max_chars):
+    """items を件数・文字数の上限でまとめたリストとして順に返す（1 件で上限を超えるものは単独のチャンク）"""
+    chunk = []
+    chars = 0
+    for item in items:
+        size = size_fn(item)
+        if chunk and (len(chunk) >= max_items or chars + size > max_chars):
+            yield chunk
+            chunk = []
+            chars = 0
+        chunk.append(item)
+        chars += size
+    if chunk:
+        yield chunk
+
+
+def resolve_stream_source(translator, items, text_fn, directions):
+    """
+    文書全体で共有する原文の言語（Translator.resolve_source）を 1 回だけ推定し、(言語, items) を返す。
+    推定に必要な先頭部分だけを items から先読みし、先読みした分を含めて元の順序で返すイテレータを返す。
+    チャンクごとに推定し直すと、チャンクによって原文の言語が変わり、翻訳するかどうかが食い違うため。
+    """
+    items = iter(items)
+    head = []
+
+    def sample():
+        for item in items:
+            head.append(item)
+            yield text_fn(item)
+
+    source = translator.resolve_source(sample(), directions)
+    return source, chain(head, items)
+
+
+def run_ordered(chunks, work, consume, max_inflight=4, name="pipeline"):
+    """
+    チャンクごとに work(chunk) を最大 max_inflight 件まで並行して実行し、consume(chunk, 結果) を読み込み順に呼ぶ。
+
+    chunks はこのスレッドで 1 件ずつ取り出し、consume もこのスレッドで呼ぶ。
+    上限に達したら最も古いチャンクの完了を待って書き出してから次のチャンクを読むため、先読みは max_inflight 件まで。
+    work は呼び出し元のコンテキスト（ジョブのメトリクス・出力先など）を引き継いで実行する。
+    """
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=max_inflight, thread_name_prefix=name) as pool:
+        for chunk in chunks:
+            context = contextvars.copy_context()
+            pending.append((chunk, pool.submit(context.run, work, chunk)))
+            # 完了済みの先頭チャンクはすぐに書き出す（上限に達するまで待たない）
+            while pending and (len(pending) >= max_inflight or pending[0][1].done()):
+                done_chunk, future = pending.popleft()
+                consume(done_chunk, future.result())
+        while pending:
+            done_chunk, future = pending.popleft()
+            consume(done_chunk, future.result())
+
+
+def translate_stream(translator, segments, directions, apply, manifests=None, name="pipeline", exempt=None):
+    """
+    segments を読み進めながらチャンク単位で翻訳し、結果を読み取り順に apply に渡す。
+
+    Args:
+        translator: core.translate_text_google.Translator
+        segments: (key, text, item) を順に返すイテラブル（ジェネレータで文書を解析しながら返してよい）。
+                  key は差分翻訳用の位置キー（core.manifest.location_key）、item は書き戻し先のハンドルなど。
+        directions: 翻訳方向のリスト（"en->ja" など）
+        apply: apply(item, {direction: 翻訳結果}) をセグメントごとに呼ぶ（呼び出し元のスレッドで実行）
+        manifests: {direction: SegmentManifest}（省略可）
+        exempt: exempt(key) が True のセグメントには事前フィルタを適用しない（省略可）
+
+    重複排除・翻訳メモリ・リクエストの詰め込みはチャンクごとに translate_batch_targets が行う。
+    原文の言語が auto の場合の推定は、文書の先頭部分から 1 回だけ行ってすべてのチャンクで共有する。
+    チャンクの上限と同時実行数は PIPELINE_* の設定に従い、PIPELINE_ENABLED が False の場合は
+    すべて読み取ってから 1 回で翻訳する。処理したセグメント数を返す。
+    """
+    count = 0
+    source, segments = resolve_stream_source(translator, segments, lambda segment: segment[1], directions)
+
+    def translate_chunk(chunk):
+        return translator.translate_batch_targets(
+            [text for _, text, _ in chunk], directions,
+            keys=[key for key, _, _ in chunk], manifests=manifests, source=source,
+            prefilter=[not exempt(key) for key, _, _ in chunk] if exempt else None,
+        )
+
+    def apply_chunk(chunk, translations):
+        nonlocal count
+        for k, (_, _, item) in enumerate(chunk):
+            apply(item, {direction: translations[direction][k] for direction in directions})
+        count += len(chunk)
+
+    if PIPELINE_ENABLED:
+        chunks = iter_chunks(segments, lambda segment: len(segment[1]), PIPELINE_CHUNK_SEGMENTS, PIPELINE_CHUNK_CHARS)
+        run_ordered(chunks, translate_chunk, apply_chunk, PIPELINE_MAX_INFLIGHT, name)
+    else:
+        chunk = list(segments)
+        if chunk:
+            apply_chunk(chunk, translate_chunk(chunk))
+    return count
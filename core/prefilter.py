@@ -0,0 +1,178 @@
+# core/prefilter.py
+# 翻訳前の事前フィルタ
+# コード・ID・URL・メールアドレス・数値・日付・数式などの翻訳不要なセグメントと、
+# すでに翻訳先の言語で書かれているセグメントを判定し、バックエンドに送らずにそのまま出力させる。
+# 判定はコンパイル済みの正規表現と文字種（スクリプト）の比率だけで行い、言語判定ライブラリには依存しない。
+# 文書全体の原文の言語も、文字種から判断できる場合に限り同じ方法で推定する（detect_source_language）。
+
+import re
+from functools import lru_cache
+
+from core.segmenter import strip_tags
+
+UNTRANSLATABLE = "untranslatable"
+ALREADY_TARGET = "already_target"
+
+# 文字（数字・記号・空白以外）
+_LETTER = re.compile(r"[^\W\d_]")
+
+# 全体が 1 つのトークンで、翻訳しても意味のないもの
+_UNTRANSLATABLE_TOKEN = re.compile(
+    r"""
+      (?:https?|ftp)://\S+                                  # URL
+    | www\.\S+
+    | [\w.+-]+@[\w-]+(?:\.[\w-]+)+                          # メールアドレス
+    | =\s*(?:[A-Za-z_][\w.]*\s*\(|\$?[A-Za-z]{1,3}\$?\d).*  # 文字列として保存された数式（=SUM(…), =A1*2）
+    | (?:[A-Za-z]:\\|\\\\|~?/)\S*                           # ファイルパス
+    | [\w-]+\.(?:xlsx?|xlsm|csv|docx?|pptx?|pdf|txt|json|xml|html?|png|jpe?g|gif|zip)  # ファイル名
+    | (?=\S*\d)[A-Za-z0-9]+(?:[-_./:#][A-Za-z0-9]+)*        # 数字を含むコード・ID・型番（ABC-1234, v1.2.3, A1）
+    """,
+    re.VERBOSE | re.IGNORECASE | re.DOTALL,
+)
+
+# 文字種ごとの文字クラス（範囲の広い文字クラスはコンパイルに時間がかかるため、最初の使用時にコンパイルする）
+_SCRIPT_CLASSES = {
+    "latin": r"[A-Za-z\u00c0-\u024f\u1e00-\u1eff]",
+    "kana": r"[\u3040-\u30ff\u31f0-\u31ff\uff66-\uff9f]",
+    "han": r"[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]",
+    "hangul": r"[\uac00-\ud7af\u1100-\u11ff\u3130-\u318f]",
+    "cyrillic": r"[\u0400-\u04ff]",
+    "greek": r"[\u0370-\u03ff]",
+    "arabic": r"[\u0600-\u06ff]",
+    "hebrew": r"[\u0590-\u05ff]",
+    "thai": r"[\u0e00-\u0e7f]",
+    "devanagari": r"[\u0900-\u097f]",
+    # ベトナム語に固有の文字（声調記号付きの母音・đ など）
+    "vietnamese": r"[ăâđêôơưĂÂĐÊÔƠƯ\u1ea0-\u1ef9]",
+}
+
+
+@lru_cache(maxsize=None)
+def _script(name):
+    return re.compile(_SCRIPT_CLASSES[name])
+
+
+@lru_cache(maxsize=None)
+def _scripts(names):
+    """names（文字種名のタプル）のいずれかに当たる文字"""
+    return re.compile("|".join(_SCRIPT_CLASSES[name] for name in names))
+
+# 言語コードごとの文字種（記載のない言語はラテン文字とみなす）
+_LANGUAGE_SCRIPTS = {
+    "ja": ("kana", "han"),
+    "vi": ("latin", "vietnamese"),
+    "zh": ("han",),
+    "ko": ("hangul",),
+    "ru": ("cyrillic",), "uk": ("cyrillic",), "bg": ("cyrillic",), "sr": ("cyrillic",),
+    "el": ("greek",),
+    "ar": ("arabic",), "fa": ("arabic",), "ur": ("arabic",),
+    "he": ("hebrew",), "iw": ("hebrew",),
+    "th": ("thai",),
+    "hi": ("devanagari",), "mr": ("devanagari",), "ne": ("devanagari",),
+}
+
+
+# 他の言語と共有しているため、それだけではその言語だと判断できない文字種
+# （漢字だけの文は中国語かもしれない。ラテン文字は多くの言語で共通）
+_SHARED_SCRIPTS = {
+    "ja": ("han",),
+}
+
+
+def _base_language(lang):
+    return (lang or "").lower().replace("_", "-").split("-")[0]
+
+
+def language_scripts(lang):
+    """言語コード（"ja", "zh-CN" など）で使われる文字種のタプル"""
+    return _LANGUAGE_SCRIPTS.get(_base_language(lang), ("latin",))
+
+
+def distinctive_scripts(lang):
+    """その文字種の文字を含めば lang の言語で書かれていると言える文字種の集合（ラテン文字は含めない）"""
+    shared = set(_SHARED_SCRIPTS.get(_base_language(lang), ())) | {"latin"}
+    return set(language_scripts(lang)) - shared
+
+
+def is_untranslatable(text):
+    """文字を含まない（数値・日付・記号のみ）か、全体がコード・URL・数式などのトークンなら True"""
+    if not _LETTER.search(text):
+        return True
+    return _UNTRANSLATABLE_TOKEN.fullmatch(text) is not None
+
+
+def is_in_language(text, src, dest, ratio):
+    """
+    text がすでに dest の言語で書かれているかを文字種の比率で判定する。
+
+    文字のうち ratio 以上が dest の文字種で、かつ dest に固有で src の言語では使わない文字種
+    （distinctive_scripts）の文字を含む場合に True。
+    ラテン文字だけでは言語を判断できない（英語とベトナム語・フランス語など）ため、
+    dest がラテン文字だけの言語の場合や src と dest が同じ文字種の場合（en->fr、ja->zh など）は常に False。
+    """
+    distinctive = distinctive_scripts(dest)
+    if src != "auto":
+        distinctive -= set(language_scripts(src))
+    if not distinctive:
+        return False
+
+    letters = len(_LETTER.findall(text))
+    if not letters:
+        return False
+    if not _scripts(tuple(sorted(distinctive))).search(text):
+        return False
+    return len(_scripts(language_scripts(dest)).findall(text)) >= ratio * letters
+
+
+def classify_segment(text, src, dest, ratio=0.9):
+    """
+    翻訳不要なセグメントを判定する。
+
+    Returns:
+        UNTRANSLATABLE（コード・数値など）/ ALREADY_TARGET（翻訳先の言語で書かれている）/
+        None（翻訳に送る）
+    インラインタグ（<g1>…</g1>）は取り除いてから判定する。
+    """
+    core = strip_tags(text).strip()
+    if not core:
+        return None
+    if is_untranslatable(core):
+        return UNTRANSLATABLE
+    if is_in_language(core, src, dest, ratio):
+        return ALREADY_TARGET
+    return None
+
+
+def detect_source_language(texts, sample_chars=20000):
+    """
+    文書の原文の言語を文字種から推定する（先頭から sample_chars 文字分を使う）。
+    かなを含む → "ja"、ハングル → "ko"、ベトナム語固有の文字を含むラテン文字 → "vi"。
+    英語と他のラテン文字の言語、中国語と漢字だけの日本語などは区別できないため None を返す。
+    """
+    sample = []
+    size = 0
+    for text in texts:
+        if not text:
+            continue
+        text = strip_tags(str(text))
+        sample.append(text)
+        size += len(text)
+        if size >= sample_chars:
+            break
+    sample = "".join(sample)
+
+    letters = len(_LETTER.findall(sample))
+    if not letters:
+        return None
+    counts = {script: len(_script(script).findall(sample)) for script in _SCRIPT_CLASSES if script != "vietnamese"}
+    dominant = max(counts, key=counts.get)
+    if counts[dominant] < 0.5 * letters:
+        return None
+    if dominant in ("kana", "han"):
+        # 漢字だけの文は中国語と区別できないため、かなが一定以上含まれる場合だけ日本語とする
+        return "ja" if counts["kana"] >= 0.05 * letters else None
+    if dominant == "hangul":
+        return "ko"
+    if dominant == "latin" and len(_script("vietnamese").findall(sample)) >= 0.05 * counts["latin"]:
+        return "vi"
+    return None
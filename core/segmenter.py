@@ -0,0 +1,135 @@
+# core/segmenter.py
+# 書式（run）を考慮したセグメント化
+# 段落内の run を書式ごとのグループにまとめ、<g1>…</g1> のような軽量なインラインタグで囲んだ
+# 1 つの文字列として翻訳に送る。翻訳結果のタグを解析して、各グループの書式で run を組み立て直す。
+# タグが壊れていた場合は None を返し、呼び出し側は従来どおり先頭 run に全文を入れる方式に戻す。
+
+import copy
+import re
+
+_TAG = re.compile(r"<\s*(/?)\s*g\s*(\d+)\s*>", re.IGNORECASE)
+
+
+def strip_tags(text):
+    """翻訳結果からインラインタグを取り除く（タグを解釈できなかった場合のフォールバック用）"""
+    return _TAG.sub("", text or "")
+
+
+class RunLayout:
+    """
+    1 段落分のセグメント化情報。
+
+    runs: 段落内の run 要素（元の順序）
+    templates: {グループ ID: そのグループの先頭 run 要素}（書き戻し時に書式の複製元として使う）
+    """
+
+    def __init__(self, runs, templates):
+        self.runs = runs
+        self.templates = templates
+
+    @property
+    def ids(self):
+        return set(self.templates)
+
+
+def segment_runs(runs, key_fn, text_fn, first_id=1):
+    """
+    run 要素のリストを書式キーごとの連続グループにまとめ、タグ付きテキストを作る。
+
+    key_fn(run): 書式を表す比較可能な値（例: rPr のシリアライズ結果）
+    text_fn(run): run のテキスト
+    first_id: このグループに割り当てる最初の ID（1 つのセグメント内で段落をまたいで一意にするため）
+
+    Returns:
+        (text, layout) — 空白以外を含むグループが 2 つ未満ならタグは不要なので layout は None で、
+        text は run のテキストを連結しただけのものになる。
+    """
+    groups = []
+    for run in runs:
+        key = key_fn(run)
+        if groups and groups[-1][0] == key:
+            groups[-1][1].append(run)
+        else:
+            groups.append((key, [run]))
+
+    group_texts = ["".join(text_fn(r) for r in members) for _, members in groups]
+    if sum(1 for t in group_texts if t.strip()) < 2:
+        return "".join(group_texts), None
+
+    parts = []
+    templates = {}
+    for offset, ((_, members), text) in enumerate(zip(groups, group_texts)):
+        gid = first_id + offset
+        templates[gid] = members[0]
+        parts.append(f"<g{gid}>{text}</g{gid}>")
+    return "".join(parts), RunLayout(list(runs), templates)
+
+
+def parse_tagged(text, ids):
+    """
+    翻訳済みのタグ付きテキストを [(グループ ID, テキスト), ...] に分解する。
+    タグの外側にあるテキストは直前のグループ（先頭なら直後のグループ）に含める。
+    未知の ID・入れ子・閉じ忘れなどがあれば None を返す。
+    """
+    spans = []
+    pos = 0
+    open_id = None
+    for m in _TAG.finditer(text):
+        chunk = text[pos:m.start()]
+        closing, gid = m.group(1) == "/", int(m.group(2))
+        if gid not in ids:
+            return None
+        if closing:
+            if open_id != gid:
+                return None
+            spans.append((gid, chunk))
+            open_id = None
+        else:
+            if open_id is not None:
+                return None
+            if chunk:
+                spans.append((None, chunk))
+            open_id = gid
+        pos = m.end()
+    if open_id is not None:
+        return None
+    if pos < len(text):
+        spans.append((None, text[pos:]))
+
+    tagged = [gid for gid, _ in spans if gid is not None]
+    if not tagged:
+        return None
+
+    # タグ外のテキストを隣接するグループに寄せ、同じグループが続く場合は結合する
+    resolved = []
+    current = tagged[0]
+    for gid, chunk in spans:
+        if gid is not None:
+            current = gid
+        if resolved and resolved[-1][0] == current:
+            resolved[-1] = (current, resolved[-1][1] + chunk)
+        else:
+            resolved.append((current, chunk))
+    resolved = [(gid, chunk) for gid, chunk in resolved if chunk]
+    return resolved or None
+
+
+def rebuild_runs(layout, spans, set_run_text):
+    """
+    元の run を取り除き、spans の順序どおりに各グループの書式を複製した run を挿入する。
+    翻訳で語順が入れ替わった場合も、書式は対応するテキストに付いたまま並び替えられる。
+
+    set_run_text(run, text): 複製した run にテキストを設定する書式固有の関数
+    """
+    first = layout.runs[0]
+    parent = first.getparent()
+    new_runs = []
+    for gid, chunk in spans:
+        run = copy.deepcopy(layout.templates[gid])
+        set_run_text(run, chunk)
+        new_runs.append(run)
+
+    for run in new_runs:
+        first.addprevious(run)
+    for run in layout.runs:
+        parent.remove(run)
@@ -0,0 +1,211 @@
+# core/translate.py
+# コマンドラインからの一括翻訳
+# ディレクトリ・glob パターン・ファイルを受け取り、ファイル単位でプロセスプールに分散して翻訳する。
+# openpyxl / python-pptx / python-docx の解析は CPU 処理で GIL に縛られるため、スレッドではなくプロセスを使う。
+#
+# 使い方:
+#   python -m core.translate docs/ -d "en->ja"
+#   python -m core.translate "reports/**/*.xlsx" -d "ja->en" -o out/ -j 4
+
+import argparse
+import glob
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# translate_file が対応している拡張子
+SUPPORTED_EXTS = ('.pptx', '.xlsx', '.xlsm', '.xltx', '.xltm', '.docx', '.txt', '.csv')
+
+# 結果の状態
+OK = "ok"
+SKIPPED = "skipped"
+FAILED = "failed"
+
+# ワーカープロセスごとの Translator（プロセス初期化時に 1 回だけ作成する）
+_worker_translator = None
+
+
+def _glob_root(pattern):
+    """glob パターンのうちワイルドカードを含まない先頭のディレクトリ（例: "reports/**/*.xlsx" → "reports"）"""
+    parts = []
+    for part in os.path.normpath(pattern).split(os.sep):
+        if glob.has_magic(part):
+            break
+        parts.append(part)
+    else:
+        parts = parts[:-1]   # ワイルドカードを含まないパスはファイル名を除く
+    return os.sep.join(parts) or (os.sep if pattern.startswith(os.sep) else os.curdir)
+
+
+def collect_inputs(patterns, recursive=False):
+    """
+    ファイル・ディレクトリ・glob パターンから翻訳対象ファイルの一覧を作る。
+    Office の一時ファイル（~$ で始まるもの）と未対応の拡張子は除外する。
+    戻り値は (入力ファイル, 入力ルート) のリスト。入力ルートは指定したディレクトリ、glob パターンの
+    ワイルドカードより前のディレクトリ、またはファイルのあるディレクトリで、出力先の相対パスの基準になる。
+    """
+    found = {}
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            root = pattern
+            if recursive:
+                candidates = [
+                    os.path.join(dirpath, name)
+                    for dirpath, _, names in os.walk(pattern)
+                    for name in names
+                ]
+            else:
+                candidates = [os.path.join(pattern, name) for name in os.listdir(pattern)]
+        elif os.path.isfile(pattern):
+            root = os.path.dirname(pattern) or os.curdir
+            candidates = [pattern]
+        else:
+            root = _glob_root(pattern)
+            candidates = glob.glob(pattern, recursive=True)
+
+        for path in sorted(candidates):
+            name = os.path.basename(path)
+            if not os.path.isfile(path) or name.startswith("~$"):
+                continue
+            if os.path.splitext(name)[1].lower() in SUPPORTED_EXTS:
+                # 重複を除きつつ指定順を保つ（最初に一致したパターンのルートを使う）
+                found.setdefault(os.path.abspath(path), os.path.abspath(root))
+
+    return list(found.items())
+
+
+def output_path_for(input_path, output_dir, input_root=None):
+    """
+    CLI の出力ファイル名（タイムスタンプなし。再実行時に翻訳済みかどうかを判定できる）。
+    input_root を指定すると、入力ルートからの相対ディレクトリを output_dir の下に再現する
+    （別のディレクトリにある同名のファイルが同じ出力に上書きされないようにするため）。
+    """
+    name, ext = os.path.splitext(os.path.basename(input_path))
+    subdir = os.path.relpath(os.path.dirname(input_path), input_root) if input_root else os.curdir
+    if subdir.startswith(os.pardir):
+        subdir = os.curdir
+    return os.path.normpath(os.path.join(output_dir, subdir, f"{name}_translated{ext}"))
+
+
+def is_done(input_path, output_path):
+    """出力ファイルが存在し、入力ファイルより新しければ翻訳済みとみなす"""
+    return (
+        os.path.exists(output_path)
+        and os.path.getmtime(output_path) >= os.path.getmtime(input_path)
+    )
+
+
+def _init_worker(backend, jobs):
+    """ワーカープロセスの初期化: Translator を作成し、送信レートをプロセス数で分け合う"""
+    global _worker_translator
+    from core.translate_text_google import Translator
+    from core.executor import TokenBucket
+    from config.settings import TRANSLATION_RATE_LIMIT, TRANSLATION_RATE_BURST
+
+    _worker_translator = Translator(backend=backend)
+    if _worker_translator.executor.limiter is not None and TRANSLATION_RATE_LIMIT > 0:
+        _worker_translator.executor.limiter = TokenBucket(
+            TRANSLATION_RATE_LIMIT / jobs, max(1, TRANSLATION_RATE_BURST // jobs),
+        )
+
+
+def _translate_one(input_path, output_path, direction, incremental=None):
+    """
+    1 ファイルを翻訳して output_path に配置する（ワーカープロセスで実行）。
+    翻訳中のファイルは呼び出しごとの一時フォルダに作成するため、並行するワーカーの出力は衝突しない。
+    """
+    from core.files import output_workspace
+
+    started = time.time()
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    work_dir = tempfile.mkdtemp(prefix=".translating-", dir=os.path.dirname(output_path))
+    try:
+        with output_workspace(work_dir):
+            produced = _worker_translator.translate_file(input_path, direction=direction, incremental=incremental)
+        shutil.move(produced, output_path)
+        return input_path, OK, output_path, None, time.time() - started
+    except Exception as e:
+        return input_path, FAILED, None, f"{type(e).__name__}: {e}", time.time() - started
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _print_summary(results):
+    """ファイルごとの結果一覧と件数を出力する"""
+    print("\n=== 結果 ===")
+    for input_path, status, output_path, error, elapsed in results:
+        if status == OK:
+            print(f"  [OK]     {input_path} -> {output_path} ({elapsed:.1f}s)")
+        elif status == SKIPPED:
+            print(f"  [SKIP]   {input_path}（翻訳済み: {output_path}）")
+        else:
+            print(f"  [FAILED] {input_path}: {error}")
+    counts = {s: sum(1 for r in results if r[1] == s) for s in (OK, SKIPPED, FAILED)}
+    print(f"成功 {counts[OK]} 件 / スキップ {counts[SKIPPED]} 件 / 失敗 {counts[FAILED]} 件")
+
+
+def build_parser():
+    from config.settings import OUTPUT_DIR
+    parser = argparse.ArgumentParser(
+        prog="python -m core.translate",
+        description="ディレクトリまたは glob パターンに一致する文書を一括翻訳します。",
+    )
+    parser.add_argument("inputs", nargs="+", help="ファイル・ディレクトリ・glob パターン（例: \"docs/**/*.pptx\"）")
+    parser.add_argument("-d", "--direction", default="en->ja", help="翻訳方向（例: en->ja）。既定: en->ja")
+    parser.add_argument("-o", "--output-dir", default=OUTPUT_DIR, help=f"出力先ディレクトリ。既定: {OUTPUT_DIR}")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="同時に処理するファイル数（プロセス数）。既定: CPU 数")
+    parser.add_argument("-r", "--recursive", action="store_true", help="ディレクトリをサブディレクトリまで探索する")
+    parser.add_argument("-f", "--force", action="store_true", help="翻訳済みのファイルも再翻訳する")
+    parser.add_argument("-i", "--incremental", action="store_true", default=None,
+                        help="差分翻訳: 前回から変更されたセグメントだけを翻訳する（既定: 設定値）")
+    parser.add_argument("--backend", default=None, help="翻訳バックエンド（google / local / stub）。既定: 設定値")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    inputs = collect_inputs(args.inputs, recursive=args.recursive)
+    if not inputs:
+        print("翻訳対象のファイルが見つかりませんでした。", file=sys.stderr)
+        return 2
+
+    output_dir = os.path.abspath(args.output_dir)
+    results = []
+    pending = []
+    for path, root in inputs:
+        out = output_path_for(path, output_dir, root)
+        if not args.force and is_done(path, out):
+            results.append((path, SKIPPED, out, None, 0.0))
+        else:
+            pending.append((path, out))
+
+    total = len(inputs)
+    done = len(results)
+    if done:
+        print(f"[{done}/{total}] 翻訳済みの {done} 件をスキップします")
+
+    if pending:
+        jobs = max(1, min(args.jobs, len(pending)))
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(args.backend, jobs)) as pool:
+            futures = [pool.submit(_translate_one, path, out, args.direction, args.incremental) for path, out in pending]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                done += 1
+                mark = "✅" if result[1] == OK else "❌"
+                print(f"[{done}/{total}] {mark} {os.path.basename(result[0])} ({result[4]:.1f}s)")
+
+    # 入力順に並べ直して一覧を出す
+    order = {path: k for k, (path, _) in enumerate(inputs)}
+    results.sort(key=lambda r: order[r[0]])
+    _print_summary(results)
+    return 1 if any(r[1] == FAILED for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,41 @@
 # core/translate_text_google.py
 # 高レベルの翻訳ユーティリティ: 各種ファイル形式を自動判別して翻訳を行うモジュール
 
+import contextvars
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-# deep_translator を使用するためのインポート
-from deep_translator import GoogleTranslator 
 # ExcelTranslator は translate_file 内で遅延インポートされる
-from config.settings import OUTPUT_DIR
+from config.settings import (
+    OUTPUT_DIR, BATCH_MAX_CHARS, BATCH_MAX_SEGMENTS,
+    TRANSLATION_MEMORY_ENABLED, TRANSLATION_MEMORY_PATH, TRANSLATION_MEMORY_MAX_ENTRIES,
+    TRANSLATION_MEMORY_MAX_AGE_DAYS, TRANSLATION_MEMORY_LRU_SIZE,
+    TRANSLATION_MAX_WORKERS, TRANSLATION_RATE_LIMIT, TRANSLATION_RATE_BURST,
+    TRANSLATION_RETRIES, TRANSLATION_RETRY_BASE_DELAY, TRANSLATION_RETRY_MAX_DELAY,
+    TRANSLATION_STRICT, INCREMENTAL_TRANSLATION, MANIFEST_DIR,
+    PREFILTER_ENABLED, PREFILTER_TARGET_SCRIPT_RATIO,
+)
+from core.batching import (
+    pack_segments, join_segments, split_segments, segment_budget, split_long_segment, BatchSplitError,
+)
+from core.translation_memory import TranslationMemory
+from core.dedup import dedupe_segments
+from core.prefilter import classify_segment, detect_source_language
+from core.executor import TranslationExecutor, TranslationError, get_rate_limiter
+from core.backends import get_backend
+from core.manifest import SegmentManifest, manifest_path_for
+from core.files import current_output_dir, output_label, output_suffix, archive_outputs
+from core import metrics
+
+
+def _split_outer_whitespace(text):
+    """前後の空白と本文を分離する（翻訳で失われる空白を復元するため）"""
+    core = text.strip()
+    if not core:
+        return text, "", ""
+    start = text.index(core)
+    return text[:start], core, text[start + len(core):]
 
 
 class Translator:
@@ -15,10 +44,47 @@ class Translator:
     ファイルの種類に応じて適切なモジュールを呼び出し、翻訳処理を行う。
     """
 
-    def __init__(self):
-        """出力ディレクトリが存在しない場合は作成"""
+    def __init__(self, backend=None, memory=None, max_workers=None, strict=None):
+        """
+        出力ディレクトリが存在しない場合は作成
+        backend: バックエンドの登録名（"google" / "local" / "stub"）、TranslationBackend のインスタンス、
+                 または (text, src, dest) -> 翻訳文 を返す関数。省略時は設定の TRANSLATION_BACKEND。
+        memory: TranslationMemory インスタンス。省略時は設定に従って既定のファイルを開き、
+                False を渡すと翻訳メモリを使用しない。
+        max_workers: 同時に送信するリクエスト数（省略時は TRANSLATION_MAX_WORKERS）
+        strict: True の場合、翻訳に失敗したセグメントがあれば TranslationError を送出する
+        """
         if not os.path.exists(OUTPUT_DIR):
             os.makedirs(OUTPUT_DIR, exist_ok=True)
+        self.backend = get_backend(backend)
+
+        if memory is None and TRANSLATION_MEMORY_ENABLED:
+            memory = TranslationMemory(
+                TRANSLATION_MEMORY_PATH,
+                max_entries=TRANSLATION_MEMORY_MAX_ENTRIES,
+                max_age_days=TRANSLATION_MEMORY_MAX_AGE_DAYS,
+                lru_size=TRANSLATION_MEMORY_LRU_SIZE,
+            )
+        self.memory = memory or None
+
+        # 並列実行エンジン（レートリミッタはバックエンドごとに共有。ローカル推論などは制限しない）
+        limiter = None
+        if self.backend.rate_limited:
+            limiter = get_rate_limiter(self.backend.name, TRANSLATION_RATE_LIMIT, TRANSLATION_RATE_BURST)
+        self.executor = TranslationExecutor(
+            max_workers=max_workers or TRANSLATION_MAX_WORKERS,
+            limiter=limiter,
+            retries=TRANSLATION_RETRIES,
+            base_delay=TRANSLATION_RETRY_BASE_DELAY,
+            max_delay=TRANSLATION_RETRY_MAX_DELAY,
+            name=self.backend.name,
+        )
+        self.strict = TRANSLATION_STRICT if strict is None else strict
+
+        # translate_batch の累積統計（segments / unique / dedup_saved / memory_hits / manifest_reused /
+        # untranslatable / already_target / oversized / failed）
+        self.stats = {}
+        self._stats_lock = threading.Lock()
 
     def _parse_direction(self, direction: str):
         """'en->ja' のような翻訳方向文字列をソース言語とターゲット言語に分解する"""
@@ -31,8 +97,8 @@ class Translator:
 
     def translate_text(self, text: str, direction: str = 'en->ja'):
         """
-        単一のテキスト文字列を deep_translator の GoogleTranslator を使用して翻訳する。
-        このメソッドは PPTX や Excel 内のテキスト処理に利用される。
+        単一のテキスト文字列を翻訳する（translate_batch の 1 件版）。
+        複数のテキストを翻訳する場合は translate_batch を使用すること。
         """
         if text is None:
             return text
@@ -40,60 +106,354 @@ class Translator:
         if not text.strip():
             return text
 
+        return self.translate_batch([text], direction=direction)[0]
+
+    def translate_batch(self, texts, direction: str = 'en->ja', strict=None, keys=None, manifest=None,
+                        prefilter=None):
+        """
+        複数のテキストをまとめて翻訳し、入力と同じ順序・同じ長さのリストで返す。
+        正規化後に同一のセグメントは 1 回だけ翻訳し、結果をすべての出現位置に展開する。
+        翻訳メモリにあるテキストはバックエンドに送らず、メモリの結果を使う。
+        残りのセグメントは BATCH_MAX_CHARS / BATCH_MAX_SEGMENTS の範囲でリクエストにまとめられるため、
+        リクエスト数はセグメント数ではなく文字数に比例する。上限を超える長いセグメントは文の境界で分割して
+        送信し、翻訳後に元の区切り（空白・改行）で結合し直す。
+        空文字・空白のみ・None の要素は翻訳せずにそのまま返す。PREFILTER_ENABLED の場合は、コード・数値・URL などの
+        翻訳不要なセグメントと、すでに翻訳先の言語で書かれたセグメントもそのまま返す。
+
+        再試行しても翻訳できなかったセグメントは原文のまま返し、警告を出力して stats['failed'] に加算する。
+        strict=True（省略時は Translator.strict）の場合は TranslationError を送出する。
+        例外の results 属性に、失敗箇所を原文のままにした結果が入っている。
+
+        keys（各テキストの位置キー）と manifest（SegmentManifest）を渡すと、前回と同じ位置・同じ原文の
+        セグメントは前回の翻訳を再利用し、新規・変更されたセグメントだけを翻訳する。結果は manifest に記録される。
+
+        prefilter: 各テキストに事前フィルタを適用するかどうかのリスト（省略時はすべて適用）。
+        False の要素は、コードや翻訳先の言語に見えても常に翻訳に送る（Excel のシート名など）。
+        """
+        texts = list(texts)
+        results = list(texts)
         src, dest = self._parse_direction(direction)
+
+        # 差分翻訳: 前回から変わっていない位置はマニフェストの翻訳を使う
+        reused = [None] * len(results)
+        if manifest is not None and keys is not None:
+            reused = [
+                manifest.lookup(key, str(text)) if text is not None else None
+                for key, text in zip(keys, results)
+            ]
+            reused_count = sum(1 for tr in reused if tr is not None)
+            if reused_count:
+                self._record_stats(manifest_reused=reused_count)
+                print(f"[差分翻訳] {len(results)} 件中 {reused_count} 件は前回の翻訳を再利用します")
+
+        # 翻訳対象（空白以外を含む文字列）だけを抽出し、前後の空白は後で復元する
+        positions = []
+        pieces = []
+        skipped = {}
+        for i, text in enumerate(results):
+            if text is None:
+                continue
+            text = str(text)
+            results[i] = text
+            if reused[i] is not None:
+                continue
+            lead, core, trail = _split_outer_whitespace(text)
+            if not core:
+                continue
+            if PREFILTER_ENABLED and (prefilter is None or prefilter[i]):
+                kind = classify_segment(core, src, dest, PREFILTER_TARGET_SCRIPT_RATIO)
+                if kind is not None:
+                    skipped[kind] = skipped.get(kind, 0) + 1
+                    continue
+            positions.append(i)
+            pieces.append((lead, core, trail))
+
+        # 翻訳不要と判定したセグメントは原文のまま出力する
+        if skipped:
+            self._record_stats(**skipped)
+            details = " / ".join(f"{kind}: {count}" for kind, count in skipped.items())
+            print(f"[事前フィルタ] {sum(skipped.values())} 件は翻訳不要のため送信しません（{details}）")
+
+        # 正規化後に同一のセグメントは 1 回だけ翻訳し、結果を全出現位置に展開する
+        dedup = dedupe_segments([core for _, core, _ in pieces])
+        self._record_stats(segments=dedup.total, unique=len(dedup.unique), dedup_saved=dedup.saved)
+        if dedup.saved:
+            print(f"[重複排除] {dedup.total} 件中 {dedup.saved} 件の翻訳を削減しました")
+
+        unique_translations, failures = self._translate_unique(dedup.unique, src, dest)
+        translations = dedup.expand(unique_translations)
+        for k, tr in enumerate(translations):
+            lead, _, trail = pieces[k]
+            results[positions[k]] = f"{lead}{tr}{trail}"
+
+        if manifest is not None and keys is not None:
+            # 翻訳に失敗した位置は記録しない（次回あらためて翻訳する）
+            failed_texts = {text for text, _ in failures}
+            for k, i in enumerate(positions):
+                if dedup.unique[dedup.index_map[k]] not in failed_texts:
+                    manifest.record(keys[i], str(texts[i]), results[i])
+            for i, tr in enumerate(reused):
+                if tr is not None:
+                    results[i] = tr
+                    manifest.record(keys[i], str(texts[i]), tr)
+
+        if failures:
+            self._record_stats(failed=len(failures))
+            error = TranslationError(failures, results)
+            if self.strict if strict is None else strict:
+                raise error
+            print(f"[警告] {error}。該当セグメントは原文のまま出力します。")
+
+        return results
+
+    def translate_batch_targets(self, texts, directions, strict=None, keys=None, manifests=None, source=None,
+                                prefilter=None):
+        """
+        同じテキストを複数の翻訳方向へ並行して翻訳し、{direction: 結果のリスト} を返す。
+        manifests: {direction: SegmentManifest}（差分翻訳。翻訳方向ごとに別のマニフェストを使う）
+        source: 原文の言語が auto の方向に使う言語（resolve_source の結果）。
+                文書をチャンクに分けて翻訳する場合は、文書全体で 1 回だけ推定した値を渡すこと。
+
+        source を省略した場合は texts から resolve_source で推定する。原文と同じ言語への方向は翻訳せずに原文を返す。
+        prefilter は translate_batch と同じ（事前フィルタを適用するかどうかのリスト）。
+        """
+        texts = list(texts)
+        manifests = manifests or {}
+        if source is None:
+            source = self.resolve_source(texts, directions)
+
+        def run(direction):
+            src, dest = self._parse_direction(direction)
+            if src == 'auto':
+                src = source
+            if src == dest:
+                return list(texts)
+            return self.translate_batch(
+                texts, f"{src}->{dest}", strict=strict, keys=keys, manifest=manifests.get(direction),
+                prefilter=prefilter,
+            )
+
+        if len(directions) == 1:
+            return {directions[0]: run(directions[0])}
+        # 各方向のリクエストは同じ executor（レートリミッタ）を共有する
+        with ThreadPoolExecutor(max_workers=len(directions), thread_name_prefix="target") as pool:
+            futures = {d: pool.submit(contextvars.copy_context().run, run, d) for d in directions}
+            return {d: future.result() for d, future in futures.items()}
+
+    def resolve_source(self, texts, directions):
+        """
+        複数の方向で原文の言語が auto の場合は、文字種から原文の言語を推定してすべての方向で共有する。
+        推定しない・推定できない場合は 'auto' を返す。texts は推定に必要な先頭部分だけを読む（イテレータでもよい）。
+        """
+        if len(directions) > 1 and any(self._parse_direction(d)[0] == 'auto' for d in directions):
+            return detect_source_language(texts) or 'auto'
+        return 'auto'
+
+    def output_label_for(self, direction, directions):
+        """複数の言語に翻訳する場合は、出力ファイル名に翻訳先の言語コードを付ける（with で使う）"""
+        return output_label(self._parse_direction(direction)[1] if len(directions) > 1 else None)
+
+    def _translate_unique(self, texts, src, dest):
+        """
+        重複のないセグメントを翻訳メモリ → バックエンドの順で翻訳する。
+        バックエンドへのリクエストは実行エンジンで並列に送信され、結果は入力順に戻る。
+        戻り値: (翻訳結果のリスト, [(失敗したテキスト, 例外), ...])
+        """
+        translations = [None] * len(texts)
+
+        # 翻訳メモリを先に確認し、見つからなかったものだけをバックエンドに送る
+        if self.memory is not None and texts:
+            found = self.memory.lookup_many(texts, src, dest, backend=self.backend.name)
+            translations = [found.get(text) for text in texts]
+            self._record_stats(memory_hits=len(found))
+        missing = [k for k, tr in enumerate(translations) if tr is None]
+
+        # 上限を超える長いセグメントは文の境界でピースに分割し、ピース単位でリクエストに詰める
+        max_chars = self.backend.max_chars or BATCH_MAX_CHARS
+        max_segments = self.backend.max_segments or BATCH_MAX_SEGMENTS
+        budget = segment_budget(max_chars, max_segments)
+        pieces = []
+        owners = []   # ピースごとの (missing 内の位置, 翻訳後に付け直す区切り文字列)
+        oversized = 0
+        for j, k in enumerate(missing):
+            split = split_long_segment(texts[k], budget)
+            oversized += len(split) > 1
+            for body, sep in split:
+                pieces.append(body)
+                owners.append((j, sep))
+        if oversized:
+            self._record_stats(oversized=oversized)
+            print(f"[分割] {oversized} 件の長いセグメントを文の境界で分割して翻訳します")
+
+        chunks = pack_segments(pieces, max_chars, max_segments)
+        chunk_results = self.executor.map(
+            lambda chunk: self._translate_chunk([pieces[p] for p in chunk], src, dest),
+            chunks,
+        )
+
+        # ピースの翻訳を元のセグメントごとに結合する（1 つでも失敗したピースがあればセグメント全体を失敗とする）
+        parts = [[] for _ in missing]
+        errors = [None] * len(missing)
+        for chunk, translated in zip(chunks, chunk_results):
+            for p, tr in zip(chunk, translated):
+                j, sep = owners[p]
+                if isinstance(tr, Exception):
+                    errors[j] = errors[j] or tr
+                else:
+                    parts[j].append(tr + sep)
+
+        fresh = []
+        failures = []
+        for j, k in enumerate(missing):
+            if errors[j] is not None:
+                # 再試行しても翻訳できなかったセグメントは原文のまま（メモリには保存しない）
+                translations[k] = texts[k]
+                failures.append((texts[k], errors[j]))
+            else:
+                translations[k] = "".join(parts[j])
+                fresh.append((texts[k], translations[k]))
+
+        if self.memory is not None and fresh:
+            self.memory.store_many(fresh, src, dest, backend=self.backend.name)
+        return translations, failures
+
+    def _record_stats(self, **counts):
+        """累積統計（セグメント数・重複排除による削減数など）を加算し、メトリクスにも記録する"""
+        with self._stats_lock:
+            for key, value in counts.items():
+                self.stats[key] = self.stats.get(key, 0) + value
+        metrics.record_segments(**counts)
+
+    def _translate_chunk(self, texts, src, dest):
+        """
+        1 リクエスト分のセグメントを翻訳する。分割に失敗した場合は 1 件ずつ翻訳し直す。
+        バッチ対応のバックエンドにはリストのまま渡し、それ以外はマーカー行で連結して送る。
+        翻訳できなかったセグメントは、その原因となった例外オブジェクトとして返す。
+        """
+        metrics.record_characters(self.backend.name, sum(len(text) for text in texts))
+        if self.backend.supports_batch:
+            try:
+                translated = self.executor.call(self.backend.translate_batch, texts, src, dest)
+            except Exception as exc:
+                return [exc] * len(texts)
+            if len(translated) != len(texts):
+                return [TranslationError([(text, None)]) for text in texts]
+            return [tr if tr is not None else TranslationError([(text, None)]) for text, tr in zip(texts, translated)]
+
+        if len(texts) == 1:
+            return [self._call_backend(texts[0], src, dest)]
+
+        joined = join_segments(texts)
         try:
-            translator = GoogleTranslator(source=src, target=dest)
-            return translator.translate(text)
-        except Exception:
-            # エラーが発生した場合は元のテキストをそのまま返す
-            return text 
+            translated = self.executor.call(self.backend.translate, joined, src, dest)
+            return split_segments(translated, len(texts))
+        except BatchSplitError:
+            # マーカーが崩れた場合は個別リクエストにフォールバック
+            return [self._call_backend(t, src, dest) for t in texts]
+        except Exception as exc:
+            return [exc] * len(texts)
+
+    def _call_backend(self, text, src, dest):
+        """単一テキストをバックエンドで翻訳する（再試行後も失敗した場合は例外オブジェクトを返す）"""
+        try:
+            translated = self.executor.call(self.backend.translate, text, src, dest)
+        except Exception as exc:
+            return exc
+        if translated is None:
+            return TranslationError([(text, None)])
+        return translated
+
+    def open_manifest(self, input_path, direction):
+        """入力ファイルの差分翻訳用マニフェストを開く（翻訳方向・バックエンドが変わると前回分は使われない）"""
+        return SegmentManifest(
+            manifest_path_for(input_path, direction, MANIFEST_DIR),
+            context={"direction": direction, "backend": self.backend.name},
+        )
 
     def _make_output_path(self, input_path):
-        """翻訳済みファイルの出力パスを生成"""
+        """翻訳済みファイルの出力パスを生成（ジョブの output_workspace 内ではジョブの出力フォルダ）"""
         base = os.path.basename(input_path)
         name, ext = os.path.splitext(base)
         ts = datetime.now().strftime('%Y%m%d_%H%M%S')
-        outname = f"{name}_translated_{ts}{ext}"
-        return os.path.join(OUTPUT_DIR, outname)
+        outname = f"{name}_translated{output_suffix()}_{ts}{ext}"
+        return os.path.join(current_output_dir(OUTPUT_DIR), outname)
 
-    def translate_file(self, input_path: str, direction: str = 'en->ja'):
+    def translate_file(self, input_path: str, direction: str = 'en->ja', incremental=None,
+                       targets=None, archive=False):
         """
         入力ファイルの拡張子をもとに、適切な翻訳モジュールを呼び出して処理を実行する。
         現在対応している形式: PPTX / XLSX / TXT / CSV / DOCX
+
+        incremental: True の場合は差分翻訳（省略時は INCREMENTAL_TRANSLATION）。
+        同じファイル名の前回のマニフェストと比較し、変更されたセグメントだけを翻訳する。
+
+        targets: 翻訳先の言語コードのリスト（例: ["ja", "vi"]）。指定した場合、原文の言語は direction の
+        翻訳元を使い、文書の読み取り・セグメント化は 1 回だけ行って各言語の翻訳を並行して取得し、
+        言語ごとに出力ファイル（<name>_translated_<lang>_<timestamp>）を作成する。
+        戻り値は {言語コード: 出力パス}。archive=True の場合は出力をまとめた zip のパスを返す。
+        """
+        incremental = INCREMENTAL_TRANSLATION if incremental is None else incremental
+        if targets is None:
+            manifest = self.open_manifest(input_path, direction) if incremental else None
+            out = self._translate_file(input_path, direction, manifest)
+            if manifest is not None:
+                manifest.save()
+            return out
+
+        src = self._parse_direction(direction)[0]
+        directions = [f"{src}->{target}" for target in dict.fromkeys(targets) if target != src]
+        if not directions:
+            raise ValueError('翻訳先の言語が指定されていません')
+        manifests = {d: self.open_manifest(input_path, d) for d in directions} if incremental else None
+
+        outputs = self._translate_file_targets(input_path, directions, manifests)
+        for manifest in (manifests or {}).values():
+            manifest.save()
+
+        outputs = {self._parse_direction(d)[1]: path for d, path in outputs.items()}
+        if archive:
+            zip_path = os.path.splitext(self._make_output_path(input_path))[0] + ".zip"
+            return archive_outputs(outputs.values(), zip_path)
+        return outputs
+
+    def _translate_file(self, input_path, direction, manifest):
+        """1 つの翻訳方向で翻訳し、出力パスを返す"""
+        return self._translate_file_targets(input_path, [direction], {direction: manifest})[direction]
+
+    def _translate_file_targets(self, input_path, directions, manifests):
+        """
+        拡張子ごとの翻訳モジュールを呼び出し、{direction: 出力パス} を返す
+        （manifests は各モジュールにそのまま渡す）
         """
-        src, dest = self._parse_direction(direction)
         ext = os.path.splitext(input_path)[1].lower()
 
         # PowerPoint ファイルの処理
         if ext == '.pptx':
             from modules.pptx_translator.pptx_translator import PPTXTranslator
             pptx_tr = PPTXTranslator(self)
-            out = pptx_tr.process(input_path, direction=direction)
+            out = pptx_tr.process_targets(input_path, directions, manifests)
             return out
 
         # Excel ファイルの処理
         elif ext in ('.xlsx', '.xlsm', '.xltx', '.xltm'):
             from modules.excel_translator.excel_translator import ExcelTranslator
             excel_tr = ExcelTranslator(self)
-            out = excel_tr.process(input_path, direction=direction)
+            out = excel_tr.process_targets(input_path, directions, manifests)
             return out
 
         # Word DOCX の処理
         elif ext == '.docx':
             from modules.docx_translator.docx_translator import DOCXTranslator
             docx_tr = DOCXTranslator(self)
-            out = docx_tr.process(input_path, direction=direction)
+            out = docx_tr.process_targets(input_path, directions, manifests)
             return out
 
-        # テキスト / CSV ファイルの処理
+        # テキスト / CSV ファイルの処理（行単位のチャンクでストリーミング翻訳）
         elif ext in ('.txt', '.csv'):
-            with open(input_path, 'r', encoding='utf-8') as f:
-                txt = f.read()
-            translated = self.translate_text(txt, direction=direction)
-            outpath = self._make_output_path(input_path)
-            with open(outpath, 'w', encoding='utf-8') as f:
-                f.write(translated)
-            return outpath
+            from modules.text_translator.text_translator import TextTranslator
+            text_tr = TextTranslator(self)
+            out = text_tr.process_targets(input_path, directions, manifests)
+            return out
 
         # 未対応の拡張子
         else:
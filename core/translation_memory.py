@@ -0,0 +1,193 @@
+# core/translation_memory.py
+# 永続翻訳メモリ: (text, src, dest, backend) をキーに翻訳結果を SQLite に保存し、再利用する
+# プロセス内 LRU を前段に置き、ヒットした分はネットワークにもディスクにも触れない
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def _make_key(text, src, dest, backend=""):
+    """(text, src, dest, backend) から固定長のキーを生成する（バックエンドが違えば別の訳として扱う）"""
+    raw = f"{backend}\x00{src}\x00{dest}\x00{text}".encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+
+class TranslationMemory:
+    """
+    SQLite ファイルを使った翻訳メモリ。
+
+    - lookup_many / store_many でまとめて検索・保存する（1 件ずつ SQL を発行しない）
+    - 前段のプロセス内 LRU (lru_size 件) で同一プロセス内の繰り返しを吸収する
+    - max_entries（件数）と max_age_days（最終利用からの日数）で古いエントリを削除する
+    - hits / misses などのカウンタを stats() で返す
+    """
+
+    # 何件保存するごとに削除処理を走らせるか
+    EVICT_EVERY = 1000
+
+    def __init__(self, path, max_entries=500000, max_age_days=180, lru_size=10000):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.lru_size = lru_size
+
+        self._lock = threading.Lock()
+        self._lru = OrderedDict()
+        self._since_evict = 0
+        self._counters = {"lru_hits": 0, "db_hits": 0, "misses": 0, "stores": 0, "evicted": 0}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tm ("
+            " key TEXT PRIMARY KEY,"
+            " src TEXT NOT NULL,"
+            " dest TEXT NOT NULL,"
+            " translation TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " used_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS tm_used_at ON tm (used_at)")
+        self._conn.commit()
+        self.evict()
+
+    # ---------------------------------------------
+    # LRU
+    # ---------------------------------------------
+    def _lru_get(self, key):
+        value = self._lru.get(key)
+        if value is not None:
+            self._lru.move_to_end(key)
+        return value
+
+    def _lru_put(self, key, value):
+        self._lru[key] = value
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    # ---------------------------------------------
+    # 検索・保存
+    # ---------------------------------------------
+    def lookup_many(self, texts, src, dest, backend=""):
+        """
+        texts のうち翻訳メモリにあるものを {text: translation} で返す。
+        見つからなかったテキストは結果に含まれない。
+        backend: 翻訳したバックエンドの名前（別のバックエンドの訳は返さない）
+        """
+        found = {}
+        pending = {}
+        with self._lock:
+            for text in texts:
+                if text in found or text in pending:
+                    continue
+                key = _make_key(text, src, dest, backend)
+                value = self._lru_get(key)
+                if value is not None:
+                    found[text] = value
+                    self._counters["lru_hits"] += 1
+                else:
+                    pending[text] = key
+
+            if not pending:
+                return found
+
+            now = time.time()
+            keys = list(pending.values())
+            rows = {}
+            # SQLite のパラメータ数上限を避けるため分割して問い合わせる
+            for start in range(0, len(keys), 500):
+                part = keys[start:start + 500]
+                placeholders = ",".join("?" * len(part))
+                cur = self._conn.execute(
+                    f"SELECT key, translation FROM tm WHERE key IN ({placeholders})", part
+                )
+                rows.update(cur.fetchall())
+
+            if rows:
+                self._conn.executemany(
+                    "UPDATE tm SET used_at = ? WHERE key = ?", [(now, k) for k in rows]
+                )
+                self._conn.commit()
+
+            for text, key in pending.items():
+                value = rows.get(key)
+                if value is None:
+                    self._counters["misses"] += 1
+                    continue
+                found[text] = value
+                self._lru_put(key, value)
+                self._counters["db_hits"] += 1
+
+        return found
+
+    def store_many(self, pairs, src, dest, backend=""):
+        """(text, translation) のリストを backend の訳として翻訳メモリに保存する"""
+        now = time.time()
+        rows = []
+        with self._lock:
+            for text, translation in pairs:
+                key = _make_key(text, src, dest, backend)
+                self._lru_put(key, translation)
+                rows.append((key, src, dest, translation, now, now))
+            if not rows:
+                return
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO tm (key, src, dest, translation, created_at, used_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+            self._counters["stores"] += len(rows)
+            self._since_evict += len(rows)
+            should_evict = self._since_evict >= self.EVICT_EVERY
+
+        if should_evict:
+            self.evict()
+
+    # ---------------------------------------------
+    # 削除・統計
+    # ---------------------------------------------
+    def evict(self):
+        """最終利用から max_age_days を超えたエントリと、max_entries を超えた古いエントリを削除する"""
+        with self._lock:
+            self._since_evict = 0
+            removed = 0
+            if self.max_age_days:
+                cutoff = time.time() - self.max_age_days * 86400
+                cur = self._conn.execute("DELETE FROM tm WHERE used_at < ?", (cutoff,))
+                removed += max(cur.rowcount, 0)
+            if self.max_entries:
+                cur = self._conn.execute(
+                    "DELETE FROM tm WHERE key IN ("
+                    " SELECT key FROM tm ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+                removed += max(cur.rowcount, 0)
+            self._conn.commit()
+            self._counters["evicted"] += removed
+            return removed
+
+    def stats(self):
+        """ヒット・ミスのカウンタと現在の件数を返す"""
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM tm").fetchone()[0]
+            counters = dict(self._counters)
+        counters["hits"] = counters["lru_hits"] + counters["db_hits"]
+        total = counters["hits"] + counters["misses"]
+        counters["hit_rate"] = counters["hits"] / total if total else 0.0
+        counters["size"] = size
+        counters["lru_size"] = len(self._lru)
+        return counters
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
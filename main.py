@@ -1,113 +1,276 @@
+# main.py
+# Web アプリケーション（create_app でアプリケーションを作成する）
+# インポート時にはフォルダ作成・クリーンアップ・スレッド起動などの副作用を行わず、
+# 形式ごとの翻訳モジュール（openpyxl / python-pptx / python-docx）は最初の翻訳時に読み込む。
+#
+# 起動例:
+#   python main.py
+#   flask --app main run
+#   gunicorn -w 1 --threads 8 "main:create_app()"
+#
+# ジョブの状態（JobManager）はプロセス内に保持するため、gunicorn のワーカープロセスは 1 つにすること。
+# -w 2 以上では、ジョブを投入したワーカーとは別のワーカーにステータス確認が届くと 404 になる。
+# 同時に処理するリクエスト数は --threads、同時に実行する翻訳ジョブ数は JOB_MAX_WORKERS で調整する。
+
 import os
-from flask import Flask, render_template, request, send_file, redirect, url_for, flash
-from werkzeug.utils import secure_filename
-from core.translate_text_google import Translator
-from modules.excel_translator.excel_translator import ExcelTranslator
-from modules.pptx_translator.pptx_translator import PPTXTranslator
-from modules.docx_translator.docx_translator import DOCXTranslator  
+import shutil
+from flask import (
+    Flask, current_app, render_template, request, send_from_directory, redirect, url_for, flash, jsonify, abort,
+    Response,
+)
 from core.utils import ensure_dir
+from core.jobs import JobManager, DONE, ERROR
+from core.metrics import render_prometheus
+from core.files import (
+    UploadTooLarge, Sweeper, client_filename, create_workspace, save_stream, output_workspace,
+)
+from config.settings import (
+    JOB_MAX_WORKERS, JOB_RETENTION_SECONDS, JOB_REPORT_DIR, OUTPUT_DIR,
+    UPLOAD_DIR, MAX_UPLOAD_BYTES, UPLOAD_CHUNK_SIZE, OUTPUT_TTL_SECONDS, OUTPUT_QUOTA_BYTES,
+    UPLOAD_TTL_SECONDS, SWEEP_INTERVAL_SECONDS,
+)
+
+
+class AppState:
+    """アプリケーションごとの共有オブジェクト（app.extensions["translation"] に保持する）"""
+
+    def __init__(self, translator, jobs, sweeper=None):
+        self.translator = translator
+        self.jobs = jobs
+        self.sweeper = sweeper
+
+
+def create_app(config=None):
+    """
+    Flask アプリケーションを作成する。
+    アップロードフォルダの準備、Translator とジョブキューの作成、
+    古いファイルを削除する掃除スレッドの起動はここで行う。
+    アップロードフォルダの中身はここでは削除しない（別のプロセスが処理中のジョブのファイルがありうる）。
+    前回の実行で残ったアップロードは、掃除スレッドが保持期間（UPLOAD_TTL_SECONDS）を過ぎたものから削除する。
+    config: app.config に上書きする設定（例: {"UPLOAD_FOLDER": ..., "START_SWEEPER": False}）
+    """
+    from core.translate_text_google import Translator
 
-# === フォルダ設定 ===
-UPLOAD_FOLDER = "uploads"
-ensure_dir(UPLOAD_FOLDER)
+    app = Flask(__name__)
+    app.secret_key = "supersecretkey"
+    app.config["UPLOAD_FOLDER"] = UPLOAD_DIR
+    # リクエスト本文の上限（フォーム項目の分だけ余裕を持たせる）。超えた場合は読み込む前に 413 を返す
+    app.config["MAX_CONTENT_LENGTH"] = MAX_UPLOAD_BYTES + 1024 * 1024
+    app.config["START_SWEEPER"] = True
+    if config:
+        app.config.update(config)
 
-app = Flask(__name__)
-app.secret_key = "supersecretkey"
-app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
+    # === フォルダ設定 ===
+    upload_folder = app.config["UPLOAD_FOLDER"]
+    ensure_dir(upload_folder)
+    ensure_dir(OUTPUT_DIR)
 
-translator = Translator()
+    state = AppState(
+        translator=Translator(),
+        jobs=JobManager(
+            max_workers=JOB_MAX_WORKERS, retention_seconds=JOB_RETENTION_SECONDS, report_dir=JOB_REPORT_DIR,
+        ),
+    )
+    # === 出力ファイル（保持期間・容量上限）と残ったアップロードを定期的に削除 ===
+    if app.config["START_SWEEPER"]:
+        state.sweeper = Sweeper(
+            [(OUTPUT_DIR, OUTPUT_TTL_SECONDS, OUTPUT_QUOTA_BYTES), (upload_folder, UPLOAD_TTL_SECONDS, None)],
+            interval=SWEEP_INTERVAL_SECONDS,
+        ).start()
+    app.extensions["translation"] = state
 
-# === 起動時にアップロードフォルダをクリーンアップ ===
-def cleanup_uploads_folder():
-    """前回の実行で残ったファイルを削除します。"""
-    for filename in os.listdir(UPLOAD_FOLDER):
-        file_path = os.path.join(UPLOAD_FOLDER, filename)
-        if os.path.isfile(file_path):
-            try:
-                os.remove(file_path)
-                print(f"[クリーンアップ] 古いファイルを削除しました: {file_path}")
-            except Exception as e:
-                print(f"[警告] {file_path} を削除できませんでした: {e}")
+    app.add_url_rule("/", view_func=index)
+    app.add_url_rule("/translate", view_func=translate_file, methods=["POST"])
+    app.add_url_rule("/jobs/<job_id>", view_func=job_status)
+    app.add_url_rule("/jobs/<job_id>/report", view_func=job_report)
+    app.add_url_rule("/jobs/<job_id>/result", view_func=job_result)
+    app.add_url_rule("/metrics", view_func=metrics)
+    app.add_url_rule("/download/<path:filename>", view_func=download_file)
+    app.register_error_handler(413, upload_too_large)
+    return app
 
-cleanup_uploads_folder()
+
+def __getattr__(name):
+    # 互換性のため main.app で既定のアプリケーションを参照できるようにする（最初の参照時に作成）
+    if name == "app":
+        app = globals()["app"] = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _state():
+    return current_app.extensions["translation"]
 
 
-@app.route("/")
 def index():
     return render_template("index.html")
 
 
-@app.route("/translate", methods=["POST"])
+# === アップロードを受け付ける拡張子（翻訳はジョブのワーカースレッドで実行） ===
+EXCEL_EXTS = [".xlsx", ".xlsm", ".xltx", ".xltm"]
+PPTX_EXTS = [".pptx"]
+DOCX_EXTS = [".docx"]
+# 旧形式のバイナリファイルは読み込めないため、変換を促すメッセージを返す
+LEGACY_EXTS = {".xls": ".xlsx", ".ppt": ".pptx", ".doc": ".docx"}
+
+# 画面で選択できる言語（翻訳先に "all" を指定すると翻訳元以外のすべての言語に翻訳する）
+UI_LANGUAGES = ["en", "ja", "vi"]
+
+
+def run_translation(translator, file_path, source, targets, output_dir):
+    """
+    アップロードされたファイルを翻訳し、output_dir に作成した出力ファイルのパスを返します。
+    翻訳・差分翻訳のマニフェスト・zip へのまとめは Translator.translate_file が行い、
+    翻訳先が複数の場合は言語ごとの出力ファイルを 1 つの zip にまとめてそのパスを返します。
+    """
+    direction = f"{source}->{targets[0]}"
+    with output_workspace(output_dir):
+        if len(targets) == 1:
+            return translator.translate_file(file_path, direction)
+        return translator.translate_file(file_path, direction, targets=targets, archive=True)
+
+
+def _wants_json():
+    """fetch() からの呼び出し（JSON 応答を期待するリクエスト）かどうか"""
+    return request.headers.get("X-Requested-With") == "XMLHttpRequest" or \
+        request.accept_mimetypes.best == "application/json"
+
+
+def _download_name(output_path):
+    """出力ファイルの OUTPUT_DIR からの相対パス（/download/<path> に渡す名前）"""
+    return os.path.relpath(output_path, OUTPUT_DIR).replace(os.sep, "/")
+
+
+def _job_payload(job):
+    payload = job.to_dict()
+    payload["status_url"] = url_for("job_status", job_id=job.id)
+    payload["result_url"] = url_for("job_result", job_id=job.id)
+    if job.status == DONE and job.output_path:
+        payload["download_url"] = url_for("download_file", filename=_download_name(job.output_path))
+    return payload
+
+
+def upload_too_large(e):
+    message = f"ファイルサイズが上限（{MAX_UPLOAD_BYTES // (1024 * 1024)} MB）を超えています。"
+    if _wants_json():
+        return jsonify({"error": message}), 413
+    flash(message)
+    return redirect(url_for("index"))
+
+
 def translate_file():
 
+    def fail(message, status=400):
+        if _wants_json():
+            return jsonify({"error": message}), status
+        flash(message)
+        return redirect(url_for("index"))
+
     # === ファイル検証 ===
     if "file" not in request.files:
-        flash("ファイルが選択されていません。")
-        return redirect(url_for("index"))
+        return fail("ファイルが選択されていません。")
 
     file = request.files["file"]
 
     if file.filename == "":
-        flash("ファイルが選択されていません。")
-        return redirect(url_for("index"))
+        return fail("ファイルが選択されていません。")
 
-    # === 言語選択 ===
+    # === 言語選択（翻訳先は複数指定可: 複数の translate_to、カンマ区切り、または "all"） ===
     translate_from = request.form.get("translate_from")
-    translate_to = request.form.get("translate_to")
+    targets = [
+        lang.strip()
+        for value in request.form.getlist("translate_to")
+        for lang in value.split(",")
+        if lang.strip()
+    ]
+    if "all" in targets:
+        targets = UI_LANGUAGES
+    targets = [lang for lang in dict.fromkeys(targets) if lang != translate_from]
 
-    if not translate_from or not translate_to:
-        flash("翻訳元と翻訳先の言語を選択してください。")
-        return redirect(url_for("index"))
-
-    direction = f"{translate_from}->{translate_to}"
+    if not translate_from or not targets:
+        return fail("翻訳元と翻訳先の言語を選択してください。")
 
-    # === ファイル保存 ===
-    filename = os.path.basename(file.filename)   # ← Your original behavior (NO secure_filename)
-    file_path = os.path.join(app.config["UPLOAD_FOLDER"], filename)
-    file.save(file_path)
+    direction = f"{translate_from}->{','.join(targets)}"
 
-    ext = os.path.splitext(file_path)[1].lower()
-    output_path = None
+    # secure_filename は日本語を取り除いてしまうため使わず、ディレクトリ部分と制御文字だけを除去する
+    filename = client_filename(file.filename)
+    ext = os.path.splitext(filename)[1].lower()
+    if ext in LEGACY_EXTS:
+        return fail(f"旧形式のファイル（{ext}）には対応していません。{LEGACY_EXTS[ext]} 形式で保存し直してからアップロードしてください。")
+    if ext not in EXCEL_EXTS + PPTX_EXTS + DOCX_EXTS:
+        return fail(f"対応していないファイル形式です: {ext}")
 
+    # === ファイル保存（同名ファイルの同時アップロードで上書きされないようジョブごとのフォルダへ） ===
+    # チャンク単位で書き込み、上限を超えた時点で中断する
+    job_dir = create_workspace(current_app.config["UPLOAD_FOLDER"])
+    file_path = os.path.join(job_dir, filename)
     try:
-        # === Excel ===
-        if ext in [".xlsx", ".xls", ".xlsm", ".xltx", ".xltm"]:
-            worker = ExcelTranslator(translator)
-            output_path = worker.process(file_path, direction)
-
-        # === PowerPoint ===
-        elif ext in [".pptx", ".ppt"]:
-            worker = PPTXTranslator(translator)
-            output_path = worker.process(file_path, direction)
-
-        # === Word DOCX ===
-        elif ext == ".docx":
-            worker = DOCXTranslator(translator)       
-            output_path = worker.process(file_path, direction)
-
-        else:
-            flash(f"対応していないファイル形式です: {ext}")
-            if os.path.exists(file_path):
-                os.remove(file_path)
-            return redirect(url_for("index"))
-
-        # === 翻訳完了後、元ファイル削除 ===
-        if os.path.exists(file_path):
-            os.remove(file_path)
-
-    except Exception as e:
-        flash(f"翻訳中にエラーが発生しました: {e}")
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        save_stream(file.stream, file_path, MAX_UPLOAD_BYTES, UPLOAD_CHUNK_SIZE)
+    except UploadTooLarge as e:
+        shutil.rmtree(job_dir, ignore_errors=True)
+        return fail(f"{e}。", status=413)
+    output_dir = os.path.join(OUTPUT_DIR, os.path.basename(job_dir))
+
+    # === 翻訳完了後（成功・失敗とも）、元ファイル削除 ===
+    def remove_upload(job):
+        shutil.rmtree(job_dir, ignore_errors=True)
+
+    translator = _state().translator
+    job = _state().jobs.submit(
+        lambda: run_translation(translator, file_path, translate_from, targets, output_dir),
+        filename, direction, on_finish=remove_upload,
+    )
+
+    if _wants_json():
+        return jsonify(_job_payload(job)), 202
+    return redirect(url_for("job_result", job_id=job.id))
+
+
+def job_status(job_id):
+    job = _state().jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "ジョブが見つかりません。"}), 404
+    return jsonify(_job_payload(job))
+
+
+def job_report(job_id):
+    """ジョブの計測レポート（ステージ別の所要時間・セグメント数・バックエンド呼び出し）"""
+    job = _state().jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "ジョブが見つかりません。"}), 404
+    payload = job.to_dict()
+    payload["report"] = job.report.to_dict() if job.report is not None else None
+    return jsonify(payload)
+
+
+def metrics():
+    """Prometheus のテキスト形式でプロセス全体のメトリクスを返す"""
+    return Response(render_prometheus(), mimetype="text/plain; version=0.0.4")
+
+
+def job_result(job_id):
+    job = _state().jobs.get(job_id)
+    if job is None:
+        abort(404)
+
+    if job.status == ERROR:
+        flash(f"翻訳中にエラーが発生しました: {job.error}")
         return redirect(url_for("index"))
 
-    return render_template("result.html", output_path=output_path)
+    if job.status != DONE:
+        # JavaScript 無しでアクセスされた場合は処理中ページを表示して自動更新する
+        return render_template("result.html", job=job, output_path=None, pending=True), 202
+
+    return render_template("result.html", job=job, output_path=_download_name(job.output_path), pending=False)
 
 
-@app.route("/download/<path:filename>")
 def download_file(filename):
-    return send_file(filename, as_attachment=True)
+    """
+    OUTPUT_DIR 内の出力ファイルだけを返す（OUTPUT_DIR の外を指すパスは 404）。
+    ファイルはチャンク単位で送信され、Range リクエスト（途中からの再開）にも対応する。
+    """
+    return send_from_directory(OUTPUT_DIR, filename, as_attachment=True, conditional=True, max_age=0)
 
 
 if __name__ == "__main__":
-    app.run(debug=True)
+    create_app().run(debug=True)
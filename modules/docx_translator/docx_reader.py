@@ -3,6 +3,7 @@
 # 抽出結果は位置情報 (path) とテキストのタプルのリストとして返す
 
 from docx import Document
+from docx.table import _Cell
 
 def read_docx(path):
     """
@@ -54,3 +55,72 @@ def read_docx(path):
                 out['footers'].append(("footer", s_idx, p_idx, text))
 
     return out
+
+
+def _iter_table_cells(table):
+    """
+    テーブルのセルを (r_idx, c_idx, cell) で列挙する。
+    row.cells は結合セルをアクセスのたびにグリッド単位で再構築するため、大きな表では遅い。
+    ここでは <w:tr>/<w:tc> 要素を直接たどり、結合セルも 1 回だけ返す（c_idx は行内の tc の順番）。
+    """
+    for r_idx, tr in enumerate(table._tbl.tr_lst):
+        for c_idx, tc in enumerate(tr.tc_lst):
+            yield r_idx, c_idx, _Cell(tc, table)
+
+
+def _iter_table_paragraphs(table, path):
+    """
+    テーブル内の段落を (path, paragraph) で返す。セル内の入れ子のテーブルも再帰的にたどる。
+    path: ("table", t_idx) に (r_idx, c_idx, p_idx) を続けたもの。
+    入れ子のテーブルは親セルの位置に ("table", n_idx) を続ける（例: ("table", 0, 1, 1, "table", 0, 0, 0, 0)）。
+    """
+    for r_idx, c_idx, cell in _iter_table_cells(table):
+        for p_idx, para in enumerate(cell.paragraphs):
+            yield path + (r_idx, c_idx, p_idx), para
+        for n_idx, nested in enumerate(cell.tables):
+            yield from _iter_table_paragraphs(nested, path + (r_idx, c_idx, "table", n_idx))
+
+
+def iter_docx_paragraphs(doc):
+    """
+    開いた Document から翻訳対象の段落ハンドルを 1 回の走査で順に返す（シングルパス用）。
+
+    Yields:
+      (section_key, path, paragraph, "text")
+      section_key: 'paragraphs' / 'tables' / 'headers' / 'footers'
+      path: read_docx と同じ位置情報（テーブルの列番号は行内の <w:tc> の順番）
+            read_docx と異なり、セル内の入れ子のテーブルの段落も返す（_iter_table_paragraphs）
+      paragraph: python-docx の Paragraph。同じ Document に対してそのまま書き戻せる。
+
+    ジェネレータなので、返した段落を書き換えながら走査を続けてよい（段落の追加・削除はしないこと）。
+    前のセクションにリンクされたヘッダ/フッタは定義を持たないためスキップする
+    （参照すると空の定義が追加されてしまう）。
+    """
+    def candidates():
+        # body paragraphs
+        for i, para in enumerate(doc.paragraphs):
+            yield 'paragraphs', ("para", i), para
+
+        # tables
+        for t_idx, table in enumerate(doc.tables):
+            for path, para in _iter_table_paragraphs(table, ("table", t_idx)):
+                yield 'tables', path, para
+
+        # headers / footers
+        for s_idx, section in enumerate(doc.sections):
+            for section_key, part in (('headers', section.header), ('footers', section.footer)):
+                if part.is_linked_to_previous:
+                    continue
+                kind = section_key[:-1]
+                for p_idx, para in enumerate(part.paragraphs):
+                    yield section_key, (kind, s_idx, p_idx), para
+
+    for section_key, path, para in candidates():
+        text = para.text or ""
+        if text.strip():
+            yield section_key, path, para, text
+
+
+def collect_docx_paragraphs(doc):
+    """iter_docx_paragraphs の結果をリストで返す: [ (section_key, path, paragraph, "text"), ... ]"""
+    return list(iter_docx_paragraphs(doc))
@@ -0,0 +1,120 @@
+# modules/docx_translator/docx_segments.py
+# 書式を考慮した DOCX 段落のセグメント化
+# 書式の異なる run（太字・斜体など）をインラインタグで囲んで 1 セグメントとして翻訳し、
+# 翻訳後のタグに従って対応する書式の run を組み立て直す
+# ハイパーリンク（w:hyperlink）内の run はリンクごとに別のグループとし、書き戻し時に同じリンクで囲み直す
+
+import copy
+
+from docx.oxml.ns import qn
+from lxml import etree
+
+from core.segmenter import segment_runs, parse_tagged, strip_tags
+from core.ooxml import set_text_preserving_space
+from .docx_writer import _replace_paragraph_text_preserve_format
+
+_R = qn("w:r")
+_T = qn("w:t")
+_RPR = qn("w:rPr")
+_PPR = qn("w:pPr")
+_HYPERLINK = qn("w:hyperlink")
+
+# 段落内にあっても run の組み立て直しに影響しない要素
+_PARAGRAPH_MARKERS = {qn("w:proofErr"), qn("w:bookmarkStart"), qn("w:bookmarkEnd")}
+# run 内で扱える要素（タブ・改行・画像などを含む run は組み立て直さない）
+_RUN_CHILDREN = {_RPR, _T, qn("w:lastRenderedPageBreak")}
+
+
+def _run_key(r):
+    rpr = r.find(_RPR)
+    key = etree.tostring(rpr) if rpr is not None else b""
+    link = r.getparent()
+    if link.tag == _HYPERLINK:
+        # リンク先（r:id / w:anchor）も書式の一部として扱う（PPTX の a:rPr 内の hlinkClick と同じ）
+        key = etree.tostring(link.makeelement(link.tag, link.attrib)) + key
+    return key
+
+
+def _run_text(r):
+    return "".join(t.text or "" for t in r.iter(_T))
+
+
+def _set_run_text(r, text):
+    for child in list(r):
+        if child.tag != _RPR:
+            r.remove(child)
+    t = r.makeelement(_T, {})
+    r.append(t)
+    set_text_preserving_space(t, text)
+
+
+def _is_segmentable(p):
+    """run・ハイパーリンク内の run（と校正マーカー・ブックマーク）だけで構成された段落かどうか"""
+    for child in p:
+        if child.tag == _R:
+            if any(c.tag not in _RUN_CHILDREN for c in child):
+                return False
+        elif child.tag == _HYPERLINK:
+            if not _is_segmentable(child):
+                return False
+        elif child.tag != _PPR and child.tag not in _PARAGRAPH_MARKERS:
+            return False
+    return True
+
+
+def _paragraph_runs(p):
+    """段落直下の run とハイパーリンク内の run（文書順）"""
+    runs = []
+    for child in p:
+        if child.tag == _R:
+            runs.append(child)
+        elif child.tag == _HYPERLINK:
+            runs.extend(child.findall(_R))
+    return runs
+
+
+def _rebuild_runs(layout, spans):
+    """
+    core.segmenter.rebuild_runs のハイパーリンク対応版。
+    ハイパーリンク内の run を複製したものは、元のリンクと同じ属性の w:hyperlink で囲んで挿入する。
+    中身がなくなった元のハイパーリンクは取り除く。
+    """
+    first = layout.runs[0]
+    anchor = first.getparent() if first.getparent().tag == _HYPERLINK else first
+    for gid, chunk in spans:
+        template = layout.templates[gid]
+        run = copy.deepcopy(template)
+        _set_run_text(run, chunk)
+        link = template.getparent()
+        if link.tag == _HYPERLINK:
+            wrapper = link.makeelement(link.tag, link.attrib)
+            wrapper.append(run)
+            run = wrapper
+        anchor.addprevious(run)
+
+    for run in layout.runs:
+        parent = run.getparent()
+        parent.remove(run)
+        if parent.tag == _HYPERLINK and len(parent) == 0:
+            parent.getparent().remove(parent)
+
+
+def encode_paragraph(para):
+    """
+    段落を (テキスト, RunLayout または None) に変換する。
+    書式の異なる run がなければタグは付けず、para.text をそのまま返す。
+    """
+    p = para._p
+    runs = _paragraph_runs(p)
+    if not runs or not _is_segmentable(p):
+        return para.text, None
+    return segment_runs(runs, _run_key, _run_text)
+
+
+def apply_segmented_paragraph(para, new_text, layout):
+    """encode_paragraph から得た翻訳結果を段落に書き戻す（タグが壊れていれば先頭 run 方式に戻す）"""
+    spans = parse_tagged(new_text, layout.ids) if layout is not None else None
+    if spans:
+        _rebuild_runs(layout, spans)
+    else:
+        _replace_paragraph_text_preserve_format(para, strip_tags(new_text))
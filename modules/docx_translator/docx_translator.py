@@ -1,70 +1,137 @@
 # modules/docx_translator/docx_translator.py
 # DOCX 単体翻訳モジュール
 # reader -> translate -> writer のフローで動作します
+# シングルパスでは core.pipeline により、段落の走査・翻訳・書き戻しを重ねて実行します
 
-from .docx_reader import read_docx
-from .docx_writer import write_docx_from_template
+from docx import Document
+
+from .docx_reader import read_docx, iter_docx_paragraphs, collect_docx_paragraphs
+from .docx_writer import write_docx_from_template, _replace_paragraph_text_preserve_format
+from .docx_segments import encode_paragraph, apply_segmented_paragraph
 from core.translate_text_google import Translator as HighLevelTranslator
+from core.manifest import location_key
+from core.metrics import stage
+from core.pipeline import translate_stream
+from config.settings import DOCX_SINGLE_PASS, RUN_AWARE_SEGMENTATION
 import os
 
 class DOCXTranslator:
     def __init__(self, high_level_translator: HighLevelTranslator):
         self.hl = high_level_translator
 
-    def process(self, src_path, direction='en->ja'):
+    def process(self, src_path, direction='en->ja', manifest=None):
         """
         - src_path: 元の docx ファイル
         - direction: 'en->ja' のような翻訳方向
+        - manifest: 差分翻訳用の SegmentManifest（段落の位置ごとに前回の翻訳を再利用する）
         戻り値: 出力ファイルパス
+
+        DOCX_SINGLE_PASS が有効な場合は、文書を 1 回だけ開いて段落を走査しながら翻訳に送り、
+        翻訳結果を同じ段落ハンドルに書き戻して 1 回だけ保存する。
+        """
+        return self.process_targets(src_path, [direction], {direction: manifest})[direction]
+
+    def process_targets(self, src_path, directions, manifests=None):
+        """
+        複数の翻訳方向へまとめて翻訳し、{direction: 出力ファイルパス} を返す。
+        文書の読み取り・セグメント化は 1 回だけ行い、各方向の翻訳を並行して取得して方向ごとに保存する。
+        - manifests: {direction: SegmentManifest}（省略可）
+        """
+        if DOCX_SINGLE_PASS:
+            return self._process_single_pass(src_path, directions, manifests)
+        return self._process_two_pass(src_path, directions, manifests)
+
+    def _encode(self, para, text):
+        """翻訳に送るテキストと layout（書式を考慮するモードでは、書式の異なる run をインラインタグで囲む）"""
+        if RUN_AWARE_SEGMENTATION:
+            return encode_paragraph(para)
+        return text, None
+
+    def _read_single_pass(self, src_path):
+        """文書を開き、(doc, 段落の一覧, 翻訳用テキストと layout) を返す"""
+        doc = Document(src_path)
+        items = collect_docx_paragraphs(doc)
+        encoded = [self._encode(para, text) for _, _, para, text in items]
+        return doc, items, encoded
+
+    def _apply(self, para, layout, tr):
+        try:
+            if layout is not None:
+                apply_segmented_paragraph(para, tr, layout)
+            else:
+                _replace_paragraph_text_preserve_format(para, tr)
+        except Exception:
+            # skip failures to be robust
+            pass
+
+    def _process_single_pass(self, src_path, directions, manifests=None):
+        """
+        読み取り・書き戻し・保存を 1 つの Document オブジェクトで行う。
+        1 方向目は段落を走査しながらチャンク単位で翻訳に送り、翻訳済みのチャンクから順に書き戻す。
+        2 方向目以降の翻訳結果は保持しておき、書き込み用に開き直した文書に書き戻す。
         """
+        first, rest = directions[0], directions[1:]
+        later = {direction: [] for direction in rest}
+
+        with stage("docx", "read"):
+            doc = Document(src_path)
+
+        def segments():
+            for _, path, para, text in iter_docx_paragraphs(doc):
+                encoded, layout = self._encode(para, text)
+                yield location_key(*path), encoded, (para, layout)
+
+        def apply(item, translated):
+            para, layout = item
+            self._apply(para, layout, translated[first])
+            for direction in rest:
+                later[direction].append(translated[direction])
+
+        with stage("docx", "stream"):
+            translate_stream(self.hl, segments(), directions, apply, manifests, name="docx")
+
+        outputs = {}
+        with stage("docx", "write"), self.hl.output_label_for(first, directions):
+            outputs[first] = self.hl._make_output_path(src_path)
+            doc.save(outputs[first])
+
+        for direction in rest:
+            # 出力ごとに別の文書になるため、書き戻し先として開き直す（翻訳結果はそのまま使う）
+            with stage("docx", "read"):
+                doc, items, encoded = self._read_single_pass(src_path)
+            with stage("docx", "write"), self.hl.output_label_for(direction, directions):
+                for (_, _, para, _), (_, layout), tr in zip(items, encoded, later[direction]):
+                    self._apply(para, layout, tr)
+                outputs[direction] = self.hl._make_output_path(src_path)
+                doc.save(outputs[direction])
+        return outputs
+
+    def _process_two_pass(self, src_path, directions, manifests=None):
+        """read_docx で読み取り、write_docx_from_template で開き直して書き込む（従来方式）"""
         # 1) 読み取り
-        structure = read_docx(src_path)
+        with stage("docx", "read"):
+            structure = read_docx(src_path)
 
         # 2) 翻訳（段落、テーブル、ヘッダ、フッタ）
-        translated = {
-            'paragraphs': [],
-            'tables': [],
-            'headers': [],
-            'footers': []
-        }
-
-        # paragraphs: ("para", i, text)
-        for _type, idx, text in structure.get('paragraphs', []):
-            try:
-                tr = self.hl.translate_text(text, direction)
-            except Exception:
-                tr = text
-            translated['paragraphs'].append((_type, idx, tr))
-
-        # tables: ("table", t_idx, r_idx, c_idx, p_idx, text)
-        for item in structure.get('tables', []):
-            _type, t_idx, r_idx, c_idx, p_idx, text = item
-            try:
-                tr = self.hl.translate_text(text, direction)
-            except Exception:
-                tr = text
-            translated['tables'].append((_type, t_idx, r_idx, c_idx, p_idx, tr))
-
-        # headers
-        for _type, s_idx, p_idx, text in structure.get('headers', []):
-            try:
-                tr = self.hl.translate_text(text, direction)
-            except Exception:
-                tr = text
-            translated['headers'].append((_type, s_idx, p_idx, tr))
-
-        # footers
-        for _type, s_idx, p_idx, text in structure.get('footers', []):
-            try:
-                tr = self.hl.translate_text(text, direction)
-            except Exception:
-                tr = text
-            translated['footers'].append((_type, s_idx, p_idx, tr))
-
-        # 3) 出力パス生成
-        out_path = self.hl._make_output_path(src_path)
-
-        # 4) writer による保存（元の書式・画像は preserved）
-        write_docx_from_template(src_path, out_path, translated)
-
-        return out_path
+        # 各項目の末尾要素がテキストなので、全項目をまとめて translate_batch に渡す
+        sections = ('paragraphs', 'tables', 'headers', 'footers')
+        items = [(key, item) for key in sections for item in structure.get(key, [])]
+        keys = [location_key(*item[:-1]) for _, item in items]
+        with stage("docx", "translate"):
+            translations = self.hl.translate_batch_targets(
+                [item[-1] for _, item in items], directions, keys=keys, manifests=manifests
+            )
+
+        outputs = {}
+        for direction in directions:
+            translated = {key: [] for key in sections}
+            for (key, item), tr in zip(items, translations[direction]):
+                translated[key].append(item[:-1] + (tr,))
+
+            # 3) 出力パス生成・4) writer による保存（元の書式・画像は preserved）
+            with stage("docx", "write"), self.hl.output_label_for(direction, directions):
+                out_path = self.hl._make_output_path(src_path)
+                write_docx_from_template(src_path, out_path, translated)
+            outputs[direction] = out_path
+
+        return outputs
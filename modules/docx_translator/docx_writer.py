@@ -3,15 +3,17 @@
 # 書式 (最初の run のフォーマット) をできるだけ保持する戦略を採る
 
 from docx import Document
+from docx.text.run import Run
 
 def _replace_paragraph_text_preserve_format(para, new_text):
     """
     Paragraph のテキストを置換しつつ、最初の run のフォーマットを保持する。
     - runs がある場合、runs[0].text に new_text を入れ、他は空文字にする。
+      ハイパーリンク内の run も対象にする（para.runs には含まれないが para.text には含まれるため）。
     - runs が無い場合、para.text = new_text。
     new_text に改行が含まれている場合、run.text にそのまま入れる（docx の run は改行を扱える）。
     """
-    runs = para.runs
+    runs = [Run(r, para) for r in para._p.xpath("./w:r | ./w:hyperlink/w:r")]
     if runs:
         # preserve formatting of runs[0]
         runs[0].text = new_text
@@ -0,0 +1,169 @@
+# modules/excel_translator/excel_formulas.py
+# Rewrite the references inside Excel formulas when sheets or table columns are renamed.
+# Formulas are scanned token by token so string literals ("Sales!A1") and references
+# into other workbooks ([1]Sales!A1, '[Book.xlsx]Sales'!A1) are left untouched.
+# Pure string functions: shared by the zip-level writer for <f> cells, definedNames,
+# chart series, data validation / conditional formatting and table formulas.
+
+import re
+
+# Unquoted sheet reference, optionally 3D (Sheet1:Sheet3!A1)
+_UNQUOTED_SHEET = re.compile(r"[\w.]+(?::[\w.]+)?!")
+# Function, table, defined name, cell reference or number
+_NAME = re.compile(r"[\w.\\]+")
+# Sheet names that can be written without quotes in a formula
+_PLAIN_SHEET_NAME = re.compile(r"[A-Za-z_][A-Za-z0-9_.]*")
+# ... unless they would be read as a cell reference (A1, XFD10, R1C1) or a boolean
+_CELL_LIKE = re.compile(r"[A-Za-z]{1,3}\d+|[Rr]\d*[Cc]?\d*|[Cc]\d*|TRUE|FALSE", re.IGNORECASE)
+# Characters escaped with ' inside structured-reference column names
+_COLUMN_SPECIALS = "[]#'"
+
+
+def _skip_quoted(formula, start, quote):
+    """Index just past the string or sheet name opened at start ("..." / '...', doubled quote = escape)."""
+    i = start + 1
+    while i < len(formula):
+        if formula[i] == quote:
+            if formula[i + 1:i + 2] == quote:
+                i += 2
+                continue
+            return i + 1
+        i += 1
+    return len(formula)
+
+
+def _skip_brackets(formula, start):
+    """Index just past the bracket group opened at start, honouring nesting and ' escapes."""
+    depth = 0
+    i = start
+    while i < len(formula):
+        ch = formula[i]
+        if ch == "'":
+            i += 2
+            continue
+        if ch == "[":
+            depth += 1
+        elif ch == "]":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return len(formula)
+
+
+def quote_sheet_name(name):
+    """Sheet name as written before '!' in a formula (quoted when required)."""
+    if _PLAIN_SHEET_NAME.fullmatch(name) and not _CELL_LIKE.fullmatch(name):
+        return name
+    return "'" + name.replace("'", "''") + "'"
+
+
+def _rename_sheets(names, sheet_renames, quoted):
+    """Rename the sheet(s) of one reference prefix (names without quotes, 3D ranges joined by ':')."""
+    if "[" in names:
+        # Reference into another workbook
+        return None
+    parts = names.split(":")
+    renamed = [sheet_renames.get(part.lower(), part) for part in parts]
+    if renamed == parts:
+        return None
+    if quoted or any(quote_sheet_name(part) != part for part in renamed):
+        return "'" + ":".join(renamed).replace("'", "''") + "'"
+    return ":".join(renamed)
+
+
+def _unescape_column(name):
+    return re.sub(r"'(.)", r"\1", name)
+
+
+def _escape_column(name):
+    return "".join("'" + ch if ch in _COLUMN_SPECIALS else ch for ch in name)
+
+
+def _rename_column_item(item, columns):
+    """One column specifier of a structured reference (without brackets); #All, #Data, ... stay as-is."""
+    prefix = "@" if item.startswith("@") else ""
+    name = item[len(prefix):]
+    if name.startswith("#"):
+        return item
+    new_name = columns.get(_unescape_column(name).lower())
+    return item if new_name is None else prefix + _escape_column(new_name)
+
+
+def _rename_structured(group, columns):
+    """
+    Rename the columns of a structured reference group such as [Amount],
+    [[#This Row],[Amount]] or [[Q1]:[Q4]] (group includes the outer brackets).
+    """
+    inner = group[1:-1]
+    if not inner.lstrip().startswith("["):
+        return "[" + _rename_column_item(inner, columns) + "]"
+
+    out = []
+    i = 0
+    while i < len(inner):
+        if inner[i] == "[":
+            end = _skip_brackets(inner, i)
+            out.append("[" + _rename_column_item(inner[i + 1:end - 1], columns) + "]")
+            i = end
+        else:
+            out.append(inner[i])
+            i += 1
+    return "[" + "".join(out) + "]"
+
+
+def rename_references(formula, sheet_renames, column_renames=None):
+    """
+    Return formula with its references updated.
+
+    Args:
+        formula (str): Formula text as stored in the package (no leading '=').
+        sheet_renames (dict): {old sheet name (lower case): new sheet name}.
+        column_renames (dict): {table name (lower case): {old column name (lower case): new column name}}
+            for structured references such as Table1[Amount] or Table1[[#This Row],[Amount]].
+    """
+    if not formula:
+        return formula
+    column_renames = column_renames or {}
+    out = []
+    i = 0
+    n = len(formula)
+    while i < n:
+        ch = formula[i]
+        if ch == '"':
+            end = _skip_quoted(formula, i, '"')
+            out.append(formula[i:end])
+        elif ch == "'":
+            end = _skip_quoted(formula, i, "'")
+            renamed = None
+            if formula[end:end + 1] == "!":
+                renamed = _rename_sheets(formula[i + 1:end - 1].replace("''", "'"), sheet_renames, quoted=True)
+            out.append(formula[i:end] if renamed is None else renamed)
+        elif ch == "[":
+            # External workbook index ([1]Sheet1!A1): copy it together with the sheet that follows
+            end = _skip_brackets(formula, i)
+            match = _UNQUOTED_SHEET.match(formula, end)
+            if match:
+                end = match.end()
+            out.append(formula[i:end])
+        else:
+            match = _UNQUOTED_SHEET.match(formula, i)
+            if match:
+                end = match.end()
+                renamed = _rename_sheets(match.group()[:-1], sheet_renames, quoted=False)
+                out.append(match.group() if renamed is None else renamed + "!")
+            else:
+                match = _NAME.match(formula, i)
+                if not match:
+                    out.append(ch)
+                    i += 1
+                    continue
+                end = match.end()
+                out.append(match.group())
+                columns = column_renames.get(match.group().lower())
+                if columns and formula[end:end + 1] == "[":
+                    group_end = _skip_brackets(formula, end)
+                    out.append(_rename_structured(formula[end:group_end], columns))
+                    end = group_end
+        i = end
+    return "".join(out)
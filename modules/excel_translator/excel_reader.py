@@ -13,3 +13,33 @@ def read_excel_for_translation(file_path):
                 if isinstance(cell.value, str) and cell.value.strip():
                     cells_to_translate.append((sheet.title, cell.coordinate, cell.value))
     return wb, cells_to_translate
+
+def iter_excel_segments(file_path):
+    """
+    Streams (sheet_title, cell_coord, text) for every non-empty text cell.
+
+    Uses openpyxl read_only mode, so rows are parsed lazily from the sheet XML and
+    no cell model is kept in memory; the writer is then the only place that loads
+    the full workbook. Formula cells are skipped (their "=..." source is not text).
+    """
+    wb = load_workbook(file_path, read_only=True)
+    try:
+        for sheet in wb.worksheets:
+            for row in sheet.iter_rows():
+                for cell in row:
+                    value = cell.value
+                    if not isinstance(value, str) or not value.strip():
+                        continue
+                    if getattr(cell, "data_type", None) == "f":
+                        continue
+                    yield (sheet.title, cell.coordinate, value)
+    finally:
+        wb.close()
+
+def read_excel_sheet_names(file_path):
+    """Returns the workbook's sheet titles without loading any cells."""
+    wb = load_workbook(file_path, read_only=True)
+    try:
+        return list(wb.sheetnames)
+    finally:
+        wb.close()
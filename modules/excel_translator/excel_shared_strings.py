@@ -0,0 +1,431 @@
+# modules/excel_translator/excel_shared_strings.py
+# Fast path for .xlsx: translate xl/sharedStrings.xml directly inside the zip package.
+# Every unique string is translated once, only sharedStrings.xml / workbook.xml / app.xml
+# and the parts that reference renamed sheets or table columns are rewritten; all other parts
+# (drawings, shapes, media) are copied unchanged.
+# No Excel COM or openpyxl workbook model is needed, so it works on Linux servers.
+
+import copy
+import zipfile
+
+from lxml import etree
+
+from core.ooxml import (
+    OFFICE_REL_NS, parse_part, parse_part_bytes, serialize_part, read_relationships, set_text_preserving_space,
+    copy_zip_with_replacements,
+)
+from modules.excel_translator.excel_formulas import rename_references
+
+SSML_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+EP_NS = "http://schemas.openxmlformats.org/officeDocument/2006/extended-properties"
+VT_NS = "http://schemas.openxmlformats.org/officeDocument/2006/docPropsVTypes"
+
+_SI = f"{{{SSML_NS}}}si"
+_T = f"{{{SSML_NS}}}t"
+_R = f"{{{SSML_NS}}}r"
+_RPH = f"{{{SSML_NS}}}rPh"
+_SHEET = f"{{{SSML_NS}}}sheet"
+_DEFINED_NAME = f"{{{SSML_NS}}}definedName"
+_ROW = f"{{{SSML_NS}}}row"
+_C = f"{{{SSML_NS}}}c"
+_V = f"{{{SSML_NS}}}v"
+_IS = f"{{{SSML_NS}}}is"
+_TABLE_COLUMN = f"{{{SSML_NS}}}tableColumn"
+
+# Elements whose text is a formula, in worksheets, tables and charts
+# (cells, data validation, conditional formatting, sparklines, table formulas, chart series)
+_FORMULA_TAGS = {"f", "formula", "formula1", "formula2", "calculatedColumnFormula", "totalsRowFormula"}
+# Attributes holding a reference: hyperlink targets inside the workbook, shapes linked to a cell
+_REFERENCE_ATTRS = {"location", "textlink"}
+# Parts other than the worksheets that can reference sheets by name
+_REFERENCING_PARTS = ("xl/charts/", "xl/drawings/", "xl/pivotCache/", "xl/tables/")
+
+# Characters Excel does not allow in sheet names
+_INVALID_SHEET_CHARS = set('[]:*?/\\')
+
+
+class SharedStringsWorkbook:
+    """
+    Parsed shared-string table of an .xlsx package.
+
+    texts: plain text of every <si> entry, in table order (phonetic <rPh> runs excluded)
+    sheet_names: sheet titles in workbook order
+    sheet_parts: worksheet part name of each sheet (None when the relationship is missing)
+    inline_sheets: indexes of the sheets that store cell text inline (t="inlineStr")
+
+    sst_part / sst_root are None and texts is empty for a package without a shared-string table.
+    """
+
+    def __init__(self, workbook_part, sst_part, sst_root, texts, sheet_names, sheet_parts=None, inline_sheets=()):
+        self.workbook_part = workbook_part
+        self.sst_part = sst_part
+        self.sst_root = sst_root
+        self.texts = texts
+        self.sheet_names = sheet_names
+        self.sheet_parts = sheet_parts or [None] * len(sheet_names)
+        self.inline_sheets = list(inline_sheets)
+
+
+def _si_text(si):
+    """Concatenate the visible text of one <si>: either a single <t> or the <t> of each rich-text run."""
+    parts = []
+    for child in si:
+        if child.tag == _T:
+            parts.append(child.text or "")
+        elif child.tag == _R:
+            t = child.find(_T)
+            if t is not None:
+                parts.append(t.text or "")
+    return "".join(parts)
+
+
+def _part_contains(zf, part_name, needles):
+    """True if the raw XML of a part contains any of the byte strings in needles (read in blocks)."""
+    overlap = max(len(needle) for needle in needles)
+    tail = b""
+    with zf.open(part_name) as f:
+        while True:
+            block = f.read(1024 * 1024)
+            if not block:
+                return False
+            if any(needle in tail + block for needle in needles):
+                return True
+            tail = block[-overlap:]
+
+
+def _contains_inline_strings(zf, part_name):
+    """True if a worksheet stores cell text inline (t="inlineStr") instead of in the shared table."""
+    return _part_contains(zf, part_name, [b'"inlineStr"'])
+
+
+def read_shared_strings(file_path, allow_inline_strings=False):
+    """
+    Returns a SharedStringsWorkbook, or None when the fast path cannot cover the workbook
+    (not a zip package, no shared-string table, or sheets with inline strings).
+
+    With allow_inline_strings=True, sheets with inline strings and packages without a
+    shared-string table are accepted; the caller translates those sheets itself
+    (see excel_sheets) using workbook.inline_sheets / workbook.sheet_parts.
+    """
+    if not zipfile.is_zipfile(file_path):
+        return None
+
+    with zipfile.ZipFile(file_path) as zf:
+        names = set(zf.namelist())
+        workbook_parts = list(read_relationships(zf, "", "officeDocument").values())
+        if not workbook_parts or workbook_parts[0] not in names:
+            return None
+        workbook_part = workbook_parts[0]
+
+        sst_parts = list(read_relationships(zf, workbook_part, "sharedStrings").values())
+        sst_part = sst_parts[0] if sst_parts and sst_parts[0] in names else None
+        if sst_part is None and not allow_inline_strings:
+            return None
+
+        wb_root = parse_part(zf, workbook_part)
+        worksheet_rels = read_relationships(zf, workbook_part, "worksheet")
+        sheet_names = []
+        sheet_parts = []
+        for sheet in wb_root.iter(_SHEET):
+            part = worksheet_rels.get(sheet.get(f"{{{OFFICE_REL_NS}}}id"))
+            sheet_names.append(sheet.get("name"))
+            sheet_parts.append(part if part in names else None)
+
+        inline_sheets = [i for i, part in enumerate(sheet_parts) if part and _contains_inline_strings(zf, part)]
+        if inline_sheets and not allow_inline_strings:
+            return None
+
+        sst_root = parse_part(zf, sst_part) if sst_part else None
+        texts = [_si_text(si) for si in sst_root.iter(_SI)] if sst_root is not None else []
+
+    return SharedStringsWorkbook(workbook_part, sst_part, sst_root, texts, sheet_names, sheet_parts, inline_sheets)
+
+
+def _apply_si_translation(si, new_text):
+    """
+    Replace the text of one <si>, keeping the formatting of the first run
+    (same strategy as the PPTX/DOCX writers). Phonetic guides are dropped
+    because they describe the original characters.
+    """
+    for rph in si.findall(_RPH):
+        si.remove(rph)
+
+    t = si.find(_T)
+    if t is not None:
+        set_text_preserving_space(t, new_text)
+        return
+
+    first = True
+    for run in si.findall(_R):
+        rt = run.find(_T)
+        if rt is None:
+            continue
+        set_text_preserving_space(rt, new_text if first else "")
+        first = False
+
+
+def _unique_sheet_names(current_names, sheet_renames):
+    """
+    Build {old_name: new_name} for the requested renames. Names are sanitized, cut to
+    Excel's 31-character limit and made unique case-insensitively against every
+    sheet's final name.
+    """
+    requested = dict(sheet_renames)
+    final = {}
+    used = set()
+    # Sheets that are not renamed keep their names, so reserve them first
+    for name in current_names:
+        if name not in requested:
+            used.add(name.lower())
+
+    for name in current_names:
+        if name not in requested:
+            continue
+        target = "".join("_" if ch in _INVALID_SHEET_CHARS else ch for ch in requested[name])
+        target = target.strip().strip("'")[:31] or name
+        candidate = target
+        counter = 1
+        while candidate.lower() in used:
+            suffix = f"_{counter}"
+            candidate = target[:31 - len(suffix)] + suffix
+            counter += 1
+        used.add(candidate.lower())
+        final[name] = candidate
+    return final
+
+
+def _split_cell_ref(ref):
+    """'AB12' -> (28, 12); the row is 0 when ref has no digits."""
+    col = 0
+    digits = ""
+    for ch in ref.replace("$", ""):
+        if ch.isalpha():
+            col = col * 26 + (ord(ch.upper()) - ord("A") + 1)
+        else:
+            digits += ch
+    return col, int(digits or 0)
+
+
+def _row_cells(sheet_root, row_index):
+    """{column index: <c>} of one worksheet row; positions missing from the XML are derived as Excel does."""
+    current = 0
+    for row in sheet_root.iter(_ROW):
+        current = int(row.get("r") or current + 1)
+        if current < row_index:
+            continue
+        if current > row_index:
+            break
+        cells = {}
+        col = 0
+        for c in row.iterchildren(_C):
+            col = _split_cell_ref(c.get("r"))[0] if c.get("r") else col + 1
+            cells[col] = c
+        return cells
+    return {}
+
+
+def _cell_text(c, sst_texts):
+    """Text of a (translated) string cell, or None for numbers, formulas and empty cells."""
+    if c is None:
+        return None
+    if c.get("t") == "s":
+        v = c.find(_V)
+        try:
+            return sst_texts[int(v.text)]
+        except (AttributeError, TypeError, ValueError, IndexError):
+            return None
+    if c.get("t") == "inlineStr":
+        inline = c.find(_IS)
+        return _si_text(inline) if inline is not None else None
+    return None
+
+
+def _set_inline_text(c, text):
+    """Turn a cell into an inline-string cell holding text (its style is kept)."""
+    for child in c.findall(_V) + c.findall(_IS):
+        c.remove(child)
+    c.set("t", "inlineStr")
+    inline = etree.SubElement(c, _IS)
+    set_text_preserving_space(etree.SubElement(inline, _T), text)
+
+
+def _column_name(text):
+    """Table column name for a header cell text (Excel stores line breaks as _x000a_)."""
+    return text.replace("\r\n", "\n").replace("\n", "_x000a_")
+
+
+def _sync_table_columns(table, sheet_root, sst_texts):
+    """
+    Rename the tableColumn entries of one table to the translated text of its header cells.
+    Excel repairs a workbook whose column names differ from the header row, and column names
+    must be unique within a table: duplicates get a number suffix, written back to the header cell.
+
+    Returns ({old column name (lower case): new name}, True if header cells were changed).
+    """
+    if table.get("headerRowCount") == "0" or not table.get("ref"):
+        return {}, False
+    first_col, first_row = _split_cell_ref(table.get("ref").split(":")[0])
+    cells = _row_cells(sheet_root, first_row)
+
+    renames = {}
+    cells_changed = False
+    used = set()
+    for offset, column in enumerate(table.iter(_TABLE_COLUMN)):
+        old_name = column.get("name") or ""
+        cell = cells.get(first_col + offset)
+        text = _cell_text(cell, sst_texts)
+        name = _column_name(text) if text and text.strip() else old_name
+        candidate = name
+        counter = 2
+        while candidate.lower() in used:
+            candidate = f"{name}{counter}"
+            counter += 1
+        used.add(candidate.lower())
+
+        if text is not None and _column_name(text) != candidate:
+            _set_inline_text(cell, candidate.replace("_x000a_", "\n"))
+            cells_changed = True
+        if candidate != old_name:
+            column.set("name", candidate)
+            renames[old_name.lower()] = candidate
+    return renames, cells_changed
+
+
+def _rename_in_part(root, sheet_renames, column_renames):
+    """Rewrite the formulas and sheet references of one part. Returns True if anything changed."""
+    changed = False
+    for elm in root.iter(*("{*}" + tag for tag in _FORMULA_TAGS)):
+        new_text = rename_references(elm.text, sheet_renames, column_renames)
+        if new_text != elm.text:
+            elm.text = new_text
+            changed = True
+    for elm in root.iter("{*}hyperlink", "{*}sp"):
+        for attr in _REFERENCE_ATTRS:
+            value = elm.get(attr)
+            new_value = rename_references(value, sheet_renames, column_renames)
+            if new_value != value:
+                elm.set(attr, new_value)
+                changed = True
+    # Pivot cache source: the sheet is named on its own, not as part of a formula
+    for elm in root.iter("{*}worksheetSource"):
+        new_sheet = sheet_renames.get((elm.get("sheet") or "").lower())
+        if new_sheet:
+            elm.set("sheet", new_sheet)
+            changed = True
+    return changed
+
+
+def _update_references(zf, workbook, sst_texts, replacements, renames):
+    """
+    Keep the package consistent with the renamed sheets and translated table headers:
+    table column names follow their header cells, and sheet / structured references are
+    rewritten in workbook.xml (sheet names, definedNames), worksheets (<f> cells, data
+    validation, conditional formatting, hyperlinks), tables, charts, drawings and pivot caches.
+
+    replacements holds parts already rewritten for this output (worksheets with translated
+    inline strings); they are updated from those bytes. Returns {part: bytes} of changed parts.
+    """
+    names = set(zf.namelist())
+    roots = {}
+    changed = set()
+
+    def load(part):
+        if part not in roots:
+            roots[part] = parse_part_bytes(replacements[part]) if part in replacements else parse_part(zf, part)
+        return roots[part]
+
+    column_renames = {}
+    for part in workbook.sheet_parts:
+        if part is None:
+            continue
+        for table_part in read_relationships(zf, part, "table").values():
+            if table_part not in names:
+                continue
+            table = load(table_part)
+            columns, cells_changed = _sync_table_columns(table, load(part), sst_texts)
+            if columns:
+                changed.add(table_part)
+                for key in (table.get("name"), table.get("displayName")):
+                    if key:
+                        column_renames[key.lower()] = columns
+            if cells_changed:
+                changed.add(part)
+
+    sheet_renames = {old.lower(): new for old, new in renames.items()}
+    if sheet_renames or column_renames:
+        wb_root = load(workbook.workbook_part)
+        for sheet in wb_root.iter(_SHEET):
+            if sheet.get("name") in renames:
+                sheet.set("name", renames[sheet.get("name")])
+        for defined_name in wb_root.iter(_DEFINED_NAME):
+            defined_name.text = rename_references(defined_name.text, sheet_renames, column_renames)
+        changed.add(workbook.workbook_part)
+
+        # Only parse the parts that can contain a sheet ('!', pivot source) or structured ('[') reference
+        needles = ([b"!", b"worksheetSource"] if sheet_renames else []) + ([b"["] if column_renames else [])
+        candidates = [part for part in workbook.sheet_parts if part] + sorted(
+            name for name in names
+            if name.startswith(_REFERENCING_PARTS) and name.endswith(".xml") and "/_rels/" not in name
+        )
+        for part in dict.fromkeys(candidates):
+            if part not in roots:
+                if part in replacements:
+                    if not any(needle in replacements[part] for needle in needles):
+                        continue
+                elif not _part_contains(zf, part, needles):
+                    continue
+            if _rename_in_part(load(part), sheet_renames, column_renames):
+                changed.add(part)
+
+    return {part: serialize_part(roots[part]) for part in changed}
+
+
+def write_translated_shared_strings(input_path, output_path, workbook, translations, sheet_renames,
+                                    extra_replacements=None):
+    """
+    Write a translated copy of the workbook.
+
+    Args:
+        input_path (str): Source .xlsx.
+        output_path (str): Destination .xlsx.
+        workbook (SharedStringsWorkbook): Result of read_shared_strings(input_path).
+        translations (list): Translated text for each entry of workbook.texts (same order).
+        sheet_renames (list): List of tuples (original_sheet_name, target_sheet_name).
+        extra_replacements (dict): Other rewritten parts {part_name: bytes} (e.g. worksheets
+            with translated inline strings) merged into the same output package.
+
+    References to renamed sheets are rewritten wherever Excel stores them (formulas, definedNames,
+    charts, pivot caches, hyperlinks), and table column names are synced with their translated
+    header cells, so Excel opens the result without repairing it.
+    The parsed table in workbook is left untouched, so it can be written once per target language.
+    """
+    replacements = dict(extra_replacements or {})
+    sst_texts = list(workbook.texts)
+    if workbook.sst_root is not None:
+        sst_root = copy.deepcopy(workbook.sst_root)
+        for si, original, new_text in zip(sst_root.iter(_SI), workbook.texts, translations):
+            if new_text is not None and new_text != original:
+                _apply_si_translation(si, new_text)
+        replacements[workbook.sst_part] = serialize_part(sst_root)
+        sst_texts = [
+            original if new_text is None else new_text
+            for original, new_text in zip(workbook.texts, translations)
+        ]
+
+    renames = _unique_sheet_names(workbook.sheet_names, sheet_renames)
+    renames = {old: new for old, new in renames.items() if old != new}
+    with zipfile.ZipFile(input_path) as zf:
+        replacements.update(_update_references(zf, workbook, sst_texts, replacements, renames))
+
+        # docProps/app.xml lists sheet titles too; keep it consistent when present
+        if renames and "docProps/app.xml" in zf.namelist():
+            app_root = parse_part(zf, "docProps/app.xml")
+            for titles in app_root.iter(f"{{{EP_NS}}}TitlesOfParts"):
+                for lpstr in titles.iter(f"{{{VT_NS}}}lpstr"):
+                    if lpstr.text in renames:
+                        lpstr.text = renames[lpstr.text]
+            replacements["docProps/app.xml"] = serialize_part(app_root)
+
+    copy_zip_with_replacements(input_path, output_path, replacements)
+    print(f"✅ Translated workbook saved (shared strings) at:\n{output_path}")
+    return output_path
@@ -0,0 +1,143 @@
+# modules/excel_translator/excel_sheets.py
+# Per-sheet path for .xlsx packages whose cells store text inline (t="inlineStr"),
+# as written by openpyxl and many export tools.
+# Each worksheet XML is scanned in its own worker process, the inline strings of every
+# sheet are translated in the same batch as the shared strings and sheet names, and the
+# rewritten worksheets are merged into a single output package at the zip level.
+
+import multiprocessing
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+from lxml import etree
+
+from core.ooxml import parse_part, serialize_part
+from modules.excel_translator.excel_shared_strings import SSML_NS, _si_text, _apply_si_translation
+
+_ROW = f"{{{SSML_NS}}}row"
+_C = f"{{{SSML_NS}}}c"
+_F = f"{{{SSML_NS}}}f"
+_IS = f"{{{SSML_NS}}}is"
+
+
+def _column_index(ref):
+    """'AB12' -> 28"""
+    index = 0
+    for ch in ref:
+        if not ch.isalpha():
+            break
+        index = index * 26 + (ord(ch.upper()) - ord("A") + 1)
+    return index
+
+
+def _column_letter(index):
+    """28 -> 'AB'"""
+    letters = ""
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(ord("A") + rem) + letters
+    return letters
+
+
+def _iter_inline_cells(rows):
+    """
+    Yield (coord, <is> element, text) for every non-empty inline-string cell of the given <row>s.
+    Formula cells are skipped. Coordinates missing from the XML (the r attributes are optional)
+    are derived from the row/cell position, as Excel does.
+    """
+    row_index = 0
+    for row in rows:
+        row_ref = row.get("r")
+        row_index = int(row_ref) if row_ref else row_index + 1
+        col_index = 0
+        for c in row.iterchildren(_C):
+            ref = c.get("r")
+            col_index = _column_index(ref) if ref else col_index + 1
+            if c.get("t") != "inlineStr" or c.find(_F) is not None:
+                continue
+            inline = c.find(_IS)
+            if inline is None:
+                continue
+            text = _si_text(inline)
+            if text.strip():
+                yield ref or f"{_column_letter(col_index)}{row_index}", inline, text
+
+
+def _stream_rows(f):
+    """iterparse <row> elements, freeing each one once the consumer has moved on (flat memory)."""
+    for _, row in etree.iterparse(f, events=("end",), tag=_ROW, huge_tree=True):
+        yield row
+        row.clear()
+        while row.getprevious() is not None:
+            del row.getparent()[0]
+
+
+def _extract_sheet(input_path, part):
+    """Worker: [(coord, text), ...] of one worksheet's inline strings."""
+    with zipfile.ZipFile(input_path) as zf, zf.open(part) as f:
+        return [(coord, text) for coord, _, text in _iter_inline_cells(_stream_rows(f))]
+
+
+def _rewrite_sheet(input_path, part, translations):
+    """Worker: serialized worksheet with translations {coord: text} applied to its inline strings."""
+    with zipfile.ZipFile(input_path) as zf:
+        root = parse_part(zf, part)
+    for coord, inline, _ in _iter_inline_cells(root.iter(_ROW)):
+        new_text = translations.get(coord)
+        if new_text is not None:
+            _apply_si_translation(inline, new_text)
+    return serialize_part(root)
+
+
+def sheet_workers(input_path, parts, max_workers=0, min_bytes=0):
+    """
+    Number of worker processes to use for the given worksheet parts (0 = run in this process).
+    A pool only pays off with several sheets whose XML is large enough to outweigh process start-up.
+    max_workers 0 means one per CPU core.
+    """
+    if len(parts) < 2 or max_workers == 1:
+        return 0
+    with zipfile.ZipFile(input_path) as zf:
+        total = sum(zf.getinfo(part).file_size for part in parts)
+    if total < min_bytes:
+        return 0
+    workers = min(len(parts), max_workers or os.cpu_count() or 1)
+    return workers if workers > 1 else 0
+
+
+def _map_sheets(fn, workers, input_path, parts, *columns):
+    """
+    Yields fn(input_path, part, *column values) for each part, in order.
+    With workers > 0 every sheet is submitted to a process pool up front and results are
+    yielded as soon as the next sheet in order is done, so the caller can start on the
+    first sheets while later ones are still being processed.
+    Workers are started with "spawn": this runs inside job worker threads next to the translation
+    executor and SQLite connections, and forking a multithreaded process can deadlock on locks
+    held by those threads. fn must therefore be importable at module level.
+    """
+    args = ([input_path] * len(parts), parts) + columns
+    if not workers:
+        yield from map(fn, *args)
+        return
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        yield from pool.map(fn, *args)
+
+
+def extract_inline_cells(input_path, parts, workers=0):
+    """Yields [(coord, text), ...] for each worksheet part, in the order of parts."""
+    return _map_sheets(_extract_sheet, workers, input_path, parts)
+
+
+def rewrite_inline_cells(input_path, sheet_translations, workers=0):
+    """
+    Apply translations to the inline strings of several worksheets.
+
+    Args:
+        sheet_translations (dict): {worksheet part: {coord: translated text}}.
+    Returns:
+        dict: {worksheet part: new XML bytes}, ready for copy_zip_with_replacements.
+    """
+    parts = list(sheet_translations)
+    translations = [sheet_translations[part] for part in parts]
+    return dict(zip(parts, _map_sheets(_rewrite_sheet, workers, input_path, parts, translations)))
@@ -1,50 +1,162 @@
 # modules/excel_translator/excel_translator.py
-# Main Excel translation workflow (writes via Excel COM to preserve shapes)
+# Main Excel translation workflow.
+# Prefers the shared-strings fast path (zip-level rewrite, keeps shapes without COM),
+# extended per sheet to workbooks with inline strings;
+# otherwise writes via Excel COM to preserve shapes, falling back to openpyxl.
+# Cells are streamed to translation as they are read (core.pipeline); sheet names join the same stream.
 
 import os
-from config.settings import OUTPUT_DIR
-from modules.excel_translator.excel_reader import read_excel_for_translation
-from modules.excel_translator.excel_writer import write_translated_excel_preserve_format
+from itertools import chain
+
+from config.settings import (
+    OUTPUT_DIR, EXCEL_SHARED_STRINGS_FAST_PATH, EXCEL_INLINE_STRINGS_ZIP,
+    EXCEL_SHEET_WORKERS, EXCEL_SHEET_PARALLEL_MIN_BYTES,
+)
+from modules.excel_translator.excel_reader import iter_excel_segments, read_excel_sheet_names
+from modules.excel_translator.excel_writer import write_translated_excel_preserve_format, make_excel_output_path
+from modules.excel_translator.excel_shared_strings import read_shared_strings, write_translated_shared_strings
+from modules.excel_translator.excel_sheets import sheet_workers, extract_inline_cells, rewrite_inline_cells
+from core.manifest import location_key, content_key
+from core.metrics import stage
+from core.pipeline import translate_stream
+from core.files import current_output_dir
 
 class ExcelTranslator:
     def __init__(self, translator):
         self.translator = translator
 
-    def process(self, input_path, direction="en->ja"):
+    def process(self, input_path, direction="en->ja", manifest=None):
         """
         Translate Excel text (cells + sheet names) while preserving layout, formatting, and images.
         Shapes, text boxes, and arrows are retained but not translated (preserved as-is).
         Uses Excel COM to write the final file so shapes/textboxes are not lost.
+
+        For .xlsx packages whose text lives in xl/sharedStrings.xml, each unique shared
+        string is translated once and written back at the zip level instead. Sheets that
+        store their text inline are extracted and rewritten per sheet (in worker processes
+        for large workbooks) and merged into the same output.
+
+        manifest (SegmentManifest, optional) enables incremental re-translation:
+        cells keyed by (sheet, coord) and shared strings keyed by their text that did not
+        change since the last run are reused.
+        """
+        return self.process_targets(input_path, [direction], {direction: manifest})[direction]
+
+    def process_targets(self, input_path, directions, manifests=None):
+        """
+        Translate the workbook into several directions at once and return {direction: output_path}.
+        Cells are read once; every direction's translations are fetched concurrently and
+        one workbook is written per direction.
+        manifests maps a direction to its SegmentManifest (optional).
+        """
+        if EXCEL_SHARED_STRINGS_FAST_PATH and os.path.splitext(input_path)[1].lower() == ".xlsx":
+            with stage("xlsx", "read"):
+                workbook = read_shared_strings(input_path, allow_inline_strings=EXCEL_INLINE_STRINGS_ZIP)
+            if workbook is not None:
+                return self._process_shared_strings(input_path, workbook, directions, manifests)
+
+        # Step 1: Stream text cells out of the workbook (openpyxl read-only mode)
+        # and translate them, together with the sheet names, while the remaining rows are read
+        with stage("xlsx", "read"):
+            sheet_titles = read_excel_sheet_names(input_path)
+        segments = (
+            (location_key(sheet_name, coord), text, (sheet_name, coord))
+            for sheet_name, coord, text in iter_excel_segments(input_path)
+        )
+        with stage("xlsx", "stream"):
+            translations, sheet_renames = self._translate_stream(segments, sheet_titles, directions, manifests)
+
+        # Step 2: Write translated text and apply sheet renames using Excel COM
+        outputs = {}
+        for direction in directions:
+            translated_results = [
+                (sheet_name, coord, translated_text)
+                for (sheet_name, coord), translated_text in translations[direction]
+            ]
+            with stage("xlsx", "write"), self.translator.output_label_for(direction, directions):
+                outputs[direction] = write_translated_excel_preserve_format(
+                    input_path, translated_results, sheet_renames[direction], current_output_dir(OUTPUT_DIR)
+                )
+
+        return outputs
+
+    def _process_shared_strings(self, input_path, workbook, directions, manifests=None):
+        """
+        Translate every shared string once and rewrite only the affected zip parts.
+        Inline strings of the sheets listed in workbook.inline_sheets are extracted per sheet,
+        translated in the same stream and written back into those worksheet parts.
         """
-        # Step 1: Read workbook and collect text cells (using openpyxl)
-        wb, cells_to_translate = read_excel_for_translation(input_path)
-        translated_results = []
-
-        # Step 2: Translate all cell values (collect translations)
-        for sheet_name, coord, text in cells_to_translate:
-            try:
-                translated_text = self.translator.translate_text(text, direction=direction)
-            except Exception:
-                translated_text = text  # fallback to original text
-            translated_results.append((sheet_name, coord, translated_text))
-
-        # Step 3: Build sheet rename mapping (old_name -> new_name)
-        sheet_renames = []
-        for sheet in wb.worksheets:
-            try:
-                translated_name = self.translator.translate_text(sheet.title, direction=direction)
-                safe_name = translated_name.strip()[:31]  # Excel limit
+        inline_parts = [workbook.sheet_parts[i] for i in workbook.inline_sheets]
+        workers = sheet_workers(input_path, inline_parts, EXCEL_SHEET_WORKERS, EXCEL_SHEET_PARALLEL_MIN_BYTES)
+
+        def segments():
+            # Shared strings have no cell of their own: key them by their text so that strings
+            # inserted into the table (which shifts every later index) do not invalidate the manifest
+            for text in workbook.texts:
+                yield content_key("sst", text), text, None
+            # Shared strings are already being translated while the sheets are extracted
+            sheets = extract_inline_cells(input_path, inline_parts, workers)
+            for i, part, cells in zip(workbook.inline_sheets, inline_parts, sheets):
+                for coord, text in cells:
+                    yield location_key(workbook.sheet_names[i], coord), text, (part, coord, text)
+
+        with stage("xlsx", "stream"):
+            translations, sheet_renames = self._translate_stream(
+                segments(), workbook.sheet_names, directions, manifests
+            )
+
+        output_dir = current_output_dir(OUTPUT_DIR)
+        os.makedirs(output_dir, exist_ok=True)
+        outputs = {}
+        for direction in directions:
+            translated = translations[direction]
+            sst_translations = [new_text for _, new_text in translated[:len(workbook.texts)]]
+            sheet_translations = {}
+            for (part, coord, text), new_text in translated[len(workbook.texts):]:
+                if new_text is not None and new_text != text:
+                    sheet_translations.setdefault(part, {})[coord] = new_text
+
+            with stage("xlsx", "write"), self.translator.output_label_for(direction, directions):
+                sheets = rewrite_inline_cells(input_path, sheet_translations, workers)
+                output_path = make_excel_output_path(input_path, output_dir)
+                outputs[direction] = write_translated_shared_strings(
+                    input_path, output_path, workbook, sst_translations, sheet_renames[direction],
+                    extra_replacements=sheets,
+                )
+        return outputs
+
+    def _translate_stream(self, segments, sheet_titles, directions, manifests=None):
+        """
+        Translate (key, text, item) segments as they are produced, followed by the sheet titles.
+        Sheet titles skip the prefilter: names such as "Sheet1" or "Summary" look like IDs or
+        target-language text to it, but were always translated (and the sheets renamed).
+        Returns ({direction: [(item, translation), ...]} in input order,
+        {direction: [(old_name, new_name), ...]}); sheets whose translated name is empty are not renamed.
+        """
+        results = {direction: [] for direction in directions}
+
+        def apply(item, translated):
+            for direction in directions:
+                results[direction].append((item, translated[direction]))
+
+        title_keys = {location_key("sheet", i) for i in range(len(sheet_titles))}
+        titles = ((location_key("sheet", i), title, title) for i, title in enumerate(sheet_titles))
+        translate_stream(
+            self.translator, chain(segments, titles), directions, apply, manifests, name="xlsx",
+            exempt=title_keys.__contains__,
+        )
+
+        renames = {}
+        for direction, translated in results.items():
+            split = len(translated) - len(sheet_titles)
+            translated_titles = translated[split:]
+            del translated[split:]
+            sheet_renames = []
+            for title, translated_name in translated_titles:
+                safe_name = (translated_name or "").strip()[:31]  # Excel limit
                 if not safe_name:
                     continue
                 # If duplicate among targets, append suffix (we will ensure uniqueness)
-                sheet_renames.append((sheet.title, safe_name))
-            except Exception:
-                # skip rename if translation fails
-                continue
-
-        # Step 4: Write translated text and apply sheet renames using Excel COM
-        output_path = write_translated_excel_preserve_format(
-            input_path, translated_results, sheet_renames, OUTPUT_DIR
-        )
-
-        return output_path
+                sheet_renames.append((title, safe_name))
+            renames[direction] = sheet_renames
+        return results, renames
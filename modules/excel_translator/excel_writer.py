@@ -6,6 +6,14 @@ import os
 import time
 from datetime import datetime
 
+from core.files import output_suffix
+
+def make_excel_output_path(input_path, output_dir):
+    """Builds '<name>_translated[_<lang>]_<timestamp>.xlsx' inside output_dir."""
+    base_name = os.path.splitext(os.path.basename(input_path))[0]
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return os.path.join(output_dir, f"{base_name}_translated{output_suffix()}_{timestamp}.xlsx")
+
 def write_translated_excel_preserve_format(input_path, translations, sheet_renames, output_dir, retry_attempts=3, retry_delay=2):
     """
     Writes translated text back to Excel, preserving formatting when possible (via COM).
@@ -21,90 +29,97 @@ def write_translated_excel_preserve_format(input_path, translations, sheet_renam
     Returns:
         str: Path to the saved translated Excel file.
     """
-    base_name = os.path.splitext(os.path.basename(input_path))[0]
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_path = os.path.join(output_dir, f"{base_name}_translated_{timestamp}.xlsx")
+    output_path = make_excel_output_path(input_path, output_dir)
 
     os.makedirs(output_dir, exist_ok=True)
 
     # --- Try Excel COM first ---
     try:
         import win32com.client as win32
-        excel = None
-        wb = None
-
+        import pythoncom
+        # Background job threads must initialize COM before dispatching Excel
+        # and release it again on the same thread, even when the COM work fails
+        pythoncom.CoInitialize()
         try:
-            excel = win32.gencache.EnsureDispatch("Excel.Application")
-        except Exception:
-            excel = win32.Dispatch("Excel.Application")  # fallback if cache broken
-
-        excel.DisplayAlerts = False
-        excel.Visible = False
+            excel = None
+            wb = None
 
-        # --- Retry logic for locked files ---
-        for attempt in range(retry_attempts):
             try:
-                wb = excel.Workbooks.Open(os.path.abspath(input_path), ReadOnly=False)
-                break
+                excel = win32.gencache.EnsureDispatch("Excel.Application")
             except Exception:
-                if attempt < retry_attempts - 1:
-                    print(f"⚠️ File locked or in use, retrying in {retry_delay}s...")
-                    time.sleep(retry_delay)
-                else:
-                    print("⚠️ File is locked — opening as read-only.")
-                    wb = excel.Workbooks.Open(os.path.abspath(input_path), ReadOnly=True)
-                    break
+                excel = win32.Dispatch("Excel.Application")  # fallback if cache broken
 
-        if wb is None:
-            raise RuntimeError("Failed to open workbook after multiple attempts.")
+            excel.DisplayAlerts = False
+            excel.Visible = False
 
-        # --- Write translations ---
-        for sheet_name, cell_coord, translated_text in translations:
-            try:
-                ws = wb.Worksheets(sheet_name)
+            # --- Retry logic for locked files ---
+            for attempt in range(retry_attempts):
+                try:
+                    wb = excel.Workbooks.Open(os.path.abspath(input_path), ReadOnly=False)
+                    break
+                except Exception:
+                    if attempt < retry_attempts - 1:
+                        print(f"⚠️ File locked or in use, retrying in {retry_delay}s...")
+                        time.sleep(retry_delay)
+                    else:
+                        print("⚠️ File is locked — opening as read-only.")
+                        wb = excel.Workbooks.Open(os.path.abspath(input_path), ReadOnly=True)
+                        break
+
+            if wb is None:
+                raise RuntimeError("Failed to open workbook after multiple attempts.")
+
+            # --- Write translations ---
+            for sheet_name, cell_coord, translated_text in translations:
+                try:
+                    ws = wb.Worksheets(sheet_name)
 
-                # Unprotect if necessary
-                if ws.ProtectContents:
-                    try:
-                        ws.Unprotect(Password="")
-                    except Exception:
-                        pass
+                    # Unprotect if necessary
+                    if ws.ProtectContents:
+                        try:
+                            ws.Unprotect(Password="")
+                        except Exception:
+                            pass
 
-                ws.Range(cell_coord).Value = translated_text
-            except Exception:
-                continue  # skip invalid sheet/cell
+                    ws.Range(cell_coord).Value = translated_text
+                except Exception:
+                    continue  # skip invalid sheet/cell
 
-        # --- Rename sheets safely ---
-        used_names = set()
-        for orig_name, target_name in sheet_renames:
-            try:
-                ws = wb.Worksheets(orig_name)
-                if ws.ProtectContents:
-                    try:
-                        ws.Unprotect(Password="")
-                    except Exception:
-                        pass
-
-                candidate = target_name
-                counter = 1
-                while candidate in used_names:
-                    candidate = f"{target_name}_{counter}"
-                    counter += 1
-                used_names.add(candidate)
-
-                ws.Name = candidate
-            except Exception:
-                continue
+            # --- Rename sheets safely ---
+            used_names = set()
+            for orig_name, target_name in sheet_renames:
+                try:
+                    ws = wb.Worksheets(orig_name)
+                    if ws.ProtectContents:
+                        try:
+                            ws.Unprotect(Password="")
+                        except Exception:
+                            pass
+
+                    candidate = target_name
+                    counter = 1
+                    while candidate in used_names:
+                        candidate = f"{target_name}_{counter}"
+                        counter += 1
+                    used_names.add(candidate)
+
+                    ws.Name = candidate
+                except Exception:
+                    continue
 
-        # --- Save as new translated file ---
-        wb.SaveAs(os.path.abspath(output_path), FileFormat=51)  # 51 = .xlsx
-        print(f"✅ Translated workbook saved at:\n{output_path}")
+            # --- Save as new translated file ---
+            wb.SaveAs(os.path.abspath(output_path), FileFormat=51)  # 51 = .xlsx
+            print(f"✅ Translated workbook saved at:\n{output_path}")
 
-        # --- Cleanup ---
-        wb.Close(SaveChanges=False)
-        excel.Quit()
+            # --- Cleanup ---
+            wb.Close(SaveChanges=False)
+            excel.Quit()
 
-        return output_path
+            return output_path
+        finally:
+            # Drop the COM proxies before uninitializing so they are not released afterwards
+            ws = wb = excel = None
+            pythoncom.CoUninitialize()
 
     except Exception as com_exc:
         print("⚠️ Excel COM operation failed — falling back to openpyxl...")
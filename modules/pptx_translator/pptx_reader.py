@@ -1,41 +1,103 @@
 # modules/pptx_translator/pptx_reader.py
 # Extract structured text from PPTX: returns per-slide list of shape paths and texts.
-# Works recursively for grouped shapes and keeps images list (unchanged).
+# Works recursively for grouped shapes. Images are only collected on request, as lazy
+# handles that keep a reference to the embedded blob and decode it on demand.
 
 from pptx import Presentation
-from PIL import Image
 from io import BytesIO
 
 PICTURE_TYPE = 13
 
-def _extract_from_shape(shape, path_prefix=()):
+class LazyImage:
     """
-    Return list of (path, text) for the given shape.
-    path is a tuple of indices that identifies a nested shape inside the slide.
+    Reference to a picture embedded in the deck. Nothing is decoded until open() is called.
+    """
+    def __init__(self, image):
+        self._image = image  # pptx.parts.image.Image (blob is shared with the package, not copied)
+
+    @property
+    def blob(self):
+        return self._image.blob
+
+    @property
+    def content_type(self):
+        return self._image.content_type
+
+    @property
+    def filename(self):
+        return self._image.filename
+
+    def open(self):
+        """Decode the picture into a PIL image (loaded fully, independent of the blob)."""
+        from PIL import Image
+        pil = Image.open(BytesIO(self._image.blob))
+        pil.load()
+        return pil
+
+def _extract_handles_from_shape(shape, path_prefix=()):
+    """
+    Return list of (path, shape, text) for the given shape.
+    path is a tuple of indices that identifies a nested shape inside the slide;
+    shape is the python-pptx shape itself, so callers can write back without re-resolving the path.
+    Table cells are returned one by one, with the cell as the handle (it has a text_frame too).
     """
     items = []
     # If shape has a text_frame and non-empty text, capture it
     if hasattr(shape, "text_frame") and shape.text_frame is not None:
         text = shape.text_frame.text or ""
         if text.strip():
-            items.append((path_prefix, text))
+            items.append((path_prefix, shape, text))
+
+    # If table, capture each cell; the path ends in (row, col) below the graphic frame
+    if getattr(shape, "has_table", False):
+        for r_idx, row in enumerate(shape.table.rows):
+            for c_idx, cell in enumerate(row.cells):
+                text = cell.text_frame.text or ""
+                # Cells covered by a merge keep no text of their own
+                if text.strip() and not cell.is_spanned:
+                    items.append((path_prefix + (r_idx, c_idx), cell, text))
 
     # If grouped shape, iterate children
     if hasattr(shape, "shapes"):
         for idx, child in enumerate(shape.shapes):
-            items.extend(_extract_from_shape(child, path_prefix + (idx,)))
+            items.extend(_extract_handles_from_shape(child, path_prefix + (idx,)))
     return items
 
-def read_pptx(path):
+def _extract_from_shape(shape, path_prefix=()):
+    """
+    Return list of (path, text) for the given shape.
+    path is a tuple of indices that identifies a nested shape inside the slide.
+    """
+    return [(path, text) for path, _, text in _extract_handles_from_shape(shape, path_prefix)]
+
+def iter_text_shapes(prs):
+    """
+    Single-pass extraction from an already opened Presentation.
+    Yields (slide, path, shape, text) in slide order; the slide and shape handles stay
+    valid for writing back into the same Presentation object, so callers may write a
+    shape's text while the iteration continues.
+    """
+    for slide in prs.slides:
+        for top_index, shape in enumerate(slide.shapes):
+            for path, handle, text in _extract_handles_from_shape(shape, (top_index,)):
+                yield slide, path, handle, text
+
+def extract_text_shapes(prs):
+    """Returns list(iter_text_shapes(prs)): [(slide, path, shape, text), ...]."""
+    return list(iter_text_shapes(prs))
+
+def read_pptx(path, include_images=False):
     """
     Returns:
       slides: [
         {
           'shape_texts': [ ((i1,i2,...), "original text"), ... ],
-          'images': [PIL.Image, ...]
+          'images': [LazyImage, ...]   # empty unless include_images=True
         }, ...
       ]
     The paths are relative to slide.shapes - to resolve a top-level shape, use index tuple (k,).
+    The translate path only needs text, so images are skipped by default; pass
+    include_images=True to get LazyImage handles (call .open() to decode one).
     """
     prs = Presentation(path)
     slides = []
@@ -50,13 +112,10 @@ def read_pptx(path):
             items = _extract_from_shape(shape, (top_index,))
             shape_texts.extend(items)
 
-            # images (keep as before)
-            if getattr(shape, "shape_type", None) == PICTURE_TYPE:
+            # images (lazy handles only; decoding is left to the consumer)
+            if include_images and getattr(shape, "shape_type", None) == PICTURE_TYPE:
                 try:
-                    img = shape.image
-                    bio = BytesIO(img.blob)
-                    pil = Image.open(bio)
-                    images.append(pil.copy())
+                    images.append(LazyImage(shape.image))
                 except Exception:
                     pass
 
@@ -0,0 +1,84 @@
+# modules/pptx_translator/pptx_segments.py
+# Run-aware segmentation for PPTX text frames.
+# Runs with different formatting (bold/italic/color/hyperlink in a:rPr) are wrapped in inline
+# placeholders so the whole shape still goes out as one segment, and the translated spans are
+# mapped back onto runs with the matching formatting.
+
+from lxml import etree
+
+from core.ooxml import escape_ctrl_chars
+from core.segmenter import segment_runs, parse_tagged, rebuild_runs, strip_tags
+from .pptx_writer import apply_text_to_text_frame, _replace_paragraph_text_preserve_format
+from .pptx_zip_writer import A_NS
+
+_R = f"{{{A_NS}}}r"
+_T = f"{{{A_NS}}}t"
+_RPR = f"{{{A_NS}}}rPr"
+_BR = f"{{{A_NS}}}br"
+_FLD = f"{{{A_NS}}}fld"
+
+
+def _run_key(r):
+    rpr = r.find(_RPR)
+    return etree.tostring(rpr) if rpr is not None else b""
+
+
+def _run_text(r):
+    t = r.find(_T)
+    return (t.text or "") if t is not None else ""
+
+
+def _set_run_text(r, text):
+    t = r.find(_T)
+    if t is None:
+        t = r.makeelement(_T, {})
+        r.append(t)
+    t.text = escape_ctrl_chars(text)
+
+
+def encode_text_frame(tf):
+    """
+    Returns (text, layouts) for a text frame. text is tf.text with inline placeholders around
+    differently formatted runs; layouts has one RunLayout (or None) per paragraph.
+    Paragraphs with line breaks or fields are left untagged.
+    """
+    lines = []
+    layouts = []
+    next_id = 1
+    for para in tf.paragraphs:
+        p = para._p
+        runs = p.findall(_R)
+        layout = None
+        if runs and p.find(_BR) is None and p.find(_FLD) is None:
+            text, layout = segment_runs(runs, _run_key, _run_text, next_id)
+            if layout is not None:
+                next_id += len(layout.templates)
+        else:
+            text = para.text
+        lines.append(text)
+        layouts.append(layout)
+    return "\n".join(lines), layouts
+
+
+def apply_segmented_text(tf, new_text, layouts):
+    """
+    Write a translation produced from encode_text_frame back into the text frame.
+    Falls back to apply_text_to_text_frame (first-run strategy) when placeholders are not
+    used or the paragraph structure did not survive translation.
+    """
+    if not any(layouts):
+        apply_text_to_text_frame(tf, new_text)
+        return
+
+    lines = new_text.split("\n")
+    paragraphs = tf.paragraphs
+    if len(lines) != len(paragraphs):
+        apply_text_to_text_frame(tf, strip_tags(new_text))
+        return
+
+    for para, line, layout in zip(paragraphs, lines, layouts):
+        spans = parse_tagged(line, layout.ids) if layout is not None else None
+        if spans:
+            rebuild_runs(layout, spans, _set_run_text)
+        else:
+            _replace_paragraph_text_preserve_format(para, strip_tags(line))
@@ -1,38 +1,158 @@
 # modules/pptx_translator/pptx_translator.py
-# Translate each shape's text individually and keep mapping for writer.
+# Translate all shapes' text in batched requests and keep mapping for writer.
+# Default is a single-pass pipeline: parse once, keep shape handles, write back through them.
+# Shapes are streamed to translation as they are found (core.pipeline) and written back chunk by chunk.
 
-from .pptx_reader import read_pptx
-from .pptx_writer import write_pptx_from_template
+from pptx import Presentation
+
+from .pptx_reader import read_pptx, iter_text_shapes, extract_text_shapes
+from .pptx_writer import write_pptx_from_template, apply_text_to_text_frame
+from .pptx_zip_writer import write_pptx_zip, write_pptx_parts
+from .pptx_segments import encode_text_frame, apply_segmented_text
+from config.settings import PPTX_WRITER, PPTX_SINGLE_PASS, RUN_AWARE_SEGMENTATION
 from core.translate_text_google import Translator as HighLevelTranslator
+from core.manifest import location_key
+from core.metrics import stage
+from core.pipeline import translate_stream
 
 class PPTXTranslator:
     def __init__(self, high_level_translator: HighLevelTranslator):
         self.hl = high_level_translator
 
-    def process(self, src_path, direction='en->ja'):
+    def process(self, src_path, direction='en->ja', manifest=None):
+        """
+        Translate every text-containing shape through one batched call.
+        With PPTX_SINGLE_PASS the deck is parsed once, shapes are sent for translation
+        while the remaining slides are still being walked, and results are written back
+        through the extracted shape handles as they arrive; otherwise the reader provides shape paths so the
+        writer can replace text in-place after re-opening the file.
+
+        With a manifest (SegmentManifest), shapes keyed by slide and shape path that did
+        not change since the last run reuse their previous translation.
+        """
+        return self.process_targets(src_path, [direction], {direction: manifest})[direction]
+
+    def process_targets(self, src_path, directions, manifests=None):
         """
-        Translate each text-containing shape individually.
-        The reader provides shape paths so writer can replace text in-place.
+        Translate the deck into several directions at once and return {direction: out_path}.
+        Shapes are read and segmented once; every direction's translations are fetched
+        concurrently and one output is written per direction.
+        manifests maps a direction to its SegmentManifest (optional).
         """
-        slides = read_pptx(src_path)
-        translated_slides = []
+        if PPTX_SINGLE_PASS:
+            return self._process_single_pass(src_path, directions, manifests)
+        return self._process_two_pass(src_path, directions, manifests)
 
-        for slide in slides:
-            shape_texts = slide.get("shape_texts", [])
-            translated_shape_texts = []
+    def _encode(self, shape, text):
+        """Text to send and its run layouts (run-aware mode wraps differently formatted runs in inline placeholders)."""
+        if RUN_AWARE_SEGMENTATION:
+            return encode_text_frame(shape.text_frame)
+        return text, None
+
+    def _read_single_pass(self, src_path):
+        """Parse the deck and return (prs, items, encoded) for writing through shape handles."""
+        prs = Presentation(src_path)
+        items = extract_text_shapes(prs)
+        encoded = [self._encode(shape, text) for _, _, shape, text in items]
+        return prs, items, encoded
+
+    def _apply(self, shape, layouts, new_text, touched_slides, slide):
+        try:
+            if layouts is not None:
+                apply_segmented_text(shape.text_frame, new_text, layouts)
+            else:
+                apply_text_to_text_frame(shape.text_frame, new_text)
+        except Exception:
+            # If anything fails for a shape, skip it to avoid crashing translation for entire deck.
+            return
+        if not touched_slides or touched_slides[-1] is not slide:
+            touched_slides.append(slide)
+
+    def _process_single_pass(self, src_path, directions, manifests=None):
+        """
+        Parse once and stream shapes to translation; the first direction is applied through
+        the shape handles chunk by chunk as translations arrive. Later directions keep their
+        translations and re-open the deck for writing, since each output is a separate document.
+        """
+        first, rest = directions[0], directions[1:]
+        later = {direction: [] for direction in rest}
+        touched_slides = []
 
-            for path, text in shape_texts:
-                try:
-                    tr = self.hl.translate_text(text, direction)
-                except Exception:
-                    tr = text  # fallback
-                translated_shape_texts.append((path, tr))
+        with stage("pptx", "read"):
+            prs = Presentation(src_path)
 
-            translated_slides.append({
-                "translated_shape_texts": translated_shape_texts,
-                "images": slide.get("images", [])
-            })
+        def segments():
+            for slide, path, shape, text in iter_text_shapes(prs):
+                encoded, layouts = self._encode(shape, text)
+                # slide_id stays stable when slides are inserted or reordered
+                yield location_key(f"slide{slide.slide_id}", *path), encoded, (slide, shape, layouts)
 
+        def apply(item, translated):
+            slide, shape, layouts = item
+            self._apply(shape, layouts, translated[first], touched_slides, slide)
+            for direction in rest:
+                later[direction].append(translated[direction])
+
+        with stage("pptx", "stream"):
+            translate_stream(self.hl, segments(), directions, apply, manifests, name="pptx")
+
+        outputs = {}
+        with stage("pptx", "write"), self.hl.output_label_for(first, directions):
+            outputs[first] = self._save_single_pass(src_path, prs, touched_slides)
+
+        for direction in rest:
+            with stage("pptx", "read"):
+                prs, items, encoded = self._read_single_pass(src_path)
+            with stage("pptx", "write"), self.hl.output_label_for(direction, directions):
+                outputs[direction] = self._write_single_pass(src_path, prs, items, encoded, later[direction])
+        return outputs
+
+    def _write_single_pass(self, src_path, prs, items, encoded, translated):
+        touched_slides = []
+        for (slide, _, shape, _), (_, layouts), new_text in zip(items, encoded, translated):
+            self._apply(shape, layouts, new_text, touched_slides, slide)
+        return self._save_single_pass(src_path, prs, touched_slides)
+
+    def _save_single_pass(self, src_path, prs, touched_slides):
         out_path = self.hl._make_output_path(src_path)
-        write_pptx_from_template(src_path, out_path, translated_slides)
+        if PPTX_WRITER == "zip":
+            write_pptx_parts(src_path, out_path, [slide.part for slide in touched_slides])
+        else:
+            prs.save(out_path)
         return out_path
+
+    def _process_two_pass(self, src_path, directions, manifests=None):
+        """Read with read_pptx, then re-open the template in the writer (paths resolved again)."""
+        with stage("pptx", "read"):
+            slides = read_pptx(src_path)
+
+        # Flatten every shape text across slides so they go out in batched requests
+        texts = [text for slide in slides for _, text in slide.get("shape_texts", [])]
+        keys = [
+            location_key(f"slide{slide_idx}", *path)
+            for slide_idx, slide in enumerate(slides)
+            for path, _ in slide.get("shape_texts", [])
+        ]
+        with stage("pptx", "translate"):
+            translations = self.hl.translate_batch_targets(texts, directions, keys=keys, manifests=manifests)
+
+        outputs = {}
+        for direction in directions:
+            translated = iter(translations[direction])
+            translated_slides = []
+            for slide in slides:
+                translated_shape_texts = [
+                    (path, next(translated)) for path, _ in slide.get("shape_texts", [])
+                ]
+                translated_slides.append({
+                    "translated_shape_texts": translated_shape_texts,
+                })
+
+            with stage("pptx", "write"), self.hl.output_label_for(direction, directions):
+                out_path = self.hl._make_output_path(src_path)
+                if PPTX_WRITER == "zip":
+                    write_pptx_zip(src_path, out_path, translated_slides)
+                else:
+                    write_pptx_from_template(src_path, out_path, translated_slides)
+            outputs[direction] = out_path
+        return outputs
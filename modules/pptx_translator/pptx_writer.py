@@ -7,15 +7,19 @@ def _get_shape_by_path(slide, path):
     """
     Resolve a nested shape by path tuple.
     Example: path (2,0,3) => slide.shapes[2].shapes[0].shapes[3]
+    A path ending in (row, col) below a table resolves to the cell: (1,2,0) => slide.shapes[1].table.cell(2,0)
     """
     if not path:
         return None
     shape = slide.shapes[path[0]]
-    for idx in path[1:]:
+    rest = path[1:]
+    while rest:
+        if getattr(shape, "has_table", False) and len(rest) == 2:
+            return shape.table.cell(*rest)
         # some shapes may not have .shapes; guard for safety
         if not hasattr(shape, "shapes"):
             return None
-        shape = shape.shapes[idx]
+        shape, rest = shape.shapes[rest[0]], rest[1:]
     return shape
 
 def _replace_paragraph_text_preserve_format(para, new_text):
@@ -36,14 +40,37 @@ def _replace_paragraph_text_preserve_format(para, new_text):
     else:
         para.text = new_text
 
+def apply_text_to_text_frame(tf, new_text):
+    """
+    Replace the text of a text frame, mapping translated lines onto its paragraphs.
+    If the original paragraph count > 1, we preserve that structure.
+    """
+    # Iterate paragraphs and replace text sequentially.
+    # We'll split new_text into lines and map line-wise to paragraphs.
+    new_lines = new_text.splitlines() or [new_text]
+    line_index = 0
+
+    for p in tf.paragraphs:
+        if line_index < len(new_lines):
+            _replace_paragraph_text_preserve_format(p, new_lines[line_index])
+            line_index += 1
+        else:
+            # No more translated lines: clear remaining paragraph text
+            _replace_paragraph_text_preserve_format(p, "")
+    # If there are still extra lines (more translated lines than paragraphs),
+    # append them to the last paragraph (preserve its formatting).
+    if line_index < len(new_lines):
+        remaining = "\n".join(new_lines[line_index:])
+        last_para = tf.paragraphs[-1]
+        _replace_paragraph_text_preserve_format(last_para, last_para.text + ("\n" + remaining if last_para.text else remaining))
+
 def write_pptx_from_template(src_path, dest_path, translated_slides):
     """
     src_path: original pptx (template)
     dest_path: destination file to save
     translated_slides: list aligned by slide index:
       {
-        "translated_shape_texts": [ ((i1,i2,...), "translated text"), ... ],
-        "images": [...]
+        "translated_shape_texts": [ ((i1,i2,...), "translated text"), ... ]
       }
     """
     prs = Presentation(src_path)
@@ -63,27 +90,7 @@ def write_pptx_from_template(src_path, dest_path, translated_slides):
                 if not hasattr(shape, "text_frame") or shape.text_frame is None:
                     continue
 
-                tf = shape.text_frame
-                # Iterate paragraphs and replace text sequentially.
-                # If the original paragraph count > 1, we preserve that structure.
-                # We'll split new_text into lines and map line-wise to paragraphs.
-                new_lines = new_text.splitlines() or [new_text]
-                p_count = len(tf.paragraphs)
-                line_index = 0
-
-                for p in tf.paragraphs:
-                    if line_index < len(new_lines):
-                        _replace_paragraph_text_preserve_format(p, new_lines[line_index])
-                        line_index += 1
-                    else:
-                        # No more translated lines: clear remaining paragraph text
-                        _replace_paragraph_text_preserve_format(p, "")
-                # If there are still extra lines (more translated lines than paragraphs),
-                # append them to the last paragraph (preserve its formatting).
-                if line_index < len(new_lines):
-                    remaining = "\n".join(new_lines[line_index:])
-                    last_para = tf.paragraphs[-1]
-                    _replace_paragraph_text_preserve_format(last_para, last_para.text + ("\n" + remaining if last_para.text else remaining))
+                apply_text_to_text_frame(shape.text_frame, new_text)
 
             except Exception:
                 # If anything fails for a shape, skip it to avoid crashing translation for entire deck.
@@ -0,0 +1,211 @@
+# modules/pptx_translator/pptx_zip_writer.py
+# Zip-level writer: rewrites only the ppt/slides/slideN.xml parts that receive translated text
+# and streams every other part (media, layouts, masters, ...) through unchanged.
+# Text replacement follows the same rules as pptx_writer._replace_paragraph_text_preserve_format.
+
+import re
+import zipfile
+
+from core.ooxml import (
+    OFFICE_REL_NS, escape_ctrl_chars, parse_part, serialize_part, read_relationships, copy_zip_with_replacements,
+)
+
+P_NS = "http://schemas.openxmlformats.org/presentationml/2006/main"
+A_NS = "http://schemas.openxmlformats.org/drawingml/2006/main"
+
+_P = f"{{{A_NS}}}p"
+_R = f"{{{A_NS}}}r"
+_T = f"{{{A_NS}}}t"
+_BR = f"{{{A_NS}}}br"
+_FLD = f"{{{A_NS}}}fld"
+_END_PARA_RPR = f"{{{A_NS}}}endParaRPr"
+_TX_BODY = f"{{{P_NS}}}txBody"
+_SP = f"{{{P_NS}}}sp"
+_GRAPHIC_FRAME = f"{{{P_NS}}}graphicFrame"
+_TBL = f"{{{A_NS}}}tbl"
+_TR = f"{{{A_NS}}}tr"
+_TC = f"{{{A_NS}}}tc"
+_CELL_TX_BODY = f"{{{A_NS}}}txBody"
+
+# Child elements python-pptx treats as shapes (same order and filter as slide.shapes)
+_SHAPE_TAGS = {
+    f"{{{P_NS}}}sp",
+    f"{{{P_NS}}}grpSp",
+    f"{{{P_NS}}}graphicFrame",
+    f"{{{P_NS}}}cxnSp",
+    f"{{{P_NS}}}pic",
+    f"{{{P_NS}}}contentPart",
+}
+_CONTENT_TAGS = (_R, _BR, _FLD)
+
+
+def slide_part_names(zf):
+    """Returns slide part names in presentation order (the order of prs.slides)."""
+    prs_parts = list(read_relationships(zf, "", "officeDocument").values())
+    if not prs_parts:
+        return []
+    prs_part = prs_parts[0]
+    rels = read_relationships(zf, prs_part)
+    root = parse_part(zf, prs_part)
+    names = []
+    for sld_id in root.iter(f"{{{P_NS}}}sldId"):
+        target = rels.get(sld_id.get(f"{{{OFFICE_REL_NS}}}id"))
+        if target:
+            names.append(target)
+    return names
+
+
+def _shape_children(elm):
+    return [child for child in elm if child.tag in _SHAPE_TAGS]
+
+
+def _table_cell(frame, row_idx, col_idx):
+    """a:tc of a table graphic frame (same indexing as python-pptx table.cell(row, col)), or None."""
+    tbl = frame.find(f".//{_TBL}")
+    if tbl is None:
+        return None
+    rows = tbl.findall(_TR)
+    if row_idx >= len(rows):
+        return None
+    cells = rows[row_idx].findall(_TC)
+    return cells[col_idx] if col_idx < len(cells) else None
+
+
+def _get_shape_elm_by_path(sp_tree, path):
+    """
+    Resolve a nested shape element by path tuple, like pptx_writer._get_shape_by_path.
+    A path ending in (row, col) below a table graphic frame resolves to that table cell (a:tc).
+    """
+    if not path:
+        return None
+    shape, rest = sp_tree, path
+    while rest:
+        if shape.tag == _GRAPHIC_FRAME and len(rest) == 2:
+            return _table_cell(shape, *rest)
+        children = _shape_children(shape)
+        if rest[0] >= len(children):
+            return None
+        shape, rest = children[rest[0]], rest[1:]
+    return shape
+
+
+def _paragraph_text(p):
+    """Paragraph text as python-pptx reports it: runs and fields, with "\\v" for line breaks."""
+    parts = []
+    for child in p:
+        if child.tag == _BR:
+            parts.append("\v")
+        elif child.tag in (_R, _FLD):
+            t = child.find(_T)
+            parts.append((t.text or "") if t is not None else "")
+    return "".join(parts)
+
+
+def _insert_content(p, elm):
+    """Append a run/break before a:endParaRPr, which must stay the last child."""
+    end = p.find(_END_PARA_RPR)
+    if end is not None:
+        end.addprevious(elm)
+    else:
+        p.append(elm)
+
+
+def _replace_paragraph_text_preserve_format(p, new_text):
+    """
+    Same strategy as pptx_writer._replace_paragraph_text_preserve_format:
+      - If paragraph has runs: first run gets new_text, other runs are emptied.
+      - If no runs: replace all content, turning "\\n" / "\\v" into line breaks.
+    """
+    runs = p.findall(_R)
+    if runs:
+        for i, r in enumerate(runs):
+            t = r.find(_T)
+            if t is None:
+                t = r.makeelement(_T, {})
+                r.append(t)
+            t.text = escape_ctrl_chars(new_text) if i == 0 else ""
+        return
+
+    for child in [c for c in p if c.tag in _CONTENT_TAGS]:
+        p.remove(child)
+    for idx, r_str in enumerate(re.split("\n|\v", new_text)):
+        if idx > 0:
+            _insert_content(p, p.makeelement(_BR, {}))
+        if r_str:
+            r = p.makeelement(_R, {})
+            t = r.makeelement(_T, {})
+            t.text = escape_ctrl_chars(r_str)
+            r.append(t)
+            _insert_content(p, r)
+
+
+def apply_text_to_tx_body(tx_body, new_text):
+    """Map translated lines onto the paragraphs of a p:txBody (mirrors write_pptx_from_template)."""
+    paragraphs = tx_body.findall(_P)
+    if not paragraphs:
+        return
+    new_lines = new_text.splitlines() or [new_text]
+    line_index = 0
+
+    for p in paragraphs:
+        if line_index < len(new_lines):
+            _replace_paragraph_text_preserve_format(p, new_lines[line_index])
+            line_index += 1
+        else:
+            # No more translated lines: clear remaining paragraph text
+            _replace_paragraph_text_preserve_format(p, "")
+    # Extra translated lines are appended to the last paragraph (preserving its formatting).
+    if line_index < len(new_lines):
+        remaining = "\n".join(new_lines[line_index:])
+        last_para = paragraphs[-1]
+        last_text = _paragraph_text(last_para)
+        _replace_paragraph_text_preserve_format(last_para, last_text + ("\n" + remaining if last_text else remaining))
+
+
+def write_pptx_zip(src_path, dest_path, translated_slides):
+    """
+    Same contract as pptx_writer.write_pptx_from_template, but only slide parts that
+    receive translated text are parsed and re-serialized; all other zip members are
+    streamed through unchanged, so embedded video/audio never passes through python-pptx.
+    """
+    replacements = {}
+    with zipfile.ZipFile(src_path) as zf:
+        for slide_idx, part_name in enumerate(slide_part_names(zf)):
+            if slide_idx >= len(translated_slides):
+                break
+            pairs = translated_slides[slide_idx].get("translated_shape_texts", [])
+            if not pairs:
+                continue
+
+            root = parse_part(zf, part_name)
+            sp_tree = root.find(f"{{{P_NS}}}cSld/{{{P_NS}}}spTree")
+            if sp_tree is None:
+                continue
+
+            for path, new_text in pairs:
+                try:
+                    shape = _get_shape_elm_by_path(sp_tree, path)
+                    # Only autoshapes/placeholders/text boxes (p:sp) and table cells (a:tc) carry a text frame
+                    if shape is None or shape.tag not in (_SP, _TC):
+                        continue
+                    tx_body = shape.find(_TX_BODY if shape.tag == _SP else _CELL_TX_BODY)
+                    if tx_body is None:
+                        continue
+                    apply_text_to_tx_body(tx_body, new_text)
+                except Exception:
+                    # If anything fails for a shape, skip it to avoid crashing translation for entire deck.
+                    continue
+
+            replacements[part_name] = serialize_part(root)
+
+    copy_zip_with_replacements(src_path, dest_path, replacements)
+
+
+def write_pptx_parts(src_path, dest_path, parts):
+    """
+    Save python-pptx parts that were modified in memory (e.g. slide.part) into a copy
+    of src_path. Only those parts are serialized; everything else is streamed from the
+    original zip, so a single-pass pipeline never calls prs.save on the whole package.
+    """
+    replacements = {part.partname.lstrip("/"): part.blob for part in parts}
+    copy_zip_with_replacements(src_path, dest_path, replacements)
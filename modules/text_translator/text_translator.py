@@ -0,0 +1,188 @@
+# modules/text_translator/text_translator.py
+# TXT / CSV のストリーミング翻訳
+# ファイル全体を読み込まず、行単位の上限付きチャンクに分けて読み、チャンクを並行して翻訳しながら
+# 元の順序で出力ファイルに逐次書き込む。CSV は csv モジュールで解析し、文字列のフィールドだけを翻訳する。
+# 複数の翻訳方向を指定した場合も入力は 1 回だけ読み、チャンクごとに全方向の翻訳を取得して各出力に書き込む。
+
+import csv
+import os
+from contextlib import ExitStack
+
+from config.settings import TEXT_STREAM_CHUNK_LINES, TEXT_STREAM_CHUNK_CHARS, TEXT_STREAM_MAX_INFLIGHT
+from core.manifest import location_key
+from core.metrics import stage
+from core.pipeline import iter_chunks, run_ordered, resolve_stream_source
+
+_BOM = "\ufeff"
+
+
+def _split_line_ending(line):
+    """行を本文と改行コードに分ける（\\r\\n / \\n / \\r を保持するため）"""
+    body = line.rstrip("\r\n")
+    return body, line[len(body):]
+
+
+def _is_translatable_field(value):
+    """文字（英字・かな・漢字など）を含むフィールドだけを翻訳する（数値・日付・記号のみは対象外）"""
+    return any(ch.isalpha() for ch in value)
+
+
+def _detect_csv_format(sample):
+    """
+    先頭部分から CSV の方言を推定する。
+    区切り文字・引用符は csv.Sniffer、改行コードは先頭行、全フィールドが引用符付きかどうかは先頭行から判定する。
+    引用符のエスケープは、Sniffer がエスケープ文字を見つけた場合を除き "" の二重化（Excel と同じ）とする。
+    Sniffer は "" を含まないサンプルに doublequote=False を返すため、そのまま使うと引用符を含む
+    フィールドの読み書きに失敗する。
+    """
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=",;\t|")
+    except csv.Error:
+        dialect = csv.excel
+
+    first_line = sample.splitlines(keepends=True)[0] if sample else ""
+    _, ending = _split_line_ending(first_line)
+
+    quoting = csv.QUOTE_MINIMAL
+    fields = next(csv.reader([first_line], dialect), [])
+    q = dialect.quotechar or '"'
+    if fields and first_line.count(q) >= 2 * len(fields) and first_line.startswith(q):
+        quoting = csv.QUOTE_ALL
+
+    escapechar = dialect.escapechar or None
+    return {
+        "delimiter": dialect.delimiter,
+        "quotechar": q,
+        "doublequote": escapechar is None or dialect.doublequote,
+        "escapechar": escapechar,
+        "skipinitialspace": dialect.skipinitialspace,
+        "lineterminator": ending or "\r\n",
+        "quoting": quoting,
+    }
+
+
+class TextTranslator:
+    def __init__(self, translator):
+        self.translator = translator
+
+    def process(self, input_path, direction="en->ja", manifest=None):
+        """
+        TXT / CSV ファイルをストリーミングで翻訳し、出力ファイルのパスを返す。
+        manifest: 差分翻訳用の SegmentManifest（行番号・セル位置ごとに前回の翻訳を再利用する）
+        """
+        return self.process_targets(input_path, [direction], {direction: manifest})[direction]
+
+    def process_targets(self, input_path, directions, manifests=None):
+        """
+        複数の翻訳方向へまとめて翻訳し、{direction: 出力ファイルのパス} を返す。
+        manifests: {direction: SegmentManifest}（省略可）
+        """
+        out_paths = {}
+        for direction in directions:
+            with self.translator.output_label_for(direction, directions):
+                out_paths[direction] = self.translator._make_output_path(input_path)
+
+        # 読み取り・翻訳・書き込みは並行して進むため、ステージはまとめて計測する
+        try:
+            with ExitStack() as stack:
+                outputs = {
+                    direction: stack.enter_context(open(path, "w", encoding="utf-8", newline=""))
+                    for direction, path in out_paths.items()
+                }
+                if os.path.splitext(input_path)[1].lower() == ".csv":
+                    with stage("csv", "stream"):
+                        self._process_csv(input_path, outputs, manifests)
+                else:
+                    with stage("txt", "stream"):
+                        self._process_txt(input_path, outputs, manifests)
+        except BaseException:
+            # 途中まで書き込んだ出力ファイルは残さない
+            for path in out_paths.values():
+                if os.path.exists(path):
+                    os.remove(path)
+            raise
+        return out_paths
+
+    def _process_txt(self, input_path, outputs, manifests):
+        """1 行を 1 セグメントとして翻訳する（改行コード・空行はそのまま保持）。outputs は {direction: 出力ファイル}"""
+        with open(input_path, "r", encoding="utf-8", newline="") as fin:
+
+            def lines():
+                for line_no, line in enumerate(fin):
+                    yield line_no, line
+
+            # 原文の言語はファイルの先頭部分から 1 回だけ推定し、すべてのチャンクで共有する
+            source, items = resolve_stream_source(self.translator, lines(), lambda item: item[1], list(outputs))
+
+            def translate_chunk(chunk):
+                bodies = [_split_line_ending(line)[0] for _, line in chunk]
+                keys = [location_key("line", line_no) for line_no, _ in chunk]
+                return self.translator.translate_batch_targets(
+                    bodies, list(outputs), keys=keys, manifests=manifests, source=source,
+                )
+
+            def write_chunk(chunk, translations):
+                for direction, fout in outputs.items():
+                    for (_, line), new_body in zip(chunk, translations[direction]):
+                        fout.write(new_body + _split_line_ending(line)[1])
+
+            chunks = iter_chunks(
+                items, lambda item: len(item[1]), TEXT_STREAM_CHUNK_LINES, TEXT_STREAM_CHUNK_CHARS,
+            )
+            run_ordered(chunks, translate_chunk, write_chunk, TEXT_STREAM_MAX_INFLIGHT, "text")
+
+    def _process_csv(self, input_path, outputs, manifests):
+        """
+        文字列フィールドだけを翻訳し、区切り文字・引用符・改行コードは元のファイルに合わせて書き出す。
+        outputs は {direction: 出力ファイル}
+        """
+        with open(input_path, "r", encoding="utf-8", newline="") as fin:
+            sample = fin.read(64 * 1024)
+            fin.seek(0)
+            # Excel で保存した CSV の BOM は維持する
+            if sample.startswith(_BOM):
+                for fout in outputs.values():
+                    fout.write(_BOM)
+                fin.read(1)
+                sample = sample[1:]
+
+            fmt = _detect_csv_format(sample)
+            reader = csv.reader(
+                fin, delimiter=fmt["delimiter"], quotechar=fmt["quotechar"], doublequote=fmt["doublequote"],
+                escapechar=fmt["escapechar"], skipinitialspace=fmt["skipinitialspace"],
+            )
+            writers = {direction: csv.writer(fout, **fmt) for direction, fout in outputs.items()}
+            source, rows = resolve_stream_source(
+                self.translator, enumerate(reader),
+                lambda item: " ".join(v for v in item[1] if _is_translatable_field(v)), list(outputs),
+            )
+
+            def translate_chunk(chunk):
+                cells = [
+                    (row_no, col, value)
+                    for row_no, row in chunk
+                    for col, value in enumerate(row)
+                    if _is_translatable_field(value)
+                ]
+                translations = self.translator.translate_batch_targets(
+                    [value for _, _, value in cells], list(outputs),
+                    keys=[location_key(row_no, col) for row_no, col, _ in cells], manifests=manifests,
+                    source=source,
+                )
+                translated_rows = {}
+                for direction, translated in translations.items():
+                    rows = {row_no: list(row) for row_no, row in chunk}
+                    for (row_no, col, _), new_value in zip(cells, translated):
+                        rows[row_no][col] = new_value
+                    translated_rows[direction] = [rows[row_no] for row_no, _ in chunk]
+                return translated_rows
+
+            def write_chunk(chunk, translated_rows):
+                for direction, writer in writers.items():
+                    writer.writerows(translated_rows[direction])
+
+            chunks = iter_chunks(
+                rows, lambda item: sum(len(v) for v in item[1]),
+                TEXT_STREAM_CHUNK_LINES, TEXT_STREAM_CHUNK_CHARS,
+            )
+            run_ordered(chunks, translate_chunk, write_chunk, TEXT_STREAM_MAX_INFLIGHT, "text")
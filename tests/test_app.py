@@ -0,0 +1,98 @@
+# tests/test_app.py
+# Web アプリケーション（アップロード → ジョブのステータス確認 → ダウンロード）
+
+import io
+import os
+import time
+
+import pytest
+
+pytest.importorskip("flask")
+openpyxl = pytest.importorskip("openpyxl")
+
+import main
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    output_dir = str(tmp_path / "output")
+    monkeypatch.setattr("main.OUTPUT_DIR", output_dir)
+    monkeypatch.setattr("core.translate_text_google.OUTPUT_DIR", output_dir)
+    monkeypatch.setattr("core.translate_text_google.TRANSLATION_MEMORY_ENABLED", False)
+    monkeypatch.setattr("config.settings.TRANSLATION_BACKEND", "stub")
+
+    upload_folder = tmp_path / "uploads"
+    # 別のプロセスが処理中のジョブのアップロード（アプリケーションの作成時に消してはいけない）
+    (upload_folder / "other-job").mkdir(parents=True)
+    (upload_folder / "other-job" / "book.xlsx").write_bytes(b"in progress")
+
+    app = main.create_app({"UPLOAD_FOLDER": str(upload_folder), "START_SWEEPER": False, "TESTING": True})
+    assert (upload_folder / "other-job" / "book.xlsx").exists()
+    yield app.test_client()
+    app.extensions["translation"].jobs.shutdown()
+
+
+def _xlsx(rows):
+    wb = openpyxl.Workbook()
+    for row in rows:
+        wb.active.append(row)
+    data = io.BytesIO()
+    wb.save(data)
+    data.seek(0)
+    return data
+
+
+def _wait(client, status_url, timeout=30):
+    deadline = time.monotonic() + timeout
+    while True:
+        payload = client.get(status_url).get_json()
+        if payload["status"] in ("done", "error") or time.monotonic() > deadline:
+            return payload
+        time.sleep(0.05)
+
+
+def test_submit_poll_and_download(client, tmp_path):
+    response = client.post(
+        "/translate",
+        data={"file": (_xlsx([["Hello"], ["Good morning"]]), "book.xlsx"), "translate_from": "en", "translate_to": "fr"},
+        headers={"X-Requested-With": "XMLHttpRequest"},
+    )
+    assert response.status_code == 202
+    job = response.get_json()
+    assert job["direction"] == "en->fr"
+
+    payload = _wait(client, job["status_url"])
+    assert payload["status"] == "done", payload["error"]
+
+    download = client.get(payload["download_url"])
+    assert download.status_code == 200
+    out = openpyxl.load_workbook(io.BytesIO(download.data))
+    assert [row[0].value for row in out.active.iter_rows()] == ["[fr] Hello", "[fr] Good morning"]
+
+    # 翻訳が終わったアップロードは（ジョブの後処理で）削除され、他のジョブのフォルダは残る
+    deadline = time.monotonic() + 5
+    while len(os.listdir(tmp_path / "uploads")) > 1 and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert os.listdir(tmp_path / "uploads") == ["other-job"]
+
+
+def test_unknown_job_and_unsupported_file(client):
+    assert client.get("/jobs/unknown").status_code == 404
+    response = client.post(
+        "/translate",
+        data={"file": (io.BytesIO(b"x"), "notes.pdf"), "translate_from": "en", "translate_to": "ja"},
+        headers={"X-Requested-With": "XMLHttpRequest"},
+    )
+    assert response.status_code == 400
+    assert "pdf" in response.get_json()["error"]
+
+
+@pytest.mark.parametrize("filename, suggested", [("old.xls", ".xlsx"), ("old.ppt", ".pptx")])
+def test_legacy_formats_are_rejected_at_upload(client, filename, suggested):
+    response = client.post(
+        "/translate",
+        data={"file": (io.BytesIO(b"x"), filename), "translate_from": "en", "translate_to": "ja"},
+        headers={"X-Requested-With": "XMLHttpRequest"},
+    )
+    assert response.status_code == 400
+    assert suggested in response.get_json()["error"]
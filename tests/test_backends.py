@@ -0,0 +1,50 @@
+# tests/test_backends.py
+# 翻訳バックエンド（ローカルモデルの文分割・スタブ）
+
+from types import SimpleNamespace
+
+from core.backends import LocalModelBackend, StubBackend
+
+
+class FakeSentencePiece:
+    def encode(self, text, out_type=str):
+        return [text]
+
+    def decode(self, tokens):
+        return tokens[0].upper()
+
+
+class FakeCTranslate2:
+    def __init__(self):
+        self.inputs = []
+
+    def translate_batch(self, tokens, max_batch_size, beam_size):
+        self.inputs.extend(t[0] for t in tokens)
+        return [SimpleNamespace(hypotheses=[[t[0]]]) for t in tokens]
+
+
+def _local_backend(max_sentence_chars):
+    backend = LocalModelBackend("unused", max_sentence_chars=max_sentence_chars)
+    model = FakeCTranslate2()
+    backend._load = lambda src, dest: (model, FakeSentencePiece(), FakeSentencePiece())
+    return backend, model
+
+
+def test_local_backend_splits_long_lines_before_inference():
+    backend, model = _local_backend(max_sentence_chars=30)
+    text = "First sentence is here. Second sentence is here. Third one."
+
+    assert backend.translate_batch([text], "en", "ja") == [text.upper()]
+    assert all(len(sentence) <= 30 for sentence in model.inputs)
+    assert len(model.inputs) == 3
+
+
+def test_local_backend_keeps_short_lines_and_blank_lines():
+    backend, model = _local_backend(max_sentence_chars=400)
+
+    assert backend.translate_batch(["one\n\ntwo", "  "], "en", "ja") == ["ONE\n\nTWO", "  "]
+    assert model.inputs == ["one", "two"]
+
+
+def test_stub_backend_keeps_markers_and_blank_lines():
+    assert StubBackend().translate_batch(["a\n\nb"], "en", "fr") == ["[fr] a\n\n[fr] b"]
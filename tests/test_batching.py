@@ -0,0 +1,105 @@
+# tests/test_batching.py
+# セグメントのリクエストへの詰め込みとマーカーによる連結・分割
+
+import pytest
+
+from core.batching import (
+    BatchSplitError, join_segments, pack_segments, split_segments, split_long_segment, is_marker_line,
+)
+from core.backends import StubBackend
+from core.translate_text_google import Translator
+
+
+def test_pack_segments_respects_limits_and_order():
+    texts = ["a" * 10] * 7
+    chunks = pack_segments(texts, max_chars=40, max_segments=3)
+    assert [i for chunk in chunks for i in chunk] == list(range(7))
+    assert all(len(chunk) <= 3 for chunk in chunks)
+    assert len(chunks) > 2
+
+
+def test_pack_segments_keeps_oversized_segment_alone():
+    assert pack_segments(["short", "x" * 100, "short"], max_chars=50, max_segments=10) == [[0], [1], [2]]
+
+
+@pytest.mark.parametrize("texts", [
+    ["Hello"],
+    ["Hello", "", "multi\nline\ntext", "  padded  "],
+    ["§ not a marker", "価格は 100 円です", "A.B.C"],
+])
+def test_join_split_round_trip(texts):
+    joined = join_segments(texts)
+    assert split_segments(joined, len(texts)) == [text.strip() for text in texts]
+
+
+def test_split_tolerates_spacing_changes_in_markers():
+    joined = join_segments(["one", "two"]).replace("§§1§§", " § § 1 § § ")
+    assert split_segments(joined, 2) == ["one", "two"]
+
+
+def test_split_rejects_missing_or_reordered_markers():
+    joined = join_segments(["one", "two", "three"])
+    with pytest.raises(BatchSplitError):
+        split_segments(joined.replace("§§1§§", ""), 3)
+    with pytest.raises(BatchSplitError):
+        split_segments(joined, 4)
+    with pytest.raises(BatchSplitError):
+        split_segments("extra\n" + joined, 3)
+
+
+def test_round_trip_through_a_translating_backend():
+    texts = ["Hello", "Good\nmorning", "Bye"]
+    translated = StubBackend().translate(join_segments(texts), "en", "fr")
+    assert all(is_marker_line(line) or line.startswith("[fr] ") for line in translated.split("\n"))
+    assert split_segments(translated, 3) == ["[fr] Hello", "[fr] Good\n[fr] morning", "[fr] Bye"]
+
+
+def test_translate_batch_joins_segments_for_non_batch_backends():
+    calls = []
+
+    def backend(text, src, dest):
+        calls.append(text)
+        return "\n".join(line if is_marker_line(line) else line.upper() for line in text.split("\n"))
+
+    translator = Translator(backend=backend, memory=False)
+    assert translator.translate_batch(["hello", "world", None, " "], "en->fr") == ["HELLO", "WORLD", None, " "]
+    assert len(calls) == 1
+
+
+def test_translate_batch_falls_back_when_markers_break():
+    def backend(text, src, dest):
+        return "garbled" if "§" in text else text.upper()
+
+    translator = Translator(backend=backend, memory=False)
+    assert translator.translate_batch(["hello", "world"], "en->fr") == ["HELLO", "WORLD"]
+
+
+# ---------------------------------------------
+# 長いセグメントの分割
+# ---------------------------------------------
+@pytest.mark.parametrize("text", [
+    "First sentence. Second sentence! Third one? Fourth.",
+    "一文目です。二文目です。三文目です。",
+    "line one\n\nline two\nline three",
+    "averyveryverylongwordwithoutanyspacesthatmustbecut",
+])
+def test_split_long_segment_reassembles_exactly(text):
+    pieces = split_long_segment(text, 20)
+    assert "".join(body + sep for body, sep in pieces) == text
+    assert all(len(body) <= 20 for body, _ in pieces)
+
+
+def test_split_long_segment_prefers_sentence_boundaries():
+    pieces = split_long_segment("Short one. Another short one. Last.", 30)
+    assert [body for body, _ in pieces] == ["Short one. Another short one.", "Last."]
+    assert split_long_segment("fits", 30) == [("fits", "")]
+
+
+def test_translate_batch_splits_oversized_segments():
+    sentence = "This is a sentence. "
+    text = (sentence * 400).strip()
+    translator = Translator(backend="stub", memory=False)
+    result = translator.translate_batch([text], "en->fr")[0]
+    assert result.count("[fr] ") > 1
+    assert result.replace("[fr] ", "") == text
+    assert translator.stats["oversized"] == 1
@@ -0,0 +1,72 @@
+# tests/test_cli.py
+# コマンドラインの一括翻訳（入力の収集・出力ファイル名・翻訳済みの判定）
+
+import os
+
+from core.translate import collect_inputs, output_path_for, is_done, main
+
+
+def _touch(path, text="hello\n"):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_same_named_inputs_map_to_distinct_outputs(tmp_path):
+    _touch(tmp_path / "docs" / "a" / "report.txt")
+    _touch(tmp_path / "docs" / "b" / "report.txt")
+    out_dir = str(tmp_path / "out")
+
+    inputs = collect_inputs([str(tmp_path / "docs")], recursive=True)
+    outputs = [output_path_for(path, out_dir, root) for path, root in inputs]
+
+    assert outputs == [
+        os.path.join(out_dir, "a", "report_translated.txt"),
+        os.path.join(out_dir, "b", "report_translated.txt"),
+    ]
+
+
+def test_glob_root_is_the_prefix_before_wildcards(tmp_path):
+    _touch(tmp_path / "reports" / "2024" / "q1.csv")
+    _touch(tmp_path / "reports" / "q1.csv")
+    out_dir = str(tmp_path / "out")
+
+    inputs = collect_inputs([str(tmp_path / "reports" / "**" / "*.csv")])
+    outputs = sorted(output_path_for(path, out_dir, root) for path, root in inputs)
+
+    assert outputs == [
+        os.path.join(out_dir, "2024", "q1_translated.csv"),
+        os.path.join(out_dir, "q1_translated.csv"),
+    ]
+
+
+def test_collect_inputs_skips_lock_files_and_unsupported(tmp_path):
+    _touch(tmp_path / "~$draft.txt")
+    _touch(tmp_path / "image.png")
+    kept = _touch(tmp_path / "notes.txt")
+
+    assert collect_inputs([str(tmp_path)]) == [(kept, str(tmp_path))]
+
+
+def test_is_done_compares_against_the_mirrored_output(tmp_path):
+    source = _touch(tmp_path / "docs" / "a" / "report.txt")
+    output = output_path_for(source, str(tmp_path / "out"), str(tmp_path / "docs"))
+    assert not is_done(source, output)
+    _touch(tmp_path / "out" / "a" / "report_translated.txt")
+    assert is_done(source, output)
+
+
+def test_main_translates_into_mirrored_tree(tmp_path, monkeypatch):
+    # ワーカープロセスは fork で設定を引き継ぐ（翻訳メモリを使わない）
+    monkeypatch.setattr("core.translate_text_google.TRANSLATION_MEMORY_ENABLED", False)
+    _touch(tmp_path / "docs" / "a" / "report.txt", "hello\n")
+    _touch(tmp_path / "docs" / "b" / "report.txt", "world\n")
+    out_dir = tmp_path / "out"
+
+    code = main([str(tmp_path / "docs"), "-r", "-o", str(out_dir), "-j", "2", "--backend", "stub", "-d", "en->fr"])
+
+    assert code == 0
+    assert (out_dir / "a" / "report_translated.txt").read_text(encoding="utf-8") == "[fr] hello\n"
+    assert (out_dir / "b" / "report_translated.txt").read_text(encoding="utf-8") == "[fr] world\n"
+    # ワーカーの一時フォルダは残らない
+    assert sorted(os.listdir(out_dir)) == ["a", "b"]
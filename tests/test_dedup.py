@@ -0,0 +1,33 @@
+# tests/test_dedup.py
+# 重複セグメントの排除
+
+from core.dedup import dedupe_segments, normalize_segment
+from core.translate_text_google import Translator
+
+
+def test_normalize_segment():
+    assert normalize_segment("  Hello \t  world  ") == "Hello world"
+    assert normalize_segment("a　 b\n  c ") == "a b\nc"
+    # 合成済み文字と結合文字は同じキーになる
+    assert normalize_segment("Cafe\u0301") == normalize_segment("Caf\u00e9")
+
+
+def test_dedupe_and_expand():
+    result = dedupe_segments(["Hello", "World", " Hello ", "Hello"])
+    assert result.unique == ["Hello", "World"]
+    assert result.index_map == [0, 1, 0, 0]
+    assert result.saved == 2
+    assert result.expand(["H", "W"]) == ["H", "W", "H", "H"]
+
+
+def test_translate_batch_sends_each_unique_segment_once():
+    sent = []
+
+    def backend(text, src, dest):
+        sent.append(text)
+        return text.upper()
+
+    translator = Translator(backend=backend, memory=False)
+    assert translator.translate_batch(["Yes", "No", "Yes", " Yes "], "en->fr") == ["YES", "NO", "YES", " YES "]
+    assert translator.stats["dedup_saved"] == 2
+    assert "".join(sent).count("Yes") == 1
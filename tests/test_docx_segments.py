@@ -0,0 +1,62 @@
+# tests/test_docx_segments.py
+# ハイパーリンクを含む DOCX 段落のセグメント化と書き戻し
+
+import pytest
+
+docx = pytest.importorskip("docx")
+
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+
+from modules.docx_translator.docx_segments import apply_segmented_paragraph, encode_paragraph
+
+
+def _paragraph_with_link():
+    """'See ' + ハイパーリンク 'the docs' + ' for details.' の段落"""
+    document = docx.Document()
+    para = document.add_paragraph("See ")
+    r_id = para.part.relate_to("https://example.com/docs", RT.HYPERLINK, is_external=True)
+    link = OxmlElement("w:hyperlink")
+    link.set(qn("r:id"), r_id)
+    run = OxmlElement("w:r")
+    t = OxmlElement("w:t")
+    t.text = "the docs"
+    run.append(t)
+    link.append(run)
+    para._p.append(link)
+    para.add_run(" for details.")
+    return para, r_id
+
+
+def _links(para):
+    """[(r:id, リンク内のテキスト), ...]"""
+    return [
+        (link.get(qn("r:id")), "".join(t.text for t in link.iter(qn("w:t"))))
+        for link in para._p.findall(qn("w:hyperlink"))
+    ]
+
+
+def test_hyperlink_runs_are_tagged_and_rebuilt_inside_the_link():
+    para, r_id = _paragraph_with_link()
+    text, layout = encode_paragraph(para)
+    assert text == "<g1>See </g1><g2>the docs</g2><g3> for details.</g3>"
+
+    apply_segmented_paragraph(para, "<g1>Voir </g1><g2>la doc</g2><g3> pour les détails.</g3>", layout)
+    assert para.text == "Voir la doc pour les détails."
+    assert _links(para) == [(r_id, "la doc")]
+
+
+def test_reordered_link_text_keeps_its_link():
+    para, r_id = _paragraph_with_link()
+    text, layout = encode_paragraph(para)
+    apply_segmented_paragraph(para, "<g2>ドキュメント</g2><g3>の詳細は</g3><g1>こちら</g1>", layout)
+    assert para.text == "ドキュメントの詳細はこちら"
+    assert _links(para) == [(r_id, "ドキュメント")]
+
+
+def test_broken_tags_fall_back_without_duplicating_link_text():
+    para, r_id = _paragraph_with_link()
+    _, layout = encode_paragraph(para)
+    apply_segmented_paragraph(para, "<g1>Voir la doc</g2>", layout)
+    assert para.text == "Voir la doc"
@@ -0,0 +1,78 @@
+# tests/test_docx_translator.py
+# シングルパスの DOCX パイプライン（結合セル・入れ子のテーブル・ヘッダ/フッタを含む往復）
+
+import pytest
+
+docx = pytest.importorskip("docx")
+
+from core.files import output_workspace
+from core.translate_text_google import Translator
+from modules.docx_translator.docx_reader import iter_docx_paragraphs
+from modules.docx_translator.docx_translator import DOCXTranslator
+
+
+def _make_document(path):
+    document = docx.Document()
+    document.add_paragraph("Introduction")
+    document.add_paragraph("")
+
+    table = document.add_table(rows=2, cols=3)
+    merged = table.cell(0, 0).merge(table.cell(0, 1))  # 横方向の結合（gridSpan）
+    merged.text = "Merged header"
+    table.cell(0, 2).text = "Amount"
+    table.cell(1, 2).merge(table.cell(0, 2))  # 縦方向の結合（vMerge）
+    table.cell(1, 0).text = "Apple"
+    nested = table.cell(1, 1).add_table(rows=1, cols=1)
+    nested.cell(0, 0).text = "Nested cell"
+
+    section = document.sections[0]
+    section.header.paragraphs[0].text = "Header text"
+    section.footer.paragraphs[0].text = "Footer text"
+    # 前のセクションにリンクされたヘッダ/フッタは返さない
+    document.add_section()
+    document.add_paragraph("Second section")
+    document.save(path)
+
+
+def test_iter_docx_paragraphs_walks_merged_and_nested_cells_once(tmp_path):
+    source = tmp_path / "report.docx"
+    _make_document(source)
+    items = list(iter_docx_paragraphs(docx.Document(source)))
+
+    assert [(section_key, path, text) for section_key, path, _, text in items] == [
+        ("paragraphs", ("para", 0), "Introduction"),
+        ("paragraphs", ("para", 3), "Second section"),
+        ("tables", ("table", 0, 0, 0, 0), "Merged header"),
+        ("tables", ("table", 0, 0, 1, 0), "Amount"),
+        ("tables", ("table", 0, 1, 0, 0), "Apple"),
+        ("tables", ("table", 0, 1, 1, "table", 0, 0, 0, 0), "Nested cell"),
+        ("headers", ("header", 0, 0), "Header text"),
+        ("footers", ("footer", 0, 0), "Footer text"),
+    ]
+    assert all(para.text == text for _, _, para, text in items)
+
+
+def test_single_pass_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr("modules.docx_translator.docx_translator.DOCX_SINGLE_PASS", True)
+    source = tmp_path / "report.docx"
+    _make_document(source)
+
+    translator = Translator(backend="stub", memory=False)
+    with output_workspace(str(tmp_path / "out")):
+        outputs = DOCXTranslator(translator).process_targets(str(source), ["en->fr", "en->de"])
+
+    for direction, dest in (("en->fr", "fr"), ("en->de", "de")):
+        out = docx.Document(outputs[direction])
+        assert [para.text for para in out.paragraphs] == [f"[{dest}] Introduction", "", "", f"[{dest}] Second section"]
+
+        table = out.tables[0]
+        # 結合セルは 1 回だけ翻訳される
+        assert table.cell(0, 0).text == table.cell(0, 1).text == f"[{dest}] Merged header"
+        assert table.cell(0, 2).text == f"[{dest}] Amount"
+        assert table.cell(1, 0).text == f"[{dest}] Apple"
+        assert table.cell(1, 1).tables[0].cell(0, 0).text == f"[{dest}] Nested cell"
+
+        section = out.sections[0]
+        assert section.header.paragraphs[0].text == f"[{dest}] Header text"
+        assert section.footer.paragraphs[0].text == f"[{dest}] Footer text"
+        assert out.sections[1].header.is_linked_to_previous
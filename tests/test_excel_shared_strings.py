@@ -0,0 +1,134 @@
+# tests/test_excel_shared_strings.py
+# xlsx の共有文字列を zip レベルで書き換える高速パス（シート名変更に伴う参照の書き換え・テーブル列名の同期）
+
+import zipfile
+
+import pytest
+
+openpyxl = pytest.importorskip("openpyxl")
+etree = pytest.importorskip("lxml.etree")
+
+from openpyxl.chart import BarChart, Reference
+from openpyxl.workbook.defined_name import DefinedName
+from openpyxl.worksheet.table import Table
+
+from modules.excel_translator.excel_formulas import rename_references
+from modules.excel_translator.excel_shared_strings import read_shared_strings, write_translated_shared_strings
+
+
+@pytest.mark.parametrize("formula, expected", [
+    ("SUM(Sales!B2:B3)", "SUM('売上'!B2:B3)"),
+    ("'Sales'!$A$1+'Q1 Data'!A1", "'売上'!$A$1+'Q1'!A1"),
+    ("SUM(Sales:Other!A1)", "SUM('売上:Other'!A1)"),
+    ('"Sales!A1"&Sales!A1', '"Sales!A1"&\'売上\'!A1'),
+    ("[1]Sales!A1+'[Book.xlsx]Sales'!A1", "[1]Sales!A1+'[Book.xlsx]Sales'!A1"),
+    ("SalesTax!A1+A1:B2", "SalesTax!A1+A1:B2"),
+    ("SUM(Table1[Amount])", "SUM(Table1[金額])"),
+    ("Table1[[#This Row],[Amount]]*2", "Table1[[#This Row],[金額]]*2"),
+    ("Table1[[Amount]:[Unit '[USD']]]", "Table1[[金額]:[単価]]"),
+    ("Table2[Amount]+Table1[#All]", "Table2[Amount]+Table1[#All]"),
+])
+def test_rename_references(formula, expected):
+    sheets = {"sales": "売上", "q1 data": "Q1"}
+    columns = {"table1": {"amount": "金額", "unit [usd]": "単価"}}
+    assert rename_references(formula, sheets, columns) == expected
+
+
+_SSML = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_SST_REL = (
+    '<Relationship Id="rIdSst" Target="sharedStrings.xml" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings"/>'
+)
+_SST_TYPE = (
+    '<Override PartName="/xl/sharedStrings.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+)
+
+
+def _use_shared_strings(path):
+    """openpyxl は文字列をセル内（inlineStr）に書くため、Excel と同じ共有文字列テーブルに移す"""
+    with zipfile.ZipFile(path) as zf:
+        parts = {name: zf.read(name) for name in zf.namelist()}
+    texts = []
+    for name in [name for name in parts if name.startswith("xl/worksheets/sheet")]:
+        root = etree.fromstring(parts[name])
+        for c in root.iter(f"{{{_SSML}}}c"):
+            inline = c.find(f"{{{_SSML}}}is")
+            if c.get("t") != "inlineStr" or inline is None:
+                continue
+            c.remove(inline)
+            c.set("t", "s")
+            etree.SubElement(c, f"{{{_SSML}}}v").text = str(len(texts))
+            texts.append("".join(inline.itertext()))
+        parts[name] = etree.tostring(root)
+    sst = etree.Element(f"{{{_SSML}}}sst", count=str(len(texts)), uniqueCount=str(len(texts)))
+    for text in texts:
+        etree.SubElement(etree.SubElement(sst, f"{{{_SSML}}}si"), f"{{{_SSML}}}t").text = text
+    parts["xl/sharedStrings.xml"] = etree.tostring(sst)
+    parts["xl/_rels/workbook.xml.rels"] = parts["xl/_rels/workbook.xml.rels"].replace(
+        b"</Relationships>", _SST_REL.encode() + b"</Relationships>")
+    parts["[Content_Types].xml"] = parts["[Content_Types].xml"].replace(b"</Types>", _SST_TYPE.encode() + b"</Types>")
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, data in parts.items():
+            zf.writestr(name, data)
+
+
+def _make_workbook(path):
+    wb = openpyxl.Workbook()
+    sales = wb.active
+    sales.title = "Sales"
+    for row in [("Item", "Amount"), ("Apple", 10), ("Pear", 20)]:
+        sales.append(row)
+    sales.add_table(Table(displayName="Table1", ref="A1:B3"))
+    chart = BarChart()
+    chart.add_data(Reference(sales, min_col=2, min_row=1, max_row=3), titles_from_data=True)
+    sales.add_chart(chart, "D2")
+
+    summary = wb.create_sheet("Summary")
+    summary["A1"] = "=SUM(Sales!B2:B3)"
+    summary["A2"] = "=SUM(Table1[Amount])"
+    summary["A3"] = "='Sales'!A2"
+    wb.defined_names["Total"] = DefinedName("Total", attr_text="Sales!$B$2:$B$3")
+    wb.save(path)
+    _use_shared_strings(path)
+
+
+def _translate(path, output, mapping, sheet_renames):
+    workbook = read_shared_strings(str(path))
+    translations = [mapping.get(text, text) for text in workbook.texts]
+    write_translated_shared_strings(str(path), str(output), workbook, translations, sheet_renames)
+    return openpyxl.load_workbook(output)
+
+
+def test_renamed_sheets_and_translated_headers_keep_references_valid(tmp_path):
+    source = tmp_path / "book.xlsx"
+    _make_workbook(source)
+    mapping = {"Item": "品目", "Amount": "金額", "Apple": "りんご", "Pear": "なし"}
+    out = _translate(source, tmp_path / "out.xlsx", mapping, [("Sales", "売上"), ("Summary", "集計")])
+
+    assert out.sheetnames == ["売上", "集計"]
+    assert [out["集計"][ref].value for ref in ("A1", "A2", "A3")] == [
+        "=SUM('売上'!B2:B3)", "=SUM(Table1[金額])", "='売上'!A2",
+    ]
+    assert out.defined_names["Total"].attr_text == "'売上'!$B$2:$B$3"
+
+    table = out["売上"].tables["Table1"]
+    assert [column.name for column in table.tableColumns] == ["品目", "金額"]
+    assert [cell.value for cell in out["売上"][1]] == ["品目", "金額"]
+
+    with zipfile.ZipFile(tmp_path / "out.xlsx") as zf:
+        chart = next(name for name in zf.namelist() if name.startswith("xl/charts/chart"))
+        chart_xml = zf.read(chart).decode("utf-8")
+    assert "'売上'!$B$2:$B$3" in chart_xml
+    assert "Sales!" not in chart_xml
+
+
+def test_duplicate_translated_headers_get_unique_column_names(tmp_path):
+    source = tmp_path / "book.xlsx"
+    _make_workbook(source)
+    out = _translate(source, tmp_path / "out.xlsx", {"Item": "名前", "Amount": "名前"}, [])
+
+    table = out["Sales"].tables["Table1"]
+    assert [column.name for column in table.tableColumns] == ["名前", "名前2"]
+    assert [cell.value for cell in out["Sales"][1]] == ["名前", "名前2"]
+    assert out["Summary"]["A2"].value == "=SUM(Table1[名前2])"
@@ -0,0 +1,55 @@
+# tests/test_excel_sheets.py
+# インライン文字列のシートをシートごとに抽出・書き換える経路（ワーカープロセス・iterparse）の往復
+
+import pytest
+
+openpyxl = pytest.importorskip("openpyxl")
+pytest.importorskip("lxml")
+
+from openpyxl.worksheet.table import Table
+
+from core.files import output_workspace
+from core.translate_text_google import Translator
+from modules.excel_translator.excel_shared_strings import read_shared_strings
+from modules.excel_translator.excel_translator import ExcelTranslator
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_inline_string_workbook_round_trip(tmp_path, monkeypatch, workers):
+    # workers=2 ではシートごとに spawn したワーカープロセスで抽出・書き換えを行う
+    monkeypatch.setattr("modules.excel_translator.excel_translator.EXCEL_SHEET_WORKERS", workers)
+    monkeypatch.setattr("modules.excel_translator.excel_translator.EXCEL_SHEET_PARALLEL_MIN_BYTES", 0)
+
+    source = tmp_path / "book.xlsx"
+    wb = openpyxl.Workbook()
+    sales = wb.active
+    sales.title = "Sales"
+    for row in [("Item", "Amount"), ("Apple", 10), ("Pear", 20)]:
+        sales.append(row)
+    sales.add_table(Table(displayName="Table1", ref="A1:B3"))
+    summary = wb.create_sheet("Summary")
+    summary["A1"] = "Total"
+    summary["B1"] = "=SUM(Sales!B2:B3)"
+    summary["B2"] = "=SUM(Table1[Amount])"
+    wb.save(source)
+
+    # openpyxl は文字列をセル内（inlineStr）に書き、共有文字列テーブルを持たない
+    workbook = read_shared_strings(str(source), allow_inline_strings=True)
+    assert workbook.sst_part is None and workbook.inline_sheets == [0, 1]
+
+    translator = Translator(backend="stub", memory=False)
+    with output_workspace(str(tmp_path / "out")):
+        out_path = ExcelTranslator(translator).process(str(source), direction="en->fr")
+
+    out = openpyxl.load_workbook(out_path)
+    # "[" と "]" はシート名に使えないため "_" に置き換えられる
+    assert out.sheetnames == ["_fr_ Sales", "_fr_ Summary"]
+    sales, summary = out.worksheets
+    assert [[cell.value for cell in row] for row in sales.iter_rows()] == [
+        ["[fr] Item", "[fr] Amount"], ["[fr] Apple", 10], ["[fr] Pear", 20],
+    ]
+    assert summary["A1"].value == "[fr] Total"
+    assert summary["B1"].value == "=SUM('_fr_ Sales'!B2:B3)"
+    # 列名の "[" "]" は構造化参照の中では ' でエスケープされる
+    assert summary["B2"].value == "=SUM(Table1['[fr'] Amount])"
+    assert [column.name for column in sales.tables["Table1"].tableColumns] == ["[fr] Item", "[fr] Amount"]
@@ -0,0 +1,96 @@
+# tests/test_executor.py
+# 翻訳リクエストの並列実行・再試行・レート制限
+
+import time
+
+import pytest
+
+from core.executor import (
+    TokenBucket, TransientTranslationError, TranslationError, TranslationExecutor, is_transient,
+)
+from core.translate_text_google import Translator
+
+
+class TooManyRequests(Exception):
+    """deep_translator の 429 エラーと同じクラス名"""
+
+
+def test_is_transient():
+    assert is_transient(TransientTranslationError())
+    assert is_transient(ConnectionError())
+    assert is_transient(TimeoutError())
+    assert is_transient(TooManyRequests())
+    assert not is_transient(ValueError("bad input"))
+
+
+def test_call_retries_transient_errors():
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise TransientTranslationError()
+        return "ok"
+
+    executor = TranslationExecutor(retries=3, base_delay=0.001, max_delay=0.001)
+    assert executor.call(flaky) == "ok"
+    assert len(attempts) == 3
+
+
+def test_call_gives_up_after_retries_and_on_permanent_errors():
+    executor = TranslationExecutor(retries=2, base_delay=0.001, max_delay=0.001)
+    attempts = []
+
+    def always_down():
+        attempts.append(1)
+        raise ConnectionError("down")
+
+    with pytest.raises(ConnectionError):
+        executor.call(always_down)
+    assert len(attempts) == 3
+
+    attempts.clear()
+
+    def rejected():
+        attempts.append(1)
+        raise ValueError("bad input")
+
+    with pytest.raises(ValueError):
+        executor.call(rejected)
+    assert len(attempts) == 1
+
+
+def test_map_keeps_input_order():
+    executor = TranslationExecutor(max_workers=4)
+
+    def slow_square(n):
+        time.sleep(0.001 * (5 - n))
+        return n * n
+
+    assert executor.map(slow_square, range(5)) == [0, 1, 4, 9, 16]
+    executor.shutdown()
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=100, burst=1)
+    started = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    assert time.monotonic() - started >= 0.04
+
+
+def test_failed_segments_are_returned_unchanged_or_raised_in_strict_mode():
+    def backend(text, src, dest):
+        if "bad" in text:
+            raise ValueError("rejected")
+        return text.upper()
+
+    # 1 リクエストにまとめたセグメントは、リクエストが失敗するとすべて原文のまま返る
+    translator = Translator(backend=backend, memory=False)
+    assert translator.translate_batch(["good", "bad"], "en->fr") == ["good", "bad"]
+    assert translator.stats["failed"] == 2
+    assert translator.translate_batch(["good"], "en->fr") == ["GOOD"]
+
+    with pytest.raises(TranslationError) as info:
+        translator.translate_batch(["fine", "bad"], "en->fr", strict=True)
+    assert info.value.results == ["fine", "bad"]
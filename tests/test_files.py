@@ -0,0 +1,51 @@
+# tests/test_files.py
+# アップロード・出力ファイルの管理（保存・出力先の切り替え・古いファイルの掃除）
+
+import io
+import os
+
+import pytest
+
+from core.files import (
+    UploadTooLarge, Sweeper, client_filename, current_output_dir, output_workspace, save_stream, sweep,
+)
+
+
+def test_client_filename_strips_directories_and_control_characters():
+    assert client_filename("C:\\Users\\me\\報告書.xlsx") == "報告書.xlsx"
+    assert client_filename("../../etc/passwd") == "passwd"
+    assert client_filename("a\x00b.txt") == "ab.txt"
+    assert client_filename("") == "upload"
+
+
+def test_save_stream_removes_partial_upload_over_limit(tmp_path):
+    path = tmp_path / "upload.bin"
+    with pytest.raises(UploadTooLarge):
+        save_stream(io.BytesIO(b"x" * 10), str(path), max_bytes=5, chunk_size=3)
+    assert not path.exists()
+    assert save_stream(io.BytesIO(b"x" * 5), str(path), max_bytes=5, chunk_size=3) == 5
+
+
+def test_output_workspace_is_scoped(tmp_path):
+    with output_workspace(str(tmp_path / "job")):
+        assert current_output_dir("default") == str(tmp_path / "job")
+    assert current_output_dir("default") == "default"
+
+
+def test_sweep_removes_expired_then_oldest_over_quota(tmp_path):
+    for name, age, size in [("old", 100, 10), ("mid", 50, 10), ("new", 0, 10)]:
+        path = tmp_path / name
+        path.write_bytes(b"x" * size)
+        os.utime(path, (1000 - age, 1000 - age))
+
+    assert sweep(str(tmp_path), ttl_seconds=80, quota_bytes=10, now=1000) == (2, 20)
+    assert sorted(os.listdir(tmp_path)) == ["new"]
+
+
+def test_sweeper_reports_removals(tmp_path, capsys):
+    path = tmp_path / "stale"
+    path.write_bytes(b"x")
+    os.utime(path, (0, 0))
+    Sweeper([(str(tmp_path), 60, None)]).run_once()
+    assert "1 件" in capsys.readouterr().out
+    assert not path.exists()
@@ -0,0 +1,108 @@
+# tests/test_manifest.py
+# 差分翻訳用のマニフェスト
+
+import os
+
+import pytest
+
+from core.manifest import SegmentManifest, location_key, manifest_path_for
+from core.translate_text_google import Translator
+
+
+def test_manifest_reuses_only_unchanged_locations(tmp_path):
+    path = str(tmp_path / "doc.json")
+    manifest = SegmentManifest(path, context={"direction": "en->ja"})
+    manifest.record(location_key("Sheet1", "A1"), "Hello", "こんにちは")
+    manifest.record(location_key("Sheet1", "A2"), "Bye", "さようなら")
+    manifest.save()
+
+    reopened = SegmentManifest(path, context={"direction": "en->ja"})
+    assert reopened.lookup("Sheet1/A1", "Hello") == "こんにちは"
+    assert reopened.lookup("Sheet1/A2", "Bye!") is None      # 原文が変わった
+    assert reopened.lookup("Sheet1/A3", "Hello") is None     # 新しい位置
+
+    # 翻訳方向などの条件が変わった場合は前回分を使わない
+    assert SegmentManifest(path, context={"direction": "en->vi"}).lookup("Sheet1/A1", "Hello") is None
+
+
+def test_manifest_path_distinguishes_files_with_the_same_name():
+    assert manifest_path_for("/a/b/report.xlsx", "en->ja", "m") != manifest_path_for("/c/report.xlsx", "en->ja", "m")
+    assert manifest_path_for("/a/report.xlsx", "en->ja", "m") == manifest_path_for("/a/./report.xlsx", "en->ja", "m")
+    name = os.path.basename(manifest_path_for("/a/report.xlsx", "->ja", "m"))
+    assert name.startswith("report.xlsx.") and name.endswith(".auto-ja.json")
+
+
+def test_save_leaves_no_temporary_files(tmp_path):
+    path = tmp_path / "doc.json"
+    for text in ("one", "two"):
+        manifest = SegmentManifest(str(path))
+        manifest.record("p/0", text, text.upper())
+        manifest.save()
+    assert os.listdir(tmp_path) == ["doc.json"]
+    assert SegmentManifest(str(path)).lookup("p/0", "two") == "TWO"
+
+
+def test_translate_batch_translates_only_changed_segments(tmp_path):
+    sent = []
+
+    def backend(text, src, dest):
+        sent.append(text)
+        return text.upper()
+
+    translator = Translator(backend=backend, memory=False)
+    path = str(tmp_path / "doc.json")
+    keys = ["p/0", "p/1"]
+
+    first = SegmentManifest(path)
+    assert translator.translate_batch(["one", "two"], "en->fr", keys=keys, manifest=first) == ["ONE", "TWO"]
+    first.save()
+
+    sent.clear()
+    second = SegmentManifest(path)
+    assert translator.translate_batch(["one", "three"], "en->fr", keys=keys, manifest=second) == ["ONE", "THREE"]
+    assert sent == ["three"]
+    assert translator.stats["manifest_reused"] == 1
+
+
+def test_incremental_text_file(tmp_path, monkeypatch):
+    monkeypatch.setattr("core.translate_text_google.MANIFEST_DIR", str(tmp_path / "manifests"))
+    monkeypatch.setattr("core.translate_text_google.OUTPUT_DIR", str(tmp_path / "out"))
+    source = tmp_path / "notes.txt"
+    translator = Translator(backend="stub", memory=False)
+
+    source.write_text("alpha\nbeta\n", encoding="utf-8")
+    translator.translate_file(str(source), "en->fr", incremental=True)
+    source.write_text("alpha\ngamma\n", encoding="utf-8")
+    out = translator.translate_file(str(source), "en->fr", incremental=True)
+
+    assert open(out, encoding="utf-8").read() == "[fr] alpha\n[fr] gamma\n"
+    assert translator.stats["manifest_reused"] == 1
+
+
+def test_incremental_workbook_reuses_shared_strings_after_insertions(tmp_path, monkeypatch):
+    openpyxl = pytest.importorskip("openpyxl")
+    pytest.importorskip("lxml")
+    from tests.test_excel_shared_strings import _use_shared_strings
+
+    monkeypatch.setattr("core.translate_text_google.MANIFEST_DIR", str(tmp_path / "manifests"))
+    monkeypatch.setattr("core.translate_text_google.OUTPUT_DIR", str(tmp_path / "out"))
+    source = tmp_path / "book.xlsx"
+    translator = Translator(backend="stub", memory=False)
+
+    def save(values):
+        wb = openpyxl.Workbook()
+        for value in values:
+            wb.active.append([value])
+        wb.save(source)
+        _use_shared_strings(source)
+
+    save(["Alpha", "Beta"])
+    translator.translate_file(str(source), "en->fr", incremental=True)
+    # 先頭に追加した文字列で共有文字列の番号がずれても、既存の文字列とシート名は再利用される
+    save(["New", "Alpha", "Beta"])
+    out = translator.translate_file(str(source), "en->fr", incremental=True)
+
+    assert [row[0].value for row in openpyxl.load_workbook(out).active.iter_rows()] == [
+        "[fr] New", "[fr] Alpha", "[fr] Beta",
+    ]
+    assert translator.stats["manifest_reused"] == 3
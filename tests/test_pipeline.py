@@ -0,0 +1,81 @@
+# tests/test_pipeline.py
+# ストリーミングパイプライン（チャンク分割・順序の保持・原文の言語の共有）と複数言語への翻訳
+
+import os
+
+from core.files import output_workspace
+from core.pipeline import iter_chunks, run_ordered, translate_stream
+from core.translate_text_google import Translator
+
+
+def _translator():
+    return Translator(backend="stub", memory=False)
+
+
+def test_iter_chunks_respects_item_and_char_limits():
+    chunks = list(iter_chunks(["aa", "bb", "cccccc", "d"], len, max_items=2, max_chars=5))
+    assert chunks == [["aa", "bb"], ["cccccc"], ["d"]]
+
+
+def test_run_ordered_consumes_in_input_order():
+    consumed = []
+    run_ordered(
+        ([n] for n in range(20)), lambda chunk: [n * 2 for n in chunk],
+        lambda chunk, result: consumed.append((chunk[0], result[0])), max_inflight=3,
+    )
+    assert consumed == [(n, n * 2) for n in range(20)]
+
+
+def test_translate_stream_detects_source_once_per_document(monkeypatch):
+    monkeypatch.setattr("core.pipeline.PIPELINE_CHUNK_SEGMENTS", 1)
+    translator = _translator()
+    calls = []
+    resolve_source = translator.resolve_source
+
+    def counting_resolve_source(texts, directions):
+        calls.append(directions)
+        return resolve_source(texts, directions)
+
+    translator.resolve_source = counting_resolve_source
+    # 先頭のチャンクは日本語、後のチャンクは英字だけ（チャンクごとに推定すると言語が変わる）
+    japanese = "これは日本語で書かれたテスト用の文書です。ご確認をよろしくお願いいたします。"
+    segments = [("0", japanese, 0), ("1", "Report", 1), ("2", "Summary", 2)]
+    results = {}
+    count = translate_stream(
+        translator, segments, ["auto->ja", "auto->en"], lambda item, tr: results.__setitem__(item, tr),
+    )
+
+    assert count == 3
+    assert len(calls) == 1
+    # 原文は文書全体で日本語と推定されるため、日本語への方向はどのチャンクも原文のまま
+    assert [results[i]["auto->ja"] for i in range(3)] == [japanese, "Report", "Summary"]
+    assert results[0]["auto->en"] == f"[en] {japanese}"
+
+
+def test_text_file_with_multiple_targets(tmp_path):
+    source = tmp_path / "notes.txt"
+    source.write_bytes("Hello world\r\n\r\nGood morning\n".encode("utf-8"))
+
+    with output_workspace(str(tmp_path / "out")):
+        outputs = _translator().translate_file(str(source), "en->ja", targets=["ja", "vi", "en"])
+
+    assert sorted(outputs) == ["ja", "vi"]
+    for lang, path in outputs.items():
+        assert os.path.basename(path).startswith(f"notes_translated_{lang}_")
+        with open(path, encoding="utf-8", newline="") as f:
+            assert f.read() == f"[{lang}] Hello world\r\n\r\n[{lang}] Good morning\n"
+
+
+def test_text_file_multiple_targets_archive(tmp_path):
+    import zipfile
+
+    source = tmp_path / "notes.txt"
+    source.write_text("Hello\n", encoding="utf-8")
+
+    with output_workspace(str(tmp_path / "out")):
+        zip_path = _translator().translate_file(str(source), "en->ja", targets=["ja", "vi"], archive=True)
+
+    with zipfile.ZipFile(zip_path) as zf:
+        names = sorted(zf.namelist())
+        assert [name.split("_")[2] for name in names] == ["ja", "vi"]
+        assert zf.read(names[0]).decode("utf-8") == "[ja] Hello\n"
@@ -0,0 +1,64 @@
+# tests/test_pptx_translator.py
+# シェイプ参照の抽出（iter_text_shapes）と、シングルパス／2 パス・各 writer での PPTX の往復
+
+import pytest
+
+pptx = pytest.importorskip("pptx")
+pytest.importorskip("lxml")
+
+from core.files import output_workspace
+from core.translate_text_google import Translator
+from modules.pptx_translator.pptx_reader import iter_text_shapes
+from modules.pptx_translator.pptx_translator import PPTXTranslator
+from tests.test_pptx_zip_writer import make_deck, shape_texts
+
+
+def test_iter_text_shapes_yields_grouped_shapes_and_table_cells(tmp_path):
+    source = tmp_path / "deck.pptx"
+    make_deck(source)
+    prs = pptx.Presentation(source)
+    slides = list(prs.slides)
+
+    items = []
+    for slide, path, shape, text in iter_text_shapes(prs):
+        assert shape.text_frame.text == text
+        items.append((slides.index(slide), path, text))
+        # 走査を続けながら、返されたハンドルに書き戻してよい
+        shape.text_frame.text = text.upper()
+
+    assert items == [
+        (0, (0,), "Title"),
+        (0, (1, 0, 0), "Name"), (0, (1, 0, 1), "Qty"), (0, (1, 1, 0), "Apple"), (0, (1, 1, 1), "3"),
+        (0, (2,), "Line one\nLine two"),
+        (0, (3, 0), "Grouped"),
+        (0, (3, 1, 0), "Deep"),
+        (1, (0,), "Second slide"),
+    ]
+    prs.save(tmp_path / "upper.pptx")
+    assert shape_texts(tmp_path / "upper.pptx")[0][5] == ((2,), "LINE ONE\nLINE TWO")
+
+
+@pytest.mark.parametrize("single_pass", [True, False])
+@pytest.mark.parametrize("writer", ["zip", "python-pptx"])
+def test_round_trip(tmp_path, monkeypatch, single_pass, writer):
+    monkeypatch.setattr("modules.pptx_translator.pptx_translator.PPTX_SINGLE_PASS", single_pass)
+    monkeypatch.setattr("modules.pptx_translator.pptx_translator.PPTX_WRITER", writer)
+    source = tmp_path / "deck.pptx"
+    make_deck(source)
+
+    translator = Translator(backend="stub", memory=False)
+    with output_workspace(str(tmp_path / "out")):
+        outputs = PPTXTranslator(translator).process_targets(str(source), ["en->fr", "en->de"])
+
+    for direction, dest in (("en->fr", "fr"), ("en->de", "de")):
+        assert shape_texts(outputs[direction]) == [
+            [
+                ((0,), f"[{dest}] Title"),
+                ((1, 0, 0), f"[{dest}] Name"), ((1, 0, 1), f"[{dest}] Qty"),
+                ((1, 1, 0), f"[{dest}] Apple"), ((1, 1, 1), "3"),
+                ((2,), f"[{dest}] Line one\n[{dest}] Line two"),
+                ((3, 0), f"[{dest}] Grouped"),
+                ((3, 1, 0), f"[{dest}] Deep"),
+            ],
+            [((0,), f"[{dest}] Second slide")],
+        ]
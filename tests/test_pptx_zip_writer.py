@@ -0,0 +1,99 @@
+# tests/test_pptx_zip_writer.py
+# zip レベルの PPTX 書き込み（グループ化されたシェイプ・テーブルのセル）と python-pptx の writer との一致
+
+import zipfile
+
+import pytest
+
+pptx = pytest.importorskip("pptx")
+pytest.importorskip("lxml")
+
+from pptx.util import Inches
+
+from modules.pptx_translator.pptx_writer import write_pptx_from_template
+from modules.pptx_translator.pptx_zip_writer import write_pptx_zip
+
+
+def make_deck(path):
+    """
+    1 枚目: テキストボックス、テーブル、2 段落のテキストボックス、入れ子のグループ
+    2 枚目: テキストボックスだけ
+    """
+    prs = pptx.Presentation()
+    blank = prs.slide_layouts[6]
+    slide = prs.slides.add_slide(blank)
+    box = Inches(1)
+    slide.shapes.add_textbox(box, box, box, box).text_frame.text = "Title"
+    table = slide.shapes.add_table(2, 2, box, box, box, box).table
+    for (row, col), text in {(0, 0): "Name", (0, 1): "Qty", (1, 0): "Apple", (1, 1): "3"}.items():
+        table.cell(row, col).text = text
+    slide.shapes.add_textbox(box, box, box, box).text_frame.text = "Line one\nLine two"
+    group = slide.shapes.add_group_shape()
+    group.shapes.add_textbox(box, box, box, box).text_frame.text = "Grouped"
+    group.shapes.add_group_shape().shapes.add_textbox(box, box, box, box).text_frame.text = "Deep"
+
+    prs.slides.add_slide(blank).shapes.add_textbox(box, box, box, box).text_frame.text = "Second slide"
+    prs.save(path)
+
+
+def shape_texts(path):
+    """スライドごとの [(path, テキスト), ...]（テーブルはセルごと、グループは子シェイプごと）"""
+    def walk(shape, prefix):
+        if getattr(shape, "has_table", False):
+            for r, row in enumerate(shape.table.rows):
+                for c, cell in enumerate(row.cells):
+                    yield prefix + (r, c), cell.text_frame.text
+        elif hasattr(shape, "shapes"):
+            for idx, child in enumerate(shape.shapes):
+                yield from walk(child, prefix + (idx,))
+        elif shape.has_text_frame:
+            yield prefix, shape.text_frame.text
+
+    prs = pptx.Presentation(path)
+    return [
+        [item for idx, shape in enumerate(slide.shapes) for item in walk(shape, (idx,))]
+        for slide in prs.slides
+    ]
+
+
+_TRANSLATED_SLIDES = [{
+    "translated_shape_texts": [
+        ((0,), "タイトル"),
+        ((1, 0, 0), "名前"),
+        ((1, 1, 0), "りんご"),
+        ((2,), "一行目\n二行目"),
+        ((3, 0), "グループ"),
+        ((3, 1, 0), "深い"),
+    ],
+}]
+
+
+def test_zip_writer_matches_python_pptx_writer(tmp_path):
+    source = tmp_path / "deck.pptx"
+    make_deck(source)
+    write_pptx_zip(str(source), str(tmp_path / "zip.pptx"), _TRANSLATED_SLIDES)
+    write_pptx_from_template(str(source), str(tmp_path / "pptx.pptx"), _TRANSLATED_SLIDES)
+
+    expected = [
+        [
+            ((0,), "タイトル"),
+            ((1, 0, 0), "名前"), ((1, 0, 1), "Qty"), ((1, 1, 0), "りんご"), ((1, 1, 1), "3"),
+            ((2,), "一行目\n二行目"),
+            ((3, 0), "グループ"),
+            ((3, 1, 0), "深い"),
+        ],
+        [((0,), "Second slide")],
+    ]
+    assert shape_texts(tmp_path / "zip.pptx") == expected
+    assert shape_texts(tmp_path / "pptx.pptx") == expected
+
+
+def test_zip_writer_copies_untouched_parts_unchanged(tmp_path):
+    source = tmp_path / "deck.pptx"
+    make_deck(source)
+    write_pptx_zip(str(source), str(tmp_path / "zip.pptx"), _TRANSLATED_SLIDES)
+
+    with zipfile.ZipFile(source) as src, zipfile.ZipFile(tmp_path / "zip.pptx") as out:
+        assert out.namelist() == src.namelist()
+        changed = [name for name in src.namelist() if src.read(name) != out.read(name)]
+    assert changed == ["ppt/slides/slide1.xml"]
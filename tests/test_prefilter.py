@@ -0,0 +1,63 @@
+# tests/test_prefilter.py
+# 事前フィルタ（翻訳不要なセグメント・翻訳先の言語で書かれたセグメントの判定）
+
+import pytest
+
+from core.prefilter import (
+    ALREADY_TARGET, UNTRANSLATABLE, classify_segment, detect_source_language, is_untranslatable,
+)
+from core.translate_text_google import Translator
+
+
+@pytest.mark.parametrize("text", [
+    "12,345", "2024-01-31", "https://example.com/a?b=1", "user@example.com",
+    "=SUM(A1:A3)", "ABC-1234", "v1.2.3", "report.xlsx", "C:\\temp\\a.txt", "---",
+])
+def test_untranslatable_tokens(text):
+    assert is_untranslatable(text)
+    assert classify_segment(text, "en", "ja") == UNTRANSLATABLE
+
+
+@pytest.mark.parametrize("text", ["Hello world", "Total amount", "Version 2 is ready"])
+def test_sentences_are_sent(text):
+    assert classify_segment(text, "en", "ja") is None
+
+
+def test_text_already_in_target_script():
+    assert classify_segment("こんにちは世界", "en", "ja") == ALREADY_TARGET
+    assert classify_segment("Xin chào <g1>các bạn</g1>", "en", "vi") == ALREADY_TARGET
+    # 翻訳元と翻訳先が同じ文字種の場合は判断できないため送る
+    assert classify_segment("Bonjour", "en", "fr") is None
+    assert classify_segment("Hello", "auto", "en") is None
+
+
+@pytest.mark.parametrize("text, src, dest", [
+    ("Please submit the report by Friday", "ja", "vi"),   # ベトナム語に固有の文字がない英文
+    ("Xin chào các bạn", "ja", "en"),                     # ラテン文字だけでは英語と判断できない
+    ("Hello world", "ja", "en"),
+    ("北京欢迎你", "auto", "ja"),                          # 漢字だけの文は中国語かもしれない
+    ("北京欢迎你", "en", "ja"),
+])
+def test_latin_or_han_alone_does_not_identify_the_target(text, src, dest):
+    assert classify_segment(text, src, dest) is None
+
+
+def test_detect_source_language():
+    assert detect_source_language(["これは日本語の文章です。"]) == "ja"
+    assert detect_source_language(["안녕하세요 반갑습니다"]) == "ko"
+    assert detect_source_language(["Xin chào, tôi là người Việt Nam"]) == "vi"
+    assert detect_source_language(["Hello world"]) is None
+
+
+def test_translate_batch_skips_filtered_segments():
+    translator = Translator(backend="stub", memory=False)
+    results = translator.translate_batch(["Sheet1", "Hello", "こんにちは", "  42  "], "en->ja")
+    assert results == ["Sheet1", "[ja] Hello", "こんにちは", "  42  "]
+    assert translator.stats["untranslatable"] == 2
+    assert translator.stats["already_target"] == 1
+
+
+def test_translate_batch_prefilter_mask_sends_exempt_segments():
+    translator = Translator(backend="stub", memory=False)
+    results = translator.translate_batch(["Sheet1", "Sheet2"], "ja->en", prefilter=[False, True])
+    assert results == ["[en] Sheet1", "Sheet2"]
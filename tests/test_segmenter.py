@@ -0,0 +1,55 @@
+# tests/test_segmenter.py
+# 書式（run）を考慮したセグメント化とインラインタグの解析
+
+from core.segmenter import parse_tagged, segment_runs, strip_tags
+
+
+def _segment(runs, first_id=1):
+    """runs: [(書式キー, テキスト), ...]"""
+    return segment_runs(runs, key_fn=lambda run: run[0], text_fn=lambda run: run[1], first_id=first_id)
+
+
+def test_segment_runs_groups_consecutive_formats():
+    text, layout = _segment([("b", "Hello "), ("b", "big "), ("i", "world"), ("b", "!")])
+    assert text == "<g1>Hello big </g1><g2>world</g2><g3>!</g3>"
+    assert layout.ids == {1, 2, 3}
+    assert layout.templates[2] == ("i", "world")
+
+
+def test_segment_runs_without_formatting_changes_needs_no_tags():
+    assert _segment([("b", "Hello "), ("b", "world")]) == ("Hello world", None)
+    assert _segment([("b", "Hello"), ("i", "   ")]) == ("Hello   ", None)
+
+
+def test_segment_runs_first_id_offsets_group_ids():
+    text, layout = _segment([("b", "a"), ("i", "b")], first_id=5)
+    assert text == "<g5>a</g5><g6>b</g6>"
+
+
+def test_parse_tagged_round_trip():
+    assert parse_tagged("<g1>Hello</g1><g2>world</g2>", {1, 2}) == [(1, "Hello"), (2, "world")]
+
+
+def test_parse_tagged_keeps_reordered_groups():
+    assert parse_tagged("<g2>世界</g2>、<g1>こんにちは</g1>", {1, 2}) == [(2, "世界、"), (1, "こんにちは")]
+
+
+def test_parse_tagged_attaches_untagged_text_to_neighbours():
+    assert parse_tagged("Say <g1>hi</g1> now", {1}) == [(1, "Say hi now")]
+
+
+def test_parse_tagged_tolerates_spacing_and_case_in_tags():
+    assert parse_tagged("< G1 >a< /g1 ><g2>b</ g2>", {1, 2}) == [(1, "a"), (2, "b")]
+
+
+def test_parse_tagged_rejects_broken_markup():
+    assert parse_tagged("<g1>a<g2>b</g2></g1>", {1, 2}) is None   # 入れ子
+    assert parse_tagged("<g1>a", {1}) is None                      # 閉じ忘れ
+    assert parse_tagged("<g3>a</g3>", {1, 2}) is None              # 未知の ID
+    assert parse_tagged("<g1>a</g2>", {1, 2}) is None              # 対応しない閉じタグ
+    assert parse_tagged("no tags", {1}) is None
+
+
+def test_strip_tags():
+    assert strip_tags("<g1>Hello</g1> <g2>world</g2>") == "Hello world"
+    assert strip_tags(None) == ""
@@ -0,0 +1,72 @@
+# tests/test_text_translator.py
+# TXT / CSV のストリーミング翻訳（引用符・区切り文字・改行コードの保持）
+
+import csv
+
+import pytest
+
+from core.backends import TranslationBackend
+from core.files import output_workspace
+from core.translate_text_google import Translator
+from modules.text_translator.text_translator import TextTranslator, _detect_csv_format
+
+
+class QuotingBackend(TranslationBackend):
+    """翻訳結果を引用符で囲んで返す（"monde" のように引用符を含む出力を模擬する）"""
+
+    name = "quoting"
+    supports_batch = True
+    rate_limited = False
+
+    def translate_batch(self, texts, src, dest):
+        return [f'"{text}"' for text in texts]
+
+
+class FailingBackend(TranslationBackend):
+    name = "failing"
+    supports_batch = True
+    rate_limited = False
+
+    def translate_batch(self, texts, src, dest):
+        raise RuntimeError("backend down")
+
+
+def _translate(tmp_path, backend, name, content, strict=False):
+    source = tmp_path / name
+    source.write_bytes(content.encode("utf-8"))
+    translator = Translator(backend=backend, memory=False, strict=strict)
+    with output_workspace(str(tmp_path / "out")):
+        out = TextTranslator(translator).process(str(source), "en->fr")
+    with open(out, encoding="utf-8", newline="") as f:
+        return f.read()
+
+
+def test_detect_csv_format_defaults_to_doubled_quotes():
+    fmt = _detect_csv_format("id,name\r\n1,hello\r\n2,world\r\n")
+    assert fmt["doublequote"] is True
+    assert fmt["escapechar"] is None
+    assert fmt["lineterminator"] == "\r\n"
+
+
+def test_csv_translation_with_quotes_in_output(tmp_path):
+    text = _translate(tmp_path, QuotingBackend(), "plain.csv", "id,word\r\n1,world\r\n2,42\r\n")
+    assert text == '"""id""","""word"""\r\n1,"""world"""\r\n2,42\r\n'
+    rows = list(csv.reader(text.splitlines()))
+    assert rows == [['"id"', '"word"'], ["1", '"world"'], ["2", "42"]]
+
+
+def test_csv_reads_doubled_quote_escapes(tmp_path):
+    content = 'id,quote,note\r\n1,"He said ""hi""","a, b"\r\n'
+    text = _translate(tmp_path, "stub", "quoted.csv", content)
+    rows = list(csv.reader(text.splitlines()))
+    assert rows[1] == ["1", '[fr] He said "hi"', "[fr] a, b"]
+
+
+def test_failed_write_removes_partial_output(tmp_path):
+    source = tmp_path / "broken.csv"
+    source.write_text("id,word\n1,world\n", encoding="utf-8")
+    translator = Translator(backend=FailingBackend(), memory=False, strict=True)
+    out_dir = tmp_path / "out"
+    with output_workspace(str(out_dir)), pytest.raises(Exception):
+        TextTranslator(translator).process(str(source), "en->fr")
+    assert list(out_dir.iterdir()) == []
@@ -0,0 +1,57 @@
+# tests/test_translation_memory.py
+# SQLite の翻訳メモリ
+
+from core.translate_text_google import Translator
+from core.translation_memory import TranslationMemory
+
+
+def test_lookup_and_store_round_trip(tmp_path):
+    path = str(tmp_path / "tm.sqlite3")
+    memory = TranslationMemory(path)
+    memory.store_many([("Hello", "こんにちは"), ("Bye", "さようなら")], "en", "ja")
+    assert memory.lookup_many(["Hello", "Bye", "Other"], "en", "ja") == {"Hello": "こんにちは", "Bye": "さようなら"}
+    assert memory.lookup_many(["Hello"], "en", "vi") == {}
+    memory.close()
+
+    # プロセス内 LRU ではなくファイルから読み直せる
+    reopened = TranslationMemory(path)
+    assert reopened.lookup_many(["Hello"], "en", "ja") == {"Hello": "こんにちは"}
+    assert reopened.stats()["db_hits"] == 1
+    reopened.close()
+
+
+def test_max_entries_evicts_least_recently_used(tmp_path):
+    memory = TranslationMemory(str(tmp_path / "tm.sqlite3"), max_entries=2, lru_size=0)
+    for i, text in enumerate(["a", "b", "c"]):
+        memory.store_many([(text, text.upper())], "en", "fr")
+    assert memory.evict() == 1
+    assert memory.stats()["size"] == 2
+    memory.close()
+
+
+def test_translator_uses_memory_before_the_backend(tmp_path):
+    calls = []
+
+    def backend(text, src, dest):
+        calls.append(text)
+        return text.upper()
+
+    memory = TranslationMemory(str(tmp_path / "tm.sqlite3"))
+    translator = Translator(backend=backend, memory=memory)
+    memory.store_many([("cached", "FROM MEMORY")], "en", "fr", backend=translator.backend.name)
+
+    assert translator.translate_batch(["cached", "fresh"], "en->fr") == ["FROM MEMORY", "FRESH"]
+    assert calls == ["fresh"]
+    assert memory.lookup_many(["fresh"], "en", "fr", backend=translator.backend.name) == {"fresh": "FRESH"}
+    assert translator.stats["memory_hits"] == 1
+
+
+def test_entries_are_kept_per_backend(tmp_path):
+    memory = TranslationMemory(str(tmp_path / "tm.sqlite3"))
+    memory.store_many([("Hello", "[fr] Hello")], "en", "fr", backend="stub")
+    assert memory.lookup_many(["Hello"], "en", "fr", backend="google") == {}
+
+    # 別のバックエンドでは翻訳メモリの訳を使わずに翻訳し直す
+    translator = Translator(backend=lambda text, src, dest: text.upper(), memory=memory)
+    assert translator.translate_batch(["Hello"], "en->fr") == ["HELLO"]
+    assert memory.lookup_many(["Hello"], "en", "fr", backend="stub") == {"Hello": "[fr] Hello"}